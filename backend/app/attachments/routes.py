@@ -1,54 +1,179 @@
-import os
-import shutil
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from urllib.parse import quote
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, get_current_user
+from app.core.config import MAX_ATTACHMENT_BYTES
+from app.core.deps import get_db, get_read_db, get_current_user
+from app.database.db import SessionLocal
+from app.core.permissions import get_project_role
+from app.core.storage import (
+    CHUNK_SIZE,
+    discard_staged,
+    get_storage,
+    place_staged,
+    save_stream,
+    store_staged,
+    too_large,
+)
+from app.core.metrics import TimedRoute, query_budget
 from app.models.attachment import Attachment
+from app.models.blob import Blob
 from app.models.ticket import Ticket
 from app.schemas.attachment import AttachmentOut
 
-UPLOAD_DIR = "app/uploads"
-
-router = APIRouter(prefix="/attachments", tags=["Attachments"])
+router = APIRouter(prefix="/attachments", tags=["Attachments"], route_class=TimedRoute)
 
 
-@router.post("/ticket/{ticket_id}", response_model=AttachmentOut)
-def upload_attachment(
-    ticket_id: int,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
-):
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+# -----------------------------
+# Helpers (blocking DB work, run in the threadpool from async handlers)
+# -----------------------------
+def get_ticket_or_404(db: Session, ticket_id: int):
+    ticket = db.query(Ticket.id).filter(Ticket.id == ticket_id).first()
+    # End the transaction: the writer connection (and the SQLite write
+    # lock) must not be held while the upload streams in
+    db.rollback()
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
 
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+def record_attachment(
+    db: Session,
+    ticket_id: int,
+    user_id: int,
+    filename: str,
+    content_type: str | None,
+    digest: str,
+    size: int,
+    staged_path: str,
+):
+    # One more reference to the blob, creating it on first upload. Only
+    # this upsert runs under the write lock: the bytes were stored before
+    # it by store_staged()
+    try:
+        refcount = db.execute(
+            insert(Blob)
+            .values(digest=digest, size=size, refcount=1)
+            .on_conflict_do_update(
+                index_elements=[Blob.digest],
+                set_={"refcount": Blob.refcount + 1},
+            )
+            .returning(Blob.refcount)
+        ).scalar_one()
+        place_staged(db, get_storage(), digest, staged_path, new_blob=refcount == 1)
+    except BaseException:
+        discard_staged(staged_path)
+        raise
 
     attachment = Attachment(
-        filename=file.filename,
-        file_path=file_path,
+        filename=filename,
+        file_path=digest,
+        blob_digest=digest,
+        size=size,
+        content_type=content_type,
         ticket_id=ticket_id,
-        uploaded_by=current_user.id
+        uploaded_by=user_id
     )
 
     db.add(attachment)
-    db.commit()
-    db.refresh(attachment)
+    db.flush()
 
     return attachment
 
 
+async def read_upload(file: UploadFile):
+    while chunk := await file.read(CHUNK_SIZE):
+        yield chunk
+
+
+def check_content_length(request: Request):
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > MAX_ATTACHMENT_BYTES:
+        raise too_large(MAX_ATTACHMENT_BYTES)
+
+
+# -----------------------------
+# Upload (multipart form)
+# -----------------------------
+@router.post("/ticket/{ticket_id}", response_model=AttachmentOut)
+@query_budget(6)
+async def upload_attachment(
+    ticket_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db, scope="function"),
+    current_user=Depends(get_current_user)
+):
+    await run_in_threadpool(get_ticket_or_404, db, ticket_id)
+
+    digest, size, staged_path = await save_stream(
+        get_storage(), read_upload(file), MAX_ATTACHMENT_BYTES
+    )
+    await run_in_threadpool(store_staged, get_storage(), digest, staged_path)
+
+    return await run_in_threadpool(
+        record_attachment,
+        db,
+        ticket_id,
+        current_user.id,
+        file.filename,
+        file.content_type,
+        digest,
+        size,
+        staged_path,
+    )
+
+
+# -----------------------------
+# Upload (raw request body, streamed)
+# -----------------------------
+@router.put("/ticket/{ticket_id}/raw", response_model=AttachmentOut)
+@query_budget(6)
+async def upload_attachment_stream(
+    ticket_id: int,
+    filename: str,
+    request: Request,
+    db: Session = Depends(get_db, scope="function"),
+    current_user=Depends(get_current_user)
+):
+    # The body is not read before this point, so oversized uploads are
+    # refused up front and chunked ones as soon as they pass the limit
+    check_content_length(request)
+    await run_in_threadpool(get_ticket_or_404, db, ticket_id)
+
+    digest, size, staged_path = await save_stream(
+        get_storage(), request.stream(), MAX_ATTACHMENT_BYTES
+    )
+    await run_in_threadpool(store_staged, get_storage(), digest, staged_path)
+
+    return await run_in_threadpool(
+        record_attachment,
+        db,
+        ticket_id,
+        current_user.id,
+        filename,
+        request.headers.get("content-type"),
+        digest,
+        size,
+        staged_path,
+    )
+
+
 @router.get("/ticket/{ticket_id}", response_model=list[AttachmentOut])
+@query_budget(3)
 def list_attachments(
     ticket_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
     return (
@@ -56,3 +181,95 @@ def list_attachments(
         .filter(Attachment.ticket_id == ticket_id)
         .all()
     )
+
+
+# -----------------------------
+# Download
+# -----------------------------
+@router.get("/{attachment_id}/download")
+@query_budget(3)
+def download_attachment(
+    attachment_id: int,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user)
+):
+    row = (
+        db.query(Attachment, Ticket.project_id)
+        .join(Ticket, Ticket.id == Attachment.ticket_id)
+        .filter(Attachment.id == attachment_id)
+        .first()
+    )
+    # Outside the project the attachment might as well not exist
+    if not row or get_project_role(db, row.project_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    attachment = row.Attachment
+
+    # Uploads from before content-addressed storage live at file_path
+    if attachment.blob_digest is None:
+        return FileResponse(attachment.file_path, filename=attachment.filename)
+
+    return StreamingResponse(
+        get_storage().iter_chunks(attachment.blob_digest),
+        media_type=attachment.content_type or "application/octet-stream",
+        headers={
+            "Content-Disposition":
+                f"attachment; filename*=utf-8''{quote(attachment.filename)}",
+            "Content-Length": str(attachment.size),
+        },
+    )
+
+
+# -----------------------------
+# Delete (uploader or project admin)
+# -----------------------------
+@router.delete("/{attachment_id}")
+@query_budget(6)
+def delete_attachment(
+    attachment_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db, scope="function"),
+    current_user=Depends(get_current_user)
+):
+    row = (
+        db.query(Attachment, Ticket.project_id)
+        .join(Ticket, Ticket.id == Attachment.ticket_id)
+        .filter(Attachment.id == attachment_id)
+        .first()
+    )
+    if not row:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    attachment, project_id = row
+
+    if (
+        current_user.id != attachment.uploaded_by
+        and get_project_role(db, project_id, current_user.id) != "admin"
+    ):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    digest = attachment.blob_digest
+    db.delete(attachment)
+
+    if digest is not None:
+        blob = db.query(Blob).filter(Blob.digest == digest)
+        blob.update(
+            {Blob.refcount: Blob.refcount - 1}, synchronize_session=False
+        )
+        if blob.filter(Blob.refcount <= 0).delete(synchronize_session=False):
+            # After the commit, and only if no upload re-created the blob
+            background_tasks.add_task(remove_blob_if_unreferenced, digest)
+
+    return {"message": "Attachment deleted"}
+
+
+def remove_blob_if_unreferenced(digest: str):
+    # Background task. The check and the delete happen under the write
+    # lock, which an upload also needs to take a reference, so the bytes
+    # never go from under a blob row
+    db = SessionLocal()
+    try:
+        if db.query(Blob.digest).filter(Blob.digest == digest).first() is None:
+            get_storage().delete(digest)
+    finally:
+        db.close()
@@ -1,56 +1,88 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.database.db import SessionLocal, engine, Base
+from app.database.db import SessionLocal
+from app.core.deps import get_db, get_read_db, get_current_user, oauth2_scheme
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin
-from app.core.security import hash_password, verify_password
-from app.core.token import create_access_token
+from app.schemas.user import PasswordChange, UserCreate, UserLogin
+from app.core.security import hash_password, verify_and_update_password, verify_password
+from app.core.token import (
+    create_access_token,
+    denylist,
+    verify_access_token,
+)
+from app.core.metrics import TimedRoute, query_budget
+from app.core.admission import admission
+from app.core.config import LOGIN_RATE_BURST, LOGIN_RATE_LIMIT
 
-Base.metadata.create_all(bind=engine)
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TimedRoute)
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+# Each attempt costs a bcrypt hash. Keyed by the submitted email rather
+# than the address: behind a proxy or NAT everyone shares one address
+login_attempts = admission.keyed_limit("login", LOGIN_RATE_LIMIT, LOGIN_RATE_BURST)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# register and login are async so a request waiting for its bcrypt hash
+# holds no threadpool worker; only their queries run on the threadpool
+@router.post("/register")
+@query_budget(3)
+async def register(user: UserCreate, db: Session = Depends(get_db, scope="function")):
+    # Hash before the first query: bcrypt must not run inside the write
+    # transaction
+    hashed_password = await hash_password(user.password)
+    await run_in_threadpool(_add_user, db, user.email, hashed_password)
 
+    return {"message": "User registered successfully"}
 
-@router.post("/register")
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
+
+def _add_user(db: Session, email: str, hashed_password: str):
+    existing = db.query(User).filter(User.email == email).first()
     if existing:
         raise HTTPException(status_code=400, detail="User already exists")
 
     new_user = User(
-        email=user.email,
-        hashed_password=hash_password(user.password)
+        email=email,
+        hashed_password=hashed_password
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    return {"message": "User registered successfully"}
 
 
+# Budget: the user lookup, plus BEGIN and UPDATE when the hash is upgraded
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+@query_budget(4)
+async def login(user: UserLogin, db: Session = Depends(get_read_db)):
+    login_attempts.check(user.email.lower())
 
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    db_user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == user.email).first()
+    )
+
+    if not db_user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    ok, new_hash = await verify_and_update_password(
+        user.password, db_user.hashed_password
+    )
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    # Transparently upgrade hashes made with outdated bcrypt settings
+    if new_hash is not None:
+        await run_in_threadpool(_upgrade_hash, db_user.id, new_hash)
+
+    return issue_token(db_user)
+
+
+def issue_token(user: User) -> dict:
     # 🔥 IMPORTANT FIX:
     # Include BOTH email and user_id in JWT payload
     token = create_access_token(
         {
-            "sub": db_user.email,
-            "user_id": db_user.id,
+            "sub": user.email,
+            "user_id": user.id,
+            "pwv": user.password_version,
         }
     )
 
@@ -58,3 +90,53 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
         "access_token": token,
         "token_type": "bearer"
     }
+
+
+def _upgrade_hash(user_id: int, new_hash: str):
+    with SessionLocal() as write_db:
+        write_db.query(User).filter(User.id == user_id).update(
+            {User.hashed_password: new_hash}, synchronize_session=False
+        )
+        write_db.commit()
+
+
+@router.post("/logout")
+@query_budget(4)
+def logout(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    # The token stops working at once in this process, within
+    # FIXHUB_TOKEN_DENYLIST_SYNC seconds in the others
+    digest, claims = verify_access_token(token)
+    denylist.revoke(db, digest, claims["exp"])
+    return {"message": "Logged out"}
+
+
+# Every token issued before the change stops working: at once in this
+# process and, with the redis event broker, in the others; otherwise
+# within FIXHUB_USER_CACHE_TTL seconds there. The caller gets a fresh one.
+# Budget: the user lookup, plus BEGIN, SELECT and UPDATE of the password
+@router.post("/change-password")
+@query_budget(4)
+async def change_password(
+    data: PasswordChange,
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    if not await verify_password(data.current_password, current_user.hashed_password):
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+
+    hashed_password = await hash_password(data.new_password)
+    user = await run_in_threadpool(_set_password, db, current_user.id, hashed_password)
+    return issue_token(user)
+
+
+def _set_password(db: Session, user_id: int, hashed_password: str) -> User:
+    user = db.query(User).filter(User.id == user_id).one()
+    user.hashed_password = hashed_password
+    # Tokens carry the version they were issued under ("pwv")
+    user.password_version += 1
+    db.flush()
+    return user
@@ -1,20 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.schemas.comment import CommentCreate, CommentOut
+from app.schemas.comment import CommentCreate, CommentOut, CommentPage
 from app.models.comment import Comment
 from app.models.ticket import Ticket
 from app.models.project import Project
-from app.models.user import User
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_read_db, get_current_user
+from app.core.events import publish_on_commit
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate_window
+from app.core.response_cache import cached_response
+from app.core.versions import TICKET, bump_version, check_not_modified
+from app.core.metrics import TimedRoute, query_budget
+
+router = APIRouter(prefix="/comments", tags=["Comments"], route_class=TimedRoute)
+
 
-router = APIRouter(prefix="/comments", tags=["Comments"])
+# Everything CommentOut needs, straight from the comment row
+COMMENT_COLUMNS = (
+    Comment.id,
+    Comment.content,
+    Comment.created_at,
+    Comment.user_id,
+    Comment.author_email.label("user_email"),
+    Comment.author_role.label("user_role"),
+    Comment.is_deleted,
+)
 
 
 @router.post("/", response_model=CommentOut)
+@query_budget(6)
 def add_comment(
     comment: CommentCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user=Depends(get_current_user)
 ):
     ticket = db.query(Ticket).filter(
@@ -28,14 +48,15 @@ def add_comment(
     new_comment = Comment(
         content=comment.content,
         ticket_id=comment.ticket_id,
-        user_id=current_user.id
+        user_id=current_user.id,
+        author_email=current_user.email,
+        author_role=current_user.role,
     )
 
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    db.flush()
 
-    return {
+    out = {
         "id": new_comment.id,
         "content": new_comment.content,
         "created_at": new_comment.created_at,
@@ -44,58 +65,85 @@ def add_comment(
         "user_role": current_user.role,
         "is_deleted": False
     }
+    bump_version(db, TICKET, ticket.id)
+    publish_on_commit(
+        db, ticket.project_id, "comment.created", {**out, "ticket_id": ticket.id}
+    )
+
+    return out
 
 
-@router.get("/ticket/{ticket_id}", response_model=list[CommentOut])
+@router.get("/ticket/{ticket_id}", response_model=CommentPage)
+@query_budget(5)
 def list_comments(
     ticket_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    before: str | None = None,
+    order: Literal["asc", "desc"] = "desc",
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
-    rows = (
-        db.query(Comment, User)
-        .join(User, User.id == Comment.user_id)
-        .filter(
-            Comment.ticket_id == ticket_id,
-            Comment.is_deleted == False
+    version = check_not_modified(request, response, db, TICKET, ticket_id)
+
+    def build():
+        # Both read the (ticket_id, is_deleted, created_at) index, where
+        # deleted comments sit apart from the live ones
+        live = [Comment.ticket_id == ticket_id, Comment.is_deleted == False]
+        total = db.query(func.count(Comment.id)).filter(*live).scalar()
+
+        items, next_cursor, prev_cursor = paginate_window(
+            db.query(*COMMENT_COLUMNS).filter(*live),
+            [Comment.created_at, Comment.id],
+            limit,
+            after=after,
+            before=before,
+            descending=order == "desc",
         )
-        .order_by(Comment.created_at.asc())
-        .all()
-    )
-
-    return [
-        {
-            "id": c.id,
-            "content": c.content,
-            "created_at": c.created_at,
-            "user_id": u.id,
-            "user_email": u.email,
-            "user_role": u.role,
-            "is_deleted": c.is_deleted
+        return {
+            "total": total,
+            "items": items,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
         }
-        for c, u in rows
-    ]
+
+    return cached_response(
+        request, response, TICKET, ticket_id, version, CommentPage, build,
+        trusted=True,
+    )
 
 
 @router.delete("/{comment_id}")
+@query_budget(3)
 def soft_delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user=Depends(get_current_user)
 ):
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
+    row = (
+        db.query(Comment, Ticket.project_id, Project.owner_id)
+        .join(Ticket, Ticket.id == Comment.ticket_id)
+        .join(Project, Project.id == Ticket.project_id)
+        .filter(Comment.id == comment_id)
+        .first()
+    )
+    if not row:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    ticket = db.query(Ticket).filter(Ticket.id == comment.ticket_id).first()
-    project = db.query(Project).filter(Project.id == ticket.project_id).first()
+    comment, project_id, owner_id = row
 
     # Admin or comment owner
-    if current_user.id != comment.user_id and current_user.id != project.owner_id:
+    if current_user.id != comment.user_id and current_user.id != owner_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
     comment.is_deleted = True
     comment.content = "This comment was deleted"
 
-    db.commit()
+    bump_version(db, TICKET, comment.ticket_id)
+    publish_on_commit(
+        db, project_id, "comment.deleted",
+        {"id": comment.id, "ticket_id": comment.ticket_id},
+    )
     return {"message": "Comment deleted"}
@@ -0,0 +1,312 @@
+import math
+import threading
+import time
+from collections import Counter as ReasonCounter
+from collections import OrderedDict
+
+import anyio.to_thread
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+from fastapi.security.utils import get_authorization_scheme_param
+from jose import JWTError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+from app.core.config import (
+    ASYNC_DB,
+    MAX_DB_WAITING,
+    MAX_IN_FLIGHT,
+    MAX_THREADPOOL_QUEUE,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX_CLIENTS,
+    RATE_LIMIT_PER_USER,
+    ROUTE_RATE_LIMITS,
+)
+from app.core.metrics import ADMISSION_REJECTED
+from app.core.token import verify_access_token
+
+# Never limited: live streams hold their request open for as long as the
+# client watches, and monitoring must stay reachable under overload
+EXEMPT_PREFIXES = ("/live/", "/monitoring/", "/metrics")
+
+
+# -----------------------------
+# Token buckets
+# -----------------------------
+class RateLimiter:
+    """
+    One token bucket per client key: ``rate`` requests per second, up to
+    ``burst`` saved up. At most ``max_clients`` buckets are kept; the least
+    recently seen client starts over with a full bucket. Only used from
+    the event loop, so it takes no lock.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        # 0 when admitted, else the seconds until a token is available
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(self.burst)
+        else:
+            tokens = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            self._buckets.move_to_end(key)
+
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            wait = 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            wait = (1 - tokens) / self.rate
+
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> dict:
+        return {"rate": self.rate, "burst": self.burst, "clients": len(self._buckets)}
+
+
+def rate_limit(rate: float, burst: int):
+    """
+    Limit how often one client may call a route, on top of the per-user
+    limit. Goes below the route decorator:
+
+        @router.get("/search")
+        @rate_limit(5, 20)
+        def search_tickets(...): ...
+
+    FIXHUB_ROUTE_RATE_LIMITS overrides it without a code change.
+    """
+
+    def decorate(endpoint):
+        endpoint.rate_limit = (rate, burst)
+        return endpoint
+
+    return decorate
+
+
+class KeyedLimit:
+    """
+    A limit keyed on something the middleware cannot see, such as a field
+    of the request body. The handler calls check() once it has the key; an
+    empty bucket is a 429 with Retry-After, counted under ``name``. Called
+    from threadpool handlers, so the buckets are behind a lock.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.limiter = (
+            RateLimiter(rate, burst, RATE_LIMIT_MAX_CLIENTS) if rate > 0 else None
+        )
+        self._lock = threading.Lock()
+
+    def check(self, key: str) -> None:
+        if self.limiter is None:
+            return
+        with self._lock:
+            wait = self.limiter.acquire(key)
+        if wait:
+            admission.rejected[self.name] += 1
+            ADMISSION_REJECTED.inc((self.name,))
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    def stats(self) -> dict | None:
+        return self.limiter.stats() if self.limiter is not None else None
+
+
+def parse_route_limits(spec: str) -> dict[str, tuple[float, int]]:
+    # "GET /tickets/search=2:10;POST /auth/register=0.5:5"
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(";"))):
+        route, _, values = item.rpartition("=")
+        rate, _, burst = values.partition(":")
+        limits[" ".join(route.split())] = (float(rate), int(burst or max(1, float(rate))))
+    return limits
+
+
+# -----------------------------
+# Saturation
+# -----------------------------
+def _pools() -> list:
+    from app.database.db import engine, read_engine
+
+    engines = [engine] if engine is read_engine else [engine, read_engine]
+    pools = [e.pool for e in engines]
+    if ASYNC_DB:
+        from app.database.async_db import async_engine, async_read_engine
+
+        pools += [async_engine.pool] if async_engine is async_read_engine else [
+            async_engine.pool, async_read_engine.pool
+        ]
+    return pools
+
+
+def db_waiting() -> int:
+    # Callers currently waiting for (or opening) a database connection
+    return sum(getattr(pool, "waiting", 0) for pool in _pools())
+
+
+def threadpool_stats() -> dict:
+    # The limiter FastAPI runs sync handlers and dependencies on; needs the
+    # event loop
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {
+        "borrowed": statistics.borrowed_tokens,
+        "total": statistics.total_tokens,
+        "waiting": statistics.tasks_waiting,
+    }
+
+
+# -----------------------------
+# Middleware
+# -----------------------------
+class Admission:
+    """
+    This process's admission state: requests in flight, the per-user
+    buckets and what was refused, shared by every app instance.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.rejected: ReasonCounter[str] = ReasonCounter()
+        self.users = (
+            RateLimiter(RATE_LIMIT_PER_USER, RATE_LIMIT_BURST, RATE_LIMIT_MAX_CLIENTS)
+            if RATE_LIMIT_PER_USER > 0 else None
+        )
+        self.keyed: dict[str, KeyedLimit] = {}
+
+    def keyed_limit(self, name: str, rate: float, burst: int) -> KeyedLimit:
+        limit = self.keyed[name] = KeyedLimit(name, rate, burst)
+        return limit
+
+    def overloaded(self) -> str | None:
+        if MAX_IN_FLIGHT and self.in_flight >= MAX_IN_FLIGHT:
+            return "in_flight"
+        if MAX_THREADPOOL_QUEUE and threadpool_stats()["waiting"] >= MAX_THREADPOOL_QUEUE:
+            return "threadpool"
+        if MAX_DB_WAITING and db_waiting() >= MAX_DB_WAITING:
+            return "db_pool"
+        return None
+
+    def stats(self, app) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": MAX_IN_FLIGHT,
+            "threadpool": {**threadpool_stats(), "max_waiting": MAX_THREADPOOL_QUEUE},
+            "db_waiting": db_waiting(),
+            "max_db_waiting": MAX_DB_WAITING,
+            "users": self.users.stats() if self.users is not None else None,
+            "routes": {
+                f"{'/'.join(sorted(route.methods))} {route.path}": limiter.stats()
+                for route, limiter in route_limits(app)
+            },
+            "keyed": {name: limit.stats() for name, limit in self.keyed.items()},
+            "rejected": dict(self.rejected),
+        }
+
+
+admission = Admission()
+
+
+def client_key(scope) -> str:
+    # Verified claims come from the token cache, so this rarely decodes
+    scheme, token = get_authorization_scheme_param(
+        Headers(scope=scope).get("authorization")
+    )
+    if scheme.lower() == "bearer" and token:
+        try:
+            user_id = verify_access_token(token)[1].get("user_id")
+        except JWTError:
+            user_id = None
+        if user_id is not None:
+            return f"user:{user_id}"
+    client = scope.get("client")
+    return f"addr:{client[0] if client else 'unknown'}"
+
+
+def route_limits(app) -> list[tuple[APIRoute, RateLimiter]]:
+    # Built once per app; only routes with a limit are matched per request
+    limits = getattr(app.state, "route_limits", None)
+    if limits is not None:
+        return limits
+
+    overrides = parse_route_limits(ROUTE_RATE_LIMITS)
+    limits = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in sorted(route.methods):
+            limit = overrides.get(
+                f"{method} {route.path}", getattr(route.endpoint, "rate_limit", None)
+            )
+            if limit is not None and limit[0] > 0:
+                limits.append(
+                    (route, RateLimiter(limit[0], limit[1], RATE_LIMIT_MAX_CLIENTS))
+                )
+                break
+    app.state.route_limits = limits
+    return limits
+
+
+class AdmissionMiddleware:
+    """
+    Decides before routing whether a request may run at all. When this
+    process is saturated (too many requests in flight, too many calls
+    queued for the threadpool or for a DB connection) it answers 503 so
+    clients back off instead of piling on. Otherwise every client spends a
+    token per request from its own bucket, and one from the route's bucket
+    if the route has a @rate_limit; an empty bucket is a 429. Both carry
+    Retry-After.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            return await self.app(scope, receive, send)
+
+        overloaded = admission.overloaded()
+        if overloaded is not None:
+            return await self.reject(scope, receive, send, 503, overloaded, 1.0)
+
+        client = client_key(scope)
+        if admission.users is not None:
+            wait = admission.users.acquire(client)
+            if wait:
+                return await self.reject(scope, receive, send, 429, "user", wait)
+
+        for route, limiter in route_limits(scope["app"]):
+            if route.matches(scope)[0] == Match.FULL:
+                wait = limiter.acquire(client)
+                if wait:
+                    return await self.reject(scope, receive, send, 429, "route", wait)
+                break
+
+        admission.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.in_flight -= 1
+
+    async def reject(self, scope, receive, send, status: int, reason: str, retry_after: float):
+        admission.rejected[reason] += 1
+        ADMISSION_REJECTED.inc((reason,))
+        detail = "Too many requests" if status == 429 else "Server busy, retry later"
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=status,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
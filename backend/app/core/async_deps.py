@@ -0,0 +1,115 @@
+import functools
+import inspect
+
+from fastapi import APIRouter, Depends, params
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.async_db import AsyncReadSessionLocal, AsyncSessionLocal
+from app.core.deps import get_db, get_read_db, get_current_user, oauth2_scheme
+from app.core.metrics import TimedRoute, track
+
+
+async def get_async_db():
+    # Same unit of work as get_db()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            with track("db"):
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def get_async_read_db():
+    # Same as get_read_db(): reader pool, never takes the write lock
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return await db.run_sync(lambda session: get_current_user(token, session))
+
+
+# Sync dependency -> async replacement used by async_router()
+ASYNC_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_read_db: get_async_read_db,
+    get_current_user: get_current_user_async,
+}
+
+
+def _async_endpoint(endpoint):
+    """
+    Wrap a sync route handler so it runs on the event loop.
+
+    The handler body is reused unchanged: it is executed through
+    AsyncSession.run_sync, which hands it a regular Session whose I/O is
+    awaited on the aiosqlite connection instead of blocking a threadpool
+    worker. Its Depends(get_db) / Depends(get_current_user) parameters are
+    swapped for their async counterparts in the wrapper's signature.
+    """
+    signature = inspect.signature(endpoint)
+    session_params = []
+    parameters = []
+
+    for param in signature.parameters.values():
+        default = param.default
+        if isinstance(default, params.Depends):
+            replacement = ASYNC_DEPENDENCIES.get(default.dependency)
+            if replacement is not None:
+                if default.dependency in (get_db, get_read_db):
+                    session_params.append(param.name)
+                    param = param.replace(annotation=AsyncSession)
+                param = param.replace(
+                    default=Depends(replacement, scope=default.scope)
+                )
+        parameters.append(param)
+
+    if not session_params:
+        raise ValueError(f"{endpoint.__name__} does not depend on get_db")
+
+    @functools.wraps(endpoint)
+    async def wrapper(**kwargs):
+        db = kwargs[session_params[0]]
+
+        def call(session):
+            for name in session_params:
+                kwargs[name] = session
+            return endpoint(**kwargs)
+
+        return await db.run_sync(call)
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    # Same paths, models and tags as ``router``, served by async handlers
+    mirrored = APIRouter(route_class=TimedRoute)
+
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            mirrored.routes.append(route)
+            continue
+
+        mirrored.add_api_route(
+            route.path,
+            _async_endpoint(route.endpoint),
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            name=route.name,
+            summary=route.summary,
+            description=route.description,
+            response_class=route.response_class,
+            responses=route.responses,
+            dependencies=route.dependencies,
+        )
+
+    return mirrored
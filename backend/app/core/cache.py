@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+# Every cache created here, by name, for the monitoring endpoint
+CACHES: dict[str, "TTLCache"] = {}
+
+# Called with the set of (cache, key) evicted by each committed transaction,
+# e.g. to evict them in the other worker processes too
+invalidation_listeners: list = []
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache with a per-entry time to live.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        CACHES[name] = self
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float | None = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def invalidate_on_commit(target, cache: TTLCache, key):
+    """
+    Evict ``key`` now and again once the session owning ``target`` commits,
+    so a concurrent request cannot re-cache the pre-commit state.
+    """
+    cache.invalidate(key)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("cache_invalidations", set()).add((cache, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_invalidations(session):
+    invalidations = session.info.pop("cache_invalidations", None)
+    if not invalidations:
+        return
+    for cache, key in invalidations:
+        cache.invalidate(key)
+    for listener in invalidation_listeners:
+        listener(invalidations)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_invalidations(session):
+    session.info.pop("cache_invalidations", None)
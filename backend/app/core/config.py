@@ -0,0 +1,142 @@
+import os
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# Authenticated-user cache (app/core/deps.py), evicted like memberships
+USER_CACHE_SIZE = _int("FIXHUB_USER_CACHE_SIZE", 10_000)
+USER_CACHE_TTL = _float("FIXHUB_USER_CACHE_TTL", 60)
+
+# Verified access token claims (app/core/token.py), kept until the token
+# expires. A background thread reads the logouts made by other worker
+# processes from the revoked_tokens table every this many seconds.
+TOKEN_CACHE_SIZE = _int("FIXHUB_TOKEN_CACHE_SIZE", 10_000)
+TOKEN_DENYLIST_SYNC = _float("FIXHUB_TOKEN_DENYLIST_SYNC", 2)
+
+# Per-user project membership cache (app/core/permissions.py). Changes
+# evict it in every worker through the "redis" event broker; the TTL bounds
+# how stale another worker's entry can get without one
+MEMBERSHIP_CACHE_SIZE = _int("FIXHUB_MEMBERSHIP_CACHE_SIZE", 10_000)
+MEMBERSHIP_CACHE_TTL = _float("FIXHUB_MEMBERSHIP_CACHE_TTL", 30)
+
+# Serve the ticket, kanban, comment and dashboard routes from async
+# handlers on an aiosqlite engine instead of the sync threadpool
+ASYNC_DB = os.getenv("FIXHUB_ASYNC_DB", "0").lower() in ("1", "true", "yes")
+# Threads that run sync handlers and dependencies (anyio's default limiter,
+# resized at startup); anyio's own default is 40
+THREADPOOL_SIZE = _int("FIXHUB_THREADPOOL_SIZE", 40)
+
+# Password hashing (app/core/security.py). 0 workers hashes inline.
+BCRYPT_ROUNDS = _int("FIXHUB_BCRYPT_ROUNDS", 12)
+PASSWORD_HASH_WORKERS = _int(
+    "FIXHUB_PASSWORD_HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2)
+)
+# Hashes queued or running before register/login answer 503. Kept below
+# the threadpool size so a login storm is refused here before the lookups
+# around each hash can fill the threadpool
+PASSWORD_HASH_MAX_PENDING = _int(
+    "FIXHUB_PASSWORD_HASH_MAX_PENDING", max(1, THREADPOOL_SIZE * 4 // 5)
+)
+
+# Attachment blob storage (app/core/storage.py): "local" or "s3"
+ATTACHMENT_STORAGE = os.getenv("FIXHUB_ATTACHMENT_STORAGE", "local")
+ATTACHMENT_DIR = os.getenv("FIXHUB_ATTACHMENT_DIR", "app/uploads")
+MAX_ATTACHMENT_BYTES = _int("FIXHUB_MAX_ATTACHMENT_BYTES", 25 * 1024 * 1024)
+ATTACHMENT_S3_BUCKET = os.getenv("FIXHUB_ATTACHMENT_S3_BUCKET", "")
+ATTACHMENT_S3_PREFIX = os.getenv("FIXHUB_ATTACHMENT_S3_PREFIX", "attachments/")
+ATTACHMENT_S3_ENDPOINT = os.getenv("FIXHUB_ATTACHMENT_S3_ENDPOINT") or None
+
+# Largest batch accepted by the /tickets/bulk endpoints
+BULK_MAX_ITEMS = _int("FIXHUB_BULK_MAX_ITEMS", 5_000)
+
+# Live project events and cache invalidations (app/core/events.py):
+# "local" for a single process, "redis" to share them between worker
+# processes
+EVENT_BROKER = os.getenv("FIXHUB_EVENT_BROKER", "local")
+EVENT_REDIS_URL = os.getenv("FIXHUB_EVENT_REDIS_URL", "redis://localhost:6379/0")
+# Per-connection backlog before a slow client is told to resync
+EVENT_QUEUE_SIZE = _int("FIXHUB_EVENT_QUEUE_SIZE", 256)
+EVENT_KEEPALIVE = _float("FIXHUB_EVENT_KEEPALIVE", 15)
+
+# Serialized responses of project-scoped reads (app/core/response_cache.py):
+# "memory" (per process), "redis" (shared by workers) or "off"
+RESPONSE_CACHE = os.getenv("FIXHUB_RESPONSE_CACHE", "memory")
+RESPONSE_CACHE_MAX_BYTES = _int("FIXHUB_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+RESPONSE_CACHE_REDIS_URL = os.getenv("FIXHUB_RESPONSE_CACHE_REDIS_URL", EVENT_REDIS_URL)
+RESPONSE_CACHE_TTL = _int("FIXHUB_RESPONSE_CACHE_TTL", 300)
+# Opt-in: encode list responses built from plain DB rows without
+# validating every row again; orjson is used for the encoding when it is
+# installed
+FAST_JSON = os.getenv("FIXHUB_FAST_JSON", "0").lower() in ("1", "true", "yes")
+
+# Database (app/database/db.py)
+DATABASE_URL = os.getenv("FIXHUB_DATABASE_URL", "sqlite:///./fixhub.db")
+# SQLite connection profile, applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("FIXHUB_SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("FIXHUB_SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = _int("FIXHUB_SQLITE_BUSY_TIMEOUT_MS", 5_000)
+SQLITE_MMAP_SIZE = _int("FIXHUB_SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+# Negative: KiB of page cache per connection
+SQLITE_CACHE_SIZE = _int("FIXHUB_SQLITE_CACHE_SIZE", -64 * 1024)
+# Read-only routes share a pool of reader connections; writes go through
+# a separate, by default single-connection, writer pool
+DB_READER_POOL_SIZE = _int("FIXHUB_DB_READER_POOL_SIZE", 20)
+DB_WRITER_POOL_SIZE = _int("FIXHUB_DB_WRITER_POOL_SIZE", 1)
+DB_POOL_TIMEOUT = _float("FIXHUB_DB_POOL_TIMEOUT", 30)
+# Attempts to take the write lock once busy_timeout has run out
+DB_WRITE_RETRIES = _int("FIXHUB_DB_WRITE_RETRIES", 5)
+DB_WRITE_BACKOFF = _float("FIXHUB_DB_WRITE_BACKOFF", 0.05)
+
+# Request instrumentation (app/core/metrics.py): per-route histograms on
+# /metrics and a Server-Timing header on every response
+METRICS = os.getenv("FIXHUB_METRICS", "1").lower() in ("1", "true", "yes")
+SERVER_TIMING = os.getenv("FIXHUB_SERVER_TIMING", "1").lower() in ("1", "true", "yes")
+# Log statements slower than this many milliseconds; 0 turns the log off
+SLOW_QUERY_MS = _float("FIXHUB_SLOW_QUERY_MS", 0)
+# Log a warning when startup (router imports plus the lifespan phases in
+# app/core/startup.py) takes longer than this many milliseconds; 0 is off
+STARTUP_BUDGET_MS = _float("FIXHUB_STARTUP_BUDGET_MS", 0)
+# Per-route SQL statement budgets (@query_budget in app/core/metrics.py):
+# "log" a warning, "raise" an error (for test runs and CI) or "off"
+QUERY_BUDGET = os.getenv("FIXHUB_QUERY_BUDGET", "log")
+# Executions of one statement per request before it is flagged as an N+1
+QUERY_REPEAT_LIMIT = _int("FIXHUB_QUERY_REPEAT_LIMIT", 5)
+
+# Admission control (app/core/admission.py), per worker process.
+ADMISSION = os.getenv("FIXHUB_ADMISSION", "1").lower() in ("1", "true", "yes")
+# Token buckets: requests per second per client (the token's user, or the
+# client address without one) and how many may be saved up; 0 rate is off.
+# Behind a reverse proxy the address is the proxy's unless uvicorn runs
+# with --proxy-headers --forwarded-allow-ips=<proxy addresses>, which makes
+# it take the client from X-Forwarded-For for those peers only
+RATE_LIMIT_PER_USER = _float("FIXHUB_RATE_LIMIT_PER_USER", 30)
+RATE_LIMIT_BURST = _int("FIXHUB_RATE_LIMIT_BURST", 120)
+RATE_LIMIT_MAX_CLIENTS = _int("FIXHUB_RATE_LIMIT_MAX_CLIENTS", 100_000)
+# Per-client limits of single routes, overriding their @rate_limit:
+# "METHOD /route/template=rate:burst" separated by ";", e.g.
+# "GET /tickets/search=2:10;POST /auth/register=0.5:5"
+ROUTE_RATE_LIMITS = os.getenv("FIXHUB_ROUTE_RATE_LIMITS", "")
+# Login attempts per second per account and how many may be saved up,
+# keyed by the submitted email so users behind one NAT don't share them
+LOGIN_RATE_LIMIT = _float("FIXHUB_LOGIN_RATE_LIMIT", 1)
+LOGIN_RATE_BURST = _int("FIXHUB_LOGIN_RATE_BURST", 10)
+# Shed load with 503 once this many requests are in flight, this many
+# calls are queued for the threadpool or this many callers are waiting
+# for a database connection; 0 turns a check off. A sync request holds
+# its session while it waits for a thread, so admitting many more requests
+# than there are threads lets a burst starve the connection pool until it
+# times out: the in-flight limit defaults to the threadpool size. Async
+# handlers wait on the database without a thread, so with FIXHUB_ASYNC_DB
+# on it is its own setting and off unless set
+MAX_IN_FLIGHT = (
+    _int("FIXHUB_MAX_IN_FLIGHT_ASYNC", 0) if ASYNC_DB
+    else _int("FIXHUB_MAX_IN_FLIGHT", THREADPOOL_SIZE)
+)
+MAX_THREADPOOL_QUEUE = _int("FIXHUB_MAX_THREADPOOL_QUEUE", 40)
+MAX_DB_WAITING = _int("FIXHUB_MAX_DB_WAITING", 20)
@@ -0,0 +1,138 @@
+from collections import Counter
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models.ticket import Ticket
+from app.models.ticket_counter import TicketCounter
+from app.core.versions import PROJECT, bump_version
+
+# Ticket attribute behind each dashboard dimension
+DIMENSIONS = {
+    "status": "status",
+    "priority": "priority",
+    "assignee": "assigned_to",
+}
+
+UNASSIGNED = ""
+
+
+def counter_value(value) -> str:
+    return UNASSIGNED if value is None else str(value)
+
+
+def ticket_state(ticket) -> dict:
+    # What the counters need to know about a ticket, captured before and
+    # after a write
+    return {
+        "project_id": ticket.project_id,
+        "is_deleted": bool(ticket.is_deleted),
+        **{attr: getattr(ticket, attr) for attr in DIMENSIONS.values()},
+    }
+
+
+def _contributions(state: dict | None, sign: int, deltas: Counter):
+    if state is None or state["is_deleted"]:
+        return
+    for dimension, attr in DIMENSIONS.items():
+        key = (state["project_id"], dimension, counter_value(state[attr]))
+        deltas[key] += sign
+
+
+def apply_ticket_changes(db: Session, changes: list[tuple[dict | None, dict | None]]):
+    """
+    Adjust the counters for ticket writes in the caller's transaction.
+    Each change is (state before, state after); None for a ticket that did
+    not exist before.
+    """
+    deltas: Counter = Counter()
+    for before, after in changes:
+        _contributions(before, -1, deltas)
+        _contributions(after, +1, deltas)
+
+    rows = [
+        {"project_id": p, "dimension": d, "value": v, "count": n}
+        for (p, d, v), n in deltas.items()
+        if n
+    ]
+    if not rows:
+        return
+
+    stmt = insert(TicketCounter)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["project_id", "dimension", "value"],
+            set_={"count": TicketCounter.count + stmt.excluded.count},
+        ),
+        rows,
+    )
+
+
+def apply_ticket_change(db: Session, before: dict | None, after: dict | None):
+    apply_ticket_changes(db, [(before, after)])
+
+
+def get_counts(db: Session, project_id: int) -> dict[str, dict[str, int]]:
+    counts: dict[str, dict[str, int]] = {d: {} for d in DIMENSIONS}
+    rows = db.query(
+        TicketCounter.dimension, TicketCounter.value, TicketCounter.count
+    ).filter(TicketCounter.project_id == project_id)
+    for dimension, value, count in rows:
+        if count and dimension in counts:
+            counts[dimension][value] = count
+    return counts
+
+
+def reconcile(db: Session, project_id: int | None = None, fix: bool = True) -> list[dict]:
+    """
+    Recount live tickets from scratch and compare with the stored counters.
+    Returns every mismatch; with ``fix`` the counters are rewritten to the
+    recounted values (the caller commits).
+    """
+    expected: dict[tuple, int] = {}
+    for dimension, attr in DIMENSIONS.items():
+        column = getattr(Ticket, attr)
+        query = (
+            db.query(Ticket.project_id, column, func.count(Ticket.id))
+            .filter(Ticket.is_deleted == False)
+            .group_by(Ticket.project_id, column)
+        )
+        if project_id is not None:
+            query = query.filter(Ticket.project_id == project_id)
+        for pid, value, count in query:
+            expected[(pid, dimension, counter_value(value))] = count
+
+    stored_query = db.query(TicketCounter)
+    if project_id is not None:
+        stored_query = stored_query.filter(TicketCounter.project_id == project_id)
+    stored = {
+        (c.project_id, c.dimension, c.value): c.count for c in stored_query
+    }
+
+    drift = [
+        {
+            "project_id": key[0],
+            "dimension": key[1],
+            "value": key[2],
+            "stored": stored.get(key, 0),
+            "actual": expected.get(key, 0),
+        }
+        for key in sorted(set(expected) | set(stored), key=str)
+        if stored.get(key, 0) != expected.get(key, 0)
+    ]
+
+    if fix and drift:
+        stored_query.delete(synchronize_session=False)
+        db.bulk_insert_mappings(
+            TicketCounter,
+            [
+                {"project_id": p, "dimension": d, "value": v, "count": n}
+                for (p, d, v), n in expected.items()
+            ],
+        )
+        # Dashboards served from the old counters must not stay cached
+        for pid in {row["project_id"] for row in drift}:
+            bump_version(db, PROJECT, pid)
+
+    return drift
@@ -1,17 +1,47 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from app.database.db import SessionLocal
+from app.database.db import ReadSessionLocal, SessionLocal
 from app.models.user import User
-from app.core.token import SECRET_KEY, ALGORITHM
+from app.core.token import denylist, password_changed, verify_access_token
+from app.core.cache import TTLCache, invalidate_on_commit
+from app.core.config import USER_CACHE_SIZE, USER_CACHE_TTL
+from app.core.metrics import track
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# user_id -> detached User, so authenticated requests skip the users lookup
+user_cache = TTLCache("users", maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    invalidate_on_commit(target, user_cache, target.id)
+
 
 def get_db():
+    # The request's unit of work: handlers only flush, and the one commit
+    # happens here after the handler returns. Declare it with
+    # scope="function" so that is before the response is sent.
     db = SessionLocal()
+    try:
+        yield db
+        with track("db"):
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_read_db():
+    # Read-only routes: reader pool, never takes the write lock
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -20,18 +50,40 @@ def get_db():
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
+    with track("auth"):
+        return _authenticate(token, db)
+
+
+def _authenticate(token: str, db: Session):
+    # Verified claims (cached per token), the logout denylist, then the
+    # user from the cache or the database
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
+        digest, payload = verify_access_token(token)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(status_code=401, detail="User not found")
+    email: str = payload.get("sub")
+    if email is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    if denylist.is_revoked(digest):
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+    user_id = payload.get("user_id")
+    user = user_cache.get(user_id) if user_id is not None else None
+    if user is None or user.email != email:
+        user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not found")
+
+        # Detach so the cached instance is never expired by this session's commit
+        db.expunge(user)
+        if user.id == user_id:
+            user_cache.set(user_id, user)
+
+    if password_changed(payload, user.password_version):
+        raise HTTPException(status_code=401, detail="Token revoked")
 
     return user
@@ -0,0 +1,237 @@
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import CACHES, invalidation_listeners
+from app.core.config import EVENT_BROKER, EVENT_QUEUE_SIZE, EVENT_REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+# Sent to a subscriber whose queue overflowed, in place of what it missed:
+# the client should re-fetch the board instead of applying deltas
+RESYNC = json.dumps({"type": "resync"})
+
+
+# -----------------------------
+# Subscribers and the in-process hub
+# -----------------------------
+class Subscriber:
+    def __init__(self, project_id: int, maxsize: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+        self.overflows = 0
+
+    def offer(self, message: str) -> bool:
+        # Never blocks the publisher: a consumer too slow to keep up loses
+        # its backlog and is told to resync
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            self.overflows += 1
+            return False
+
+
+class EventHub:
+    """
+    Fans project events out to the live connections of this process.
+    Each connection has a bounded queue, drained by its own stream task.
+    deliver() may be called from any thread.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.overflows = 0
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: int):
+        subscriber = Subscriber(project_id, self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.setdefault(project_id, set()).add(subscriber)
+        await broker.start(self)
+
+        try:
+            yield subscriber
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(project_id)
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[project_id]
+
+    def deliver(self, project_id: int, message: str):
+        with self._lock:
+            loop = self._loop
+            if loop is None or project_id not in self._subscribers:
+                return
+        loop.call_soon_threadsafe(self._fan_out, project_id, message)
+
+    def _fan_out(self, project_id: int, message: str):
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscriber in subscribers:
+            if subscriber.offer(message):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "broker": type(broker).__name__,
+                "projects": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "queue_size": self.queue_size,
+                "delivered": self.delivered,
+                "overflows": self.overflows,
+            }
+
+
+# -----------------------------
+# Brokers (how events reach the hub of every worker process)
+# -----------------------------
+class Broker:
+    """
+    Carries published events to the hub of every process serving live
+    connections, including this one, and committed cache invalidations
+    to every other process.
+    """
+
+    async def start(self, hub: EventHub):
+        # Called at startup and whenever a connection subscribes; must be
+        # idempotent
+        pass
+
+    def publish(self, project_id: int, message: str):
+        raise NotImplementedError
+
+    def invalidate(self, cache: str, key):
+        # This process evicted the key already
+        pass
+
+
+class LocalBroker(Broker):
+    # Single process: hand events straight to the hub
+    def publish(self, project_id: int, message: str):
+        hub.deliver(project_id, message)
+
+
+class RedisBroker(Broker):
+    # Several worker processes: relay events through Redis pub/sub
+    CHANNEL = "fixhub:project:"
+    INVALIDATIONS = "fixhub:invalidate"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("FIXHUB_EVENT_BROKER=redis requires the redis package")
+
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+        self._listener: asyncio.Task | None = None
+
+    async def start(self, hub: EventHub):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(hub))
+
+    async def _listen(self, hub: EventHub):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.psubscribe(self.CHANNEL + "*")
+            await pubsub.subscribe(self.INVALIDATIONS)
+            async for item in pubsub.listen():
+                if item["type"] == "message":
+                    apply_invalidation(item["data"].decode())
+                elif item["type"] == "pmessage":
+                    project_id = int(item["channel"].decode().rsplit(":", 1)[1])
+                    hub.deliver(project_id, item["data"].decode())
+
+    def publish(self, project_id: int, message: str):
+        self.client.publish(f"{self.CHANNEL}{project_id}", message)
+
+    def invalidate(self, cache: str, key):
+        self.client.publish(self.INVALIDATIONS, json.dumps([cache, key]))
+
+
+def apply_invalidation(message: str):
+    # Another process committed a change to what this cache entry holds
+    name, key = json.loads(message)
+    cache = CACHES.get(name)
+    if cache is not None:
+        cache.invalidate(key)
+
+
+hub = EventHub(EVENT_QUEUE_SIZE)
+broker: Broker = RedisBroker(EVENT_REDIS_URL) if EVENT_BROKER == "redis" else LocalBroker()
+
+
+# -----------------------------
+# Publishing from route handlers
+# -----------------------------
+TICKET_FIELDS = (
+    "id", "title", "description", "type", "status", "priority",
+    "project_id", "assigned_to", "rank",
+)
+
+
+def ticket_data(ticket) -> dict:
+    # A Ticket, or a dict of its columns, as the payload of ticket events
+    if isinstance(ticket, dict):
+        return {key: ticket[key] for key in TICKET_FIELDS if key in ticket}
+    return {key: getattr(ticket, key) for key in TICKET_FIELDS}
+
+
+def publish_on_commit(db: Session, project_id: int, type: str, data: dict):
+    """
+    Queue a delta for the project's live channel. It is sent once ``db``
+    commits, and dropped on rollback, so listeners never see a change
+    that did not happen.
+    """
+    message = json.dumps(
+        {"type": type, "project_id": project_id, "data": jsonable_encoder(data)}
+    )
+    db.info.setdefault("live_events", []).append((project_id, message))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_events(session):
+    for project_id, message in session.info.pop("live_events", ()):
+        # The write is already committed; a broker outage must not fail it
+        try:
+            broker.publish(project_id, message)
+        except Exception:
+            logger.exception("Could not publish live event for project %s", project_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_events(session):
+    session.info.pop("live_events", None)
+
+
+def _broadcast_invalidations(invalidations: set):
+    for cache, key in invalidations:
+        # Same as events: the write is committed, an outage must not fail it
+        try:
+            broker.invalidate(cache.name, key)
+        except Exception:
+            logger.exception("Could not broadcast %s cache invalidation", cache.name)
+
+
+invalidation_listeners.append(_broadcast_invalidations)
@@ -0,0 +1,450 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import (
+    QUERY_BUDGET,
+    QUERY_REPEAT_LIMIT,
+    SERVER_TIMING,
+    SLOW_QUERY_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Phases timed inside a request, besides the total. They overlap: the
+# queries run by get_current_user count towards both "auth" and "db".
+PHASES = ("db", "pool", "auth", "rbac", "serialize")
+
+
+# -----------------------------
+# Per-request measurements
+# -----------------------------
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        # SQL text -> executions, to spot the same query run once per row
+        self.statements: StatementCounter[str] = StatementCounter()
+        self.slow_queries = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.endpoint_done: float | None = None
+        self.db_at_endpoint_done = 0.0
+        # Set by TimedRoute while the route's statements count against its
+        # budget; a budget is reported at most once per request
+        self.budget: "QueryBudget | None" = None
+        self.route: str | None = None
+        self.budget_exceeded = False
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] += seconds
+
+    def server_timing(self) -> str:
+        entries = [
+            f'db;dur={self.phases["db"] * 1000:.2f};desc="{self.queries} queries"'
+        ]
+        for phase in PHASES[1:]:
+            if self.phases[phase]:
+                entries.append(f"{phase};dur={self.phases[phase] * 1000:.2f}")
+        total = time.perf_counter() - self.started
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+# Set by MetricsMiddleware for the duration of each HTTP request. Sync
+# handlers and dependencies run on a copy of the context, which still
+# points at the same RequestMetrics.
+_current: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+@contextmanager
+def track(phase: str):
+    # Time the block as part of ``phase`` of the current request, if any
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(phase, time.perf_counter() - started)
+
+
+# -----------------------------
+# Prometheus exposition
+# -----------------------------
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+        pairs.append(f'{name}="{value}"')
+    return ",".join(pairs)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{{{_labels(self.labels, labels)}}} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple, buckets: tuple):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # labels -> [count per bucket (non-cumulative) + overflow, sum]
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts, total = self._values.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                label_text = _labels(self.labels, labels)
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    lines.append(
+                        f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{self.name}_sum{{{label_text}}} {total[0]}")
+                lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+ROUTE_LABELS = ("method", "route")
+
+REQUESTS = Counter(
+    "fixhub_http_requests_total", "HTTP requests by route and status.",
+    ROUTE_LABELS + ("status",),
+)
+REQUEST_SECONDS = Histogram(
+    "fixhub_http_request_duration_seconds",
+    "Time from receiving a request to the end of its response.",
+    ROUTE_LABELS, SECONDS_BUCKETS,
+)
+QUERIES = Histogram(
+    "fixhub_db_queries_per_request", "SQL statements executed per request.",
+    ROUTE_LABELS, COUNT_BUCKETS,
+)
+PHASE_SECONDS = {
+    phase: Histogram(
+        f"fixhub_request_{phase}_seconds",
+        f"Time per request spent in {phase}.",
+        ROUTE_LABELS, SECONDS_BUCKETS,
+    )
+    for phase in PHASES
+}
+SLOW_QUERIES = Counter(
+    "fixhub_db_slow_queries_total",
+    "SQL statements slower than FIXHUB_SLOW_QUERY_MS.",
+    ROUTE_LABELS,
+)
+BUDGET_VIOLATIONS = Counter(
+    "fixhub_query_budget_violations_total",
+    "Requests that ran more SQL statements than their route allows.",
+    ROUTE_LABELS,
+)
+TOKEN_LOOKUPS = Counter(
+    "fixhub_token_cache_lookups_total",
+    "Access token verifications: hit (cached claims) or miss (JWT decoded).",
+    ("result",),
+)
+TOKENS_REJECTED = Counter(
+    "fixhub_tokens_revoked_total",
+    "Valid tokens refused because they were logged out or the password changed.",
+    ("reason",),
+)
+ADMISSION_REJECTED = Counter(
+    "fixhub_admission_rejected_total",
+    "Requests refused before routing: 429 for rate limits, 503 when shedding load.",
+    ("reason",),
+)
+METRICS = [
+    REQUESTS, REQUEST_SECONDS, QUERIES, *PHASE_SECONDS.values(),
+    SLOW_QUERIES, BUDGET_VIOLATIONS, TOKEN_LOOKUPS, TOKENS_REJECTED,
+    ADMISSION_REJECTED,
+]
+
+
+def render() -> str:
+    # Counters of this process only: scrape every worker separately
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def record(method: str, route: str, status: int, metrics: RequestMetrics, seconds: float):
+    labels = (method, route)
+    REQUESTS.inc(labels + (str(status),))
+    REQUEST_SECONDS.observe(labels, seconds)
+    QUERIES.observe(labels, metrics.queries)
+    for phase, value in metrics.phases.items():
+        PHASE_SECONDS[phase].observe(labels, value)
+    if metrics.slow_queries:
+        SLOW_QUERIES.inc(labels, metrics.slow_queries)
+
+
+# -----------------------------
+# Middleware
+# -----------------------------
+class MetricsMiddleware:
+    """
+    Measures every HTTP request: adds a Server-Timing header to the
+    response and records the request under its route template (e.g.
+    /kanban/project/{project_id}), so path parameters never multiply the
+    series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", metrics.server_timing()
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            record(
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                status,
+                metrics,
+                time.perf_counter() - metrics.started,
+            )
+
+
+# -----------------------------
+# Query budgets
+# -----------------------------
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryBudget:
+    def __init__(self, max_queries: int | None, max_repeats: int | None):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+
+    def violations(self, metrics: RequestMetrics) -> list[str]:
+        problems = []
+        if self.max_queries is not None and metrics.queries > self.max_queries:
+            problems.append(
+                f"{metrics.queries} statements, budget {self.max_queries}"
+            )
+        for statement, count in metrics.statements.most_common():
+            if self.max_repeats is None or count <= self.max_repeats:
+                break
+            problems.append(
+                f"{count} executions of: {' '.join(statement.split())[:200]}"
+            )
+        return problems
+
+
+DEFAULT_BUDGET = QueryBudget(None, QUERY_REPEAT_LIMIT)
+
+
+def query_budget(
+    max_queries: int | None = None, max_repeats: int | None = QUERY_REPEAT_LIMIT
+):
+    """
+    Declare how many SQL statements a route may run, counted up to the
+    response being ready (BEGIN included, COMMIT not), and how often any
+    one statement may repeat. Goes below the route decorator:
+
+        @router.get("/{ticket_id}")
+        @query_budget(4)
+        def get_ticket(...): ...
+
+    Size budgets for the cold path (user and membership caches missed).
+    None leaves that limit unchecked. Routes without a budget are only
+    checked for repeats (FIXHUB_QUERY_REPEAT_LIMIT). Needs
+    FIXHUB_METRICS; FIXHUB_QUERY_BUDGET=raise turns violations into errors.
+    """
+
+    def decorate(endpoint):
+        endpoint.query_budget = QueryBudget(max_queries, max_repeats)
+        return endpoint
+
+    return decorate
+
+
+def check_budget(metrics: RequestMetrics):
+    budget = metrics.budget
+    if budget is None or metrics.budget_exceeded or QUERY_BUDGET == "off":
+        return
+    problems = budget.violations(metrics)
+    if not problems:
+        return
+    metrics.budget_exceeded = True
+    BUDGET_VIOLATIONS.inc(tuple(metrics.route.split(" ", 1)))
+    message = f"Query budget exceeded on {metrics.route}: " + "; ".join(problems)
+    if QUERY_BUDGET == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+@event.listens_for(Session, "before_commit")
+def _check_budget_before_commit(session):
+    # A route that commits itself (or get_db, once it returns) is checked
+    # before its writes land, so in raise mode an over-budget request
+    # leaves nothing behind
+    metrics = _current.get()
+    if metrics is not None:
+        check_budget(metrics)
+
+
+# -----------------------------
+# Serialization time
+# -----------------------------
+def _mark_endpoint_done():
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.endpoint_done = time.perf_counter()
+        metrics.db_at_endpoint_done = metrics.phases["db"]
+
+
+def _timed_endpoint(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class that times what FastAPI does between the handler returning
+    and the response being ready: validating the result against the
+    response model and encoding it. Lazy loads triggered on the way count
+    as "db", not "serialize". Then checks the route's query budget; commits
+    made while the route runs are checked before they happen.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        self.query_budget = getattr(endpoint, "query_budget", DEFAULT_BUDGET)
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.budget = self.query_budget
+                metrics.route = f"{request.method} {self.path}"
+            response = await handler(request)
+            if metrics is not None and metrics.endpoint_done is not None:
+                elapsed = time.perf_counter() - metrics.endpoint_done
+                db = metrics.phases["db"] - metrics.db_at_endpoint_done
+                metrics.add("serialize", max(elapsed - db, 0.0))
+            if metrics is not None:
+                # get_db's COMMIT adds no statement; background tasks that
+                # run after the response are not the route's
+                check_budget(metrics)
+                metrics.budget = None
+            return response
+
+        return timed_handler
+
+
+# -----------------------------
+# SQL statements
+# -----------------------------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.queries += 1
+        metrics.statements[statement] += 1
+        metrics.add("db", elapsed)
+
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        if metrics is not None:
+            metrics.slow_queries += 1
+        # The statement only: parameters may hold personal data
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()))
+
+
+@event.listens_for(Engine, "handle_error")
+def _failed_execute(context):
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
@@ -0,0 +1,145 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
+
+
+def _cursor_value(col, value):
+    # A cursor comes back from the client: each value must be a scalar of
+    # its key column's type before it goes into the seek condition
+    if value is None:
+        return None
+    if isinstance(col.type, DateTime):
+        # JSON has no datetimes: they travel as ISO strings
+        if not isinstance(value, str):
+            raise ValueError(col.key)
+        return datetime.fromisoformat(value)
+
+    try:
+        expected = col.type.python_type
+    except NotImplementedError:
+        # Untyped expressions (e.g. bm25() scores): any JSON scalar
+        expected = (str, int, float)
+    if expected is float:
+        expected = (int, float)
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise ValueError(col.key)
+    return value
+
+
+def _cursor_values(keys: list, cursor: str) -> list:
+    values = decode_cursor(cursor)
+    try:
+        return [_cursor_value(col, values[col.key]) for col in keys]
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _row_cursor(row, keys: list) -> str:
+    values = {}
+    for col in keys:
+        value = getattr(row, col.key)
+        values[col.key] = value.isoformat() if isinstance(value, datetime) else value
+    return encode_cursor(values)
+
+
+def _seek(keys: list, last: list, descending: bool = False):
+    # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y); < when descending
+    condition = None
+    for i in reversed(range(len(keys))):
+        step = keys[i] < last[i] if descending else keys[i] > last[i]
+        if condition is not None:
+            step = step | ((keys[i] == last[i]) & condition)
+        condition = step
+    return condition
+
+
+def paginate(query, keys: list, limit: int, after: str | None = None):
+    """
+    Keyset pagination over ``keys`` (ORM columns, the last one unique).
+
+    Returns ``(rows, next_cursor)``; only ``limit + 1`` rows are ever read,
+    so the cost of a page does not depend on how deep into the result it is.
+    """
+    if after is not None:
+        query = query.filter(_seek(keys, _cursor_values(keys, after)))
+
+    rows = query.order_by(*keys).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _row_cursor(rows[-1], keys)
+
+    return rows, next_cursor
+
+
+def paginate_window(
+    query,
+    keys: list,
+    limit: int,
+    after: str | None = None,
+    before: str | None = None,
+    descending: bool = False,
+):
+    """
+    paginate() that can also step back: ``after`` takes a page's
+    next_cursor, ``before`` its prev_cursor. With ``descending`` the rows
+    are listed in reverse key order (newest first for time keys).
+
+    Returns ``(rows, next_cursor, prev_cursor)``, rows always in listing
+    order. Going back reads the index in the opposite direction, so it
+    costs the same limit + 1 rows as going forward.
+    """
+    if after is not None and before is not None:
+        raise HTTPException(status_code=400, detail="Use either after or before")
+
+    backwards = before is not None
+    cursor = before if backwards else after
+    # Direction of this read: listing order, or its reverse to step back
+    reverse = descending != backwards
+
+    if cursor is not None:
+        query = query.filter(_seek(keys, _cursor_values(keys, cursor), reverse))
+
+    order = [col.desc() if reverse else col.asc() for col in keys]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return rows, None, None
+
+    if backwards:
+        rows.reverse()
+        # The page the client came from follows these rows
+        next_cursor = _row_cursor(rows[-1], keys)
+        prev_cursor = _row_cursor(rows[0], keys) if more else None
+        return rows, next_cursor, prev_cursor
+
+    next_cursor = _row_cursor(rows[-1], keys) if more else None
+    prev_cursor = _row_cursor(rows[0], keys) if cursor is not None else None
+    return rows, next_cursor, prev_cursor
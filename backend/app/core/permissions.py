@@ -0,0 +1,61 @@
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.core.cache import TTLCache, invalidate_on_commit
+from app.core.config import MEMBERSHIP_CACHE_SIZE, MEMBERSHIP_CACHE_TTL
+from app.core.metrics import track
+from app.core.versions import PROJECT, bump_version
+
+# user_id -> {project_id: role}, loaded in one query per user
+membership_cache = TTLCache(
+    "memberships", maxsize=MEMBERSHIP_CACHE_SIZE, ttl=MEMBERSHIP_CACHE_TTL
+)
+
+
+@event.listens_for(ProjectMember, "after_insert")
+@event.listens_for(ProjectMember, "after_update")
+@event.listens_for(ProjectMember, "after_delete")
+def _invalidate_memberships(mapper, connection, target):
+    invalidate_on_commit(target, membership_cache, target.user_id)
+    # The project's member list changed
+    session = object_session(target)
+    if session is not None:
+        bump_version(session, PROJECT, target.project_id)
+
+
+def get_user_memberships(db: Session, user_id: int) -> dict[int, str]:
+    with track("rbac"):
+        memberships = membership_cache.get(user_id)
+        if memberships is None:
+            memberships = dict(
+                db.query(ProjectMember.project_id, ProjectMember.role)
+                .filter(ProjectMember.user_id == user_id)
+                .all()
+            )
+            membership_cache.set(user_id, memberships)
+        return memberships
+
+
+def get_project_role(db: Session, project_id: int, user_id: int) -> str | None:
+    return get_user_memberships(db, user_id).get(project_id)
+
+
+def require_project(db: Session, project_id: int):
+    # Only needed to tell "no such project" (404) from "not a member" (403)
+    with track("rbac"):
+        exists = db.query(Project.id).filter(Project.id == project_id).first()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+
+def require_project_owner(db: Session, project_id: int, user_id: int, detail: str):
+    # Owner-only actions: being an admin member is not enough
+    with track("rbac"):
+        row = db.query(Project.owner_id).filter(Project.id == project_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if row.owner_id != user_id:
+        raise HTTPException(status_code=403, detail=detail)
@@ -0,0 +1,233 @@
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.events import publish_on_commit
+from app.core.versions import PROJECT, bump_version
+from app.database.db import SessionLocal
+from app.models.ticket import Ticket
+
+# Kanban order is kept as fractional rank keys that sort lexicographically
+# in board order. A key is a variable-length integer, then an optional
+# base-62 fraction: the head letter gives the integer's length ("a0".."az",
+# "b00".."bzz", ...; "A".."Z" for negative ones), so appending at the
+# bottom of a column only increments the integer and keys grow with the
+# logarithm of the column size. A key can always be generated between any
+# two others, so a move rewrites only the moved ticket. Fractions never end
+# in the zero digit, which keeps the string order identical to the numeric
+# order.
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+INTEGER_ZERO = "a0"
+SMALLEST_INTEGER = "A" + DIGITS[0] * 26
+
+# Keys longer than this get their column rebalanced in the background
+REBALANCE_LENGTH = 12
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"invalid rank head {head!r}")
+
+
+def _split(key: str) -> tuple[str, str]:
+    # (integer part, fraction)
+    if not key:
+        raise ValueError("empty rank key")
+    length = _integer_length(key[0])
+    if len(key) < length or key == SMALLEST_INTEGER:
+        raise ValueError(f"invalid rank key {key!r}")
+    fraction = key[length:]
+    if fraction.endswith(DIGITS[0]):
+        raise ValueError(f"invalid rank key {key!r}")
+    return key[:length], fraction
+
+
+def _increment_integer(integer: str) -> str | None:
+    # The next integer key, None past the largest one
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        digit = DIGITS.index(digits[i]) + 1
+        if digit < BASE:
+            digits[i] = DIGITS[digit]
+            return head + "".join(digits)
+        digits[i] = DIGITS[0]
+
+    # Every digit carried over: the integer gets one digit longer
+    if head == "Z":
+        return INTEGER_ZERO
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement_integer(integer: str) -> str | None:
+    # The previous integer key, None below the smallest one
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        digit = DIGITS.index(digits[i]) - 1
+        if digit >= 0:
+            digits[i] = DIGITS[digit]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def key_between(before: str | None, after: str | None) -> str:
+    """
+    Return a key that sorts strictly between ``before`` and ``after``;
+    None stands for the start / end of the column. Raises ValueError for
+    keys that are invalid or out of order.
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"{before!r} is not lower than {after!r}")
+
+    if before is None and after is None:
+        return INTEGER_ZERO
+
+    if before is None:
+        integer, fraction = _split(after)
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint("", fraction)
+        if integer < after:
+            return integer
+        previous = _decrement_integer(integer)
+        if previous is None:
+            raise ValueError("no key below the smallest integer")
+        return previous
+
+    integer, fraction = _split(before)
+    if after is None:
+        following = _increment_integer(integer)
+        return integer + _midpoint(fraction, None) if following is None else following
+
+    after_integer, after_fraction = _split(after)
+    if integer == after_integer:
+        return integer + _midpoint(fraction, after_fraction)
+    following = _increment_integer(integer)
+    if following is not None and following < after:
+        return following
+    return integer + _midpoint(fraction, None)
+
+
+def _midpoint(a: str, b: str | None) -> str:
+    # A fraction strictly between fractions ``a`` and ``b`` (None: 1).
+    # Loops digit by digit instead of recursing: keys can get long.
+    key = []
+    while True:
+        if b is not None:
+            # Keep the common prefix, then split the first differing digit
+            n = 0
+            while (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+                n += 1
+            key.append(b[:n])
+            a, b = a[n:], b[n:]
+
+        digit_a = DIGITS.index(a[0]) if a else 0
+        digit_b = DIGITS.index(b[0]) if b is not None else BASE
+
+        if digit_b - digit_a > 1:
+            key.append(DIGITS[(digit_a + digit_b + 1) // 2])
+            return "".join(key)
+
+        # Adjacent digits: extend with a further digit
+        if b is not None and len(b) > 1:
+            key.append(b[:1])
+            return "".join(key)
+        key.append(DIGITS[digit_a])
+        a, b = a[1:], None
+
+
+def keys_after(before: str | None, count: int) -> list[str]:
+    # ``count`` ascending keys after ``before`` (None: an empty column),
+    # consecutive integers, so every one leaves room for later moves
+    keys = []
+    for _ in range(count):
+        before = key_between(before, None)
+        keys.append(before)
+    return keys
+
+
+def spread_keys(count: int) -> list[str]:
+    # ``count`` short keys in ascending order, for a whole column
+    return keys_after(None, count)
+
+
+def last_rank(db: Session, project_id: int, status: str) -> str | None:
+    row = (
+        db.query(Ticket.rank)
+        .filter(
+            Ticket.project_id == project_id,
+            Ticket.status == status,
+            Ticket.is_deleted == False,
+        )
+        .order_by(Ticket.rank.desc(), Ticket.id.desc())
+        .first()
+    )
+    return row.rank if row else None
+
+
+def append_rank(db: Session, project_id: int, status: str) -> str:
+    # Rank for a ticket entering at the bottom of a column
+    return key_between(last_rank(db, project_id, status), None)
+
+
+def rebalance_column(db: Session, project_id: int, status: str) -> int:
+    column = [
+        Ticket.project_id == project_id,
+        Ticket.status == status,
+        Ticket.is_deleted == False,
+    ]
+    ids = [
+        row.id
+        for row in db.query(Ticket.id).filter(*column).order_by(Ticket.rank, Ticket.id)
+    ]
+    if ids:
+        # Clear the column first: ranks are unique per column, and the new
+        # keys may be ones other tickets of it still hold
+        db.query(Ticket).filter(*column).update(
+            {Ticket.rank: None}, synchronize_session=False
+        )
+        db.execute(
+            update(Ticket.__table__)
+            .where(Ticket.__table__.c.id == bindparam("_id"))
+            .values(rank=bindparam("_rank")),
+            [
+                {"_id": ticket_id, "_rank": key}
+                for ticket_id, key in zip(ids, spread_keys(len(ids)))
+            ],
+        )
+        # Every rank in the column changed: clients re-fetch it
+        bump_version(db, PROJECT, project_id)
+        publish_on_commit(
+            db, project_id, "column.rebalanced", {"status": status}
+        )
+    return len(ids)
+
+
+def rebalance_column_task(project_id: int, status: str):
+    # Background task: runs after the response, on its own session
+    db = SessionLocal()
+    try:
+        rebalance_column(db, project_id, status)
+        db.commit()
+    finally:
+        db.close()
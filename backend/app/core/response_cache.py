@@ -0,0 +1,314 @@
+import functools
+import json
+import operator
+import threading
+import types
+import typing
+from collections import OrderedDict
+from typing import Callable
+
+import pydantic_core
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.engine import Row
+
+from app.core.config import (
+    FAST_JSON,
+    RESPONSE_CACHE,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_REDIS_URL,
+    RESPONSE_CACHE_TTL,
+)
+from app.core.metrics import track
+from app.core.versions import bump_listeners
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class CacheBackend:
+    """
+    Stores serialized response bodies. Every entry carries a tag (the
+    resource it was built from) so all of a project's entries can be
+    evicted at once.
+    """
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, body: bytes, tag: str):
+        raise NotImplementedError
+
+    def evict(self, tag: str):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    # Per-process LRU, bounded by the total size of the stored bodies
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, body: bytes, tag: str):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (body, tag)
+            self._tags.setdefault(tag, set()).add(key)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def evict(self, tag: str):
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        body, tag = entry
+        self.size -= len(body)
+        keys = self._tags[tag]
+        keys.discard(key)
+        if not keys:
+            del self._tags[tag]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class RedisBackend(CacheBackend):
+    # Shared by all worker processes; entries also expire after ``ttl``
+    PREFIX = "fixhub:response:"
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("FIXHUB_RESPONSE_CACHE=redis requires the redis package")
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.PREFIX + key)
+
+    def set(self, key: str, body: bytes, tag: str):
+        tag_key = f"{self.PREFIX}tag:{tag}"
+        with self.client.pipeline() as pipe:
+            pipe.set(self.PREFIX + key, body, ex=self.ttl)
+            pipe.sadd(tag_key, self.PREFIX + key)
+            pipe.expire(tag_key, self.ttl)
+            pipe.execute()
+
+    def evict(self, tag: str):
+        tag_key = f"{self.PREFIX}tag:{tag}"
+        keys = self.client.smembers(tag_key)
+        self.client.delete(tag_key, *keys)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "ttl": self.ttl}
+
+
+def _create_backend() -> CacheBackend | None:
+    if RESPONSE_CACHE == "redis":
+        return RedisBackend(RESPONSE_CACHE_REDIS_URL, RESPONSE_CACHE_TTL)
+    if RESPONSE_CACHE == "memory":
+        return MemoryBackend(RESPONSE_CACHE_MAX_BYTES)
+    return None
+
+
+backend = _create_backend()
+
+
+def _evict_bumped(bumps: set):
+    # Entries of a written resource can no longer be served (their key
+    # holds the old version); drop them now instead of waiting for the LRU
+    for scope, key in bumps:
+        backend.evict(f"{scope}:{key}")
+
+
+if backend is not None:
+    bump_listeners.append(_evict_bumped)
+
+
+# -----------------------------
+# Serving
+# -----------------------------
+@functools.lru_cache
+def _adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+# Trusted rows skip validation: they come straight from our own columns,
+# already typed by SQLAlchemy, so only the fields of ``model`` are picked
+# out and encoded. orjson is optional; pydantic-core encodes otherwise.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_dumps = orjson.dumps if orjson is not None else pydantic_core.to_json
+_REQUIRED = object()
+
+
+@functools.lru_cache
+def _converter(annotation) -> Callable | None:
+    # None for leaf values, which the encoder takes as they are
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        item = _converter(typing.get_args(annotation)[0])
+        if item is None:
+            return list
+        return getattr(item, "many", None) or (lambda values: [item(value) for value in values])
+
+    if origin in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        inner = _converter(args[0]) if len(args) == 1 else None
+        if inner is None:
+            return None
+        return lambda value: None if value is None else inner(value)
+
+    if not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+        return None
+
+    fields = annotation.model_fields
+    names = tuple(fields)
+    defaults = [
+        (name, _REQUIRED if field.is_required() else field.get_default(call_default_factory=True))
+        for name, field in fields.items()
+    ]
+    nested = [
+        (name, inner) for name, field in fields.items()
+        if (inner := _converter(field.annotation)) is not None
+    ]
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        getter = lambda obj, get=getter: (get(obj),)
+
+    def convert(obj) -> dict:
+        try:
+            # Rows and ORM objects carrying every field: one C-level lookup
+            out = dict(zip(names, getter(obj)))
+        except AttributeError:
+            if isinstance(obj, dict):
+                out = {name: obj.get(name, default) for name, default in defaults}
+            else:
+                out = {name: getattr(obj, name, default) for name, default in defaults}
+            for name, value in out.items():
+                if value is _REQUIRED:
+                    raise ValueError(f"{annotation.__name__}.{name} is missing")
+
+        for name, inner in nested:
+            value = out[name]
+            if value is not None:
+                out[name] = inner(value)
+        return out
+
+    def many(values) -> list:
+        # The rows of one result share their columns: resolve the fields to
+        # positions once, which is far cheaper than attribute access per row
+        if not (isinstance(values, list) and values and isinstance(values[0], Row)):
+            return [convert(value) for value in values]
+        positions = {name: i for i, name in enumerate(values[0]._fields)}
+        if nested or not all(name in positions for name in names):
+            return [convert(value) for value in values]
+        pick = operator.itemgetter(*(positions[name] for name in names))
+        if len(names) == 1:
+            return [{names[0]: pick(row)} for row in values]
+        return [dict(zip(names, pick(row))) for row in values]
+
+    convert.many = many
+    return convert
+
+
+def dump_trusted(model, content) -> bytes:
+    convert = _converter(model)
+    return _dumps(convert(content) if convert is not None else content)
+
+
+def serialize(model, content, trusted: bool = False) -> bytes:
+    # The bytes FastAPI would send for ``content`` under ``response_model``
+    with track("serialize"):
+        if trusted and FAST_JSON and model is not None:
+            return dump_trusted(model, content)
+        if model is None:
+            return json.dumps(
+                jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+            ).encode()
+        adapter = _adapter(model)
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def cached_response(
+    request: Request,
+    response: Response,
+    scope: str,
+    key: int,
+    version: int,
+    model,
+    build: Callable,
+    trusted: bool = False,
+) -> Response:
+    """
+    Serve the JSON body of a read from the cache, building and storing it
+    on a miss. Entries are keyed by the request URL and the resource
+    version from check_not_modified(), so no worker can serve a body older
+    than the version it just read. Permission checks belong before this call.
+    ``trusted`` builds return plain rows and take the dump_trusted() path.
+    """
+    headers = dict(response.headers)
+    if backend is None:
+        body = serialize(model, build(), trusted)
+    else:
+        cache_key = f"{scope}:{key}:{version}:{request.url.path}?{request.url.query}"
+        body = backend.get(cache_key)
+        if body is None:
+            body = serialize(model, build(), trusted)
+            backend.set(cache_key, body, f"{scope}:{key}")
+
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def json_response(model, content, trusted: bool = False) -> Response:
+    # Uncached reads that still want the serialize() fast path
+    return Response(serialize(model, content, trusted), media_type="application/json")
+
+
+def stats() -> dict:
+    return backend.stats() if backend is not None else {"backend": "off"}
@@ -0,0 +1,108 @@
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# Full-text index over ticket title / description and the text of the
+# ticket's live comments. rowid is the ticket id.
+FTS_TABLE = "ticket_search"
+
+FTS_ENABLED = False
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_FTS_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ticket_insert
+    AFTER INSERT ON tickets BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, comments)
+        VALUES (new.id, new.title, coalesce(new.description, ''), '');
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ticket_update
+    AFTER UPDATE OF title, description ON tickets BEGIN
+        UPDATE {FTS_TABLE}
+        SET title = new.title, description = coalesce(new.description, '')
+        WHERE rowid = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ticket_delete
+    AFTER DELETE ON tickets BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_comment_insert
+    AFTER INSERT ON comments BEGIN
+        UPDATE {FTS_TABLE}
+        SET comments = (
+            SELECT coalesce(group_concat(content, ' '), '') FROM comments
+            WHERE ticket_id = new.ticket_id AND is_deleted = 0
+        )
+        WHERE rowid = new.ticket_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_comment_update
+    AFTER UPDATE OF content, is_deleted ON comments BEGIN
+        UPDATE {FTS_TABLE}
+        SET comments = (
+            SELECT coalesce(group_concat(content, ' '), '') FROM comments
+            WHERE ticket_id = new.ticket_id AND is_deleted = 0
+        )
+        WHERE rowid = new.ticket_id;
+    END
+    """,
+]
+
+
+def init_search(engine) -> bool:
+    """
+    Create the FTS5 index and its sync triggers, backfilling existing
+    tickets the first time. Leaves FTS_ENABLED False when the SQLite build
+    has no FTS5, in which case search falls back to substring matching.
+    """
+    global FTS_ENABLED
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+
+        if not exists:
+            try:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    "title, description, comments, tokenize = 'unicode61')"
+                ))
+            except OperationalError:
+                FTS_ENABLED = False
+                return False
+
+            conn.execute(text(f"""
+                INSERT INTO {FTS_TABLE}(rowid, title, description, comments)
+                SELECT t.id, t.title, coalesce(t.description, ''),
+                       coalesce((
+                           SELECT group_concat(c.content, ' ') FROM comments c
+                           WHERE c.ticket_id = t.id AND c.is_deleted = 0
+                       ), '')
+                FROM tickets t
+            """))
+
+        for ddl in _FTS_DDL:
+            conn.execute(text(ddl))
+
+    FTS_ENABLED = True
+    return True
+
+
+def build_match_query(q: str) -> str | None:
+    # Every word becomes a quoted prefix term, so user input can never be
+    # parsed as FTS5 syntax and "log cra" matches "login crash".
+    tokens = _TOKEN.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
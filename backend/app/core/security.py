@@ -1,11 +1,158 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+# -----------------------------
+# Worker functions (run in the pool processes)
+# -----------------------------
+def _hash(password: str):
+    started = time.monotonic()
+    return pwd_context.hash(password), started, time.monotonic() - started
+
+
+def _verify_and_update(password: str, hashed: str):
+    started = time.monotonic()
+    ok = pwd_context.verify(password, hashed)
+    new_hash = None
+    if ok and pwd_context.needs_update(hashed):
+        new_hash = pwd_context.hash(password)
+    return (ok, new_hash), started, time.monotonic() - started
+
+
+# -----------------------------
+# Bounded executor
+# -----------------------------
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated process pool so it neither holds the GIL
+    nor competes with request threads; callers await the result on the
+    event loop instead of parking a threadpool worker on it. At most
+    ``max_pending`` calls may be queued or running; beyond that callers
+    get a 503 right away.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self.workers <= 0:
+            # Inline, but still off the event loop
+            result, _started, duration = await run_in_threadpool(fn, *args)
+            self._record(0.0, duration)
+            return result
+
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Authentication is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            executor = self._get_executor()
+
+        try:
+            submitted = time.monotonic()
+            result, started, duration = await asyncio.wrap_future(
+                executor.submit(fn, *args)
+            )
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+        self._record(max(0.0, started - submitted), duration)
+        return result
+
+    def _record(self, queue_wait: float, duration: float):
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.hash_time_total += duration
+            self.hash_time_max = max(self.hash_time_max, duration)
+
+    def record_rehash(self):
+        with self._lock:
+            self.rehashed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "bcrypt_rounds": BCRYPT_ROUNDS,
+                "queue_wait_avg_ms": self.queue_wait_total / done * 1000,
+                "queue_wait_max_ms": self.queue_wait_max * 1000,
+                "hash_time_avg_ms": self.hash_time_total / done * 1000,
+                "hash_time_max_ms": self.hash_time_max * 1000,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def hash_password(password: str) -> str:
+    return await password_hasher.run(_hash, password)
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def verify_password(password: str, hashed: str) -> bool:
+    return (await verify_and_update_password(password, hashed))[0]
 
 
-def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+async def verify_and_update_password(
+    password: str, hashed: str
+) -> tuple[bool, str | None]:
+    # The second value is a fresh hash when the stored one was made with
+    # outdated settings (e.g. fewer bcrypt rounds) and should be replaced
+    ok, new_hash = await password_hasher.run(_verify_and_update, password, hashed)
+    if new_hash is not None:
+        password_hasher.record_rehash()
+    return ok, new_hash
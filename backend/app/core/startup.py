@@ -0,0 +1,65 @@
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+
+from app.core.config import STARTUP_BUDGET_MS
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Where application startup went: each router module's import (including
+    whatever it imported first, so shared modules land on the first router
+    to need them) and each initialization phase. The two never overlap, so
+    their sum is the startup time. Logged once the lifespan has run and
+    served on /monitoring/startup.
+    """
+
+    def __init__(self):
+        self.imports: dict[str, float] = {}
+        self.phases: dict[str, float] = {}
+        self.completed = False
+
+    def import_module(self, name: str):
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports[name] = time.perf_counter() - started
+        return module
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def total(self) -> float:
+        return sum(self.imports.values()) + sum(self.phases.values())
+
+    def finish(self):
+        self.completed = True
+        total_ms = self.total() * 1000
+        slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:3]
+        logger.info(
+            "Started in %.0f ms (imports %.0f ms, %s; slowest: %s)",
+            total_ms,
+            sum(self.imports.values()) * 1000,
+            ", ".join(f"{name} {value * 1000:.0f} ms" for name, value in self.phases.items()),
+            ", ".join(f"{name} {value * 1000:.0f} ms" for name, value in slowest),
+        )
+        if STARTUP_BUDGET_MS and total_ms > STARTUP_BUDGET_MS:
+            logger.warning(
+                "Startup took %.0f ms, over the %.0f ms budget", total_ms, STARTUP_BUDGET_MS
+            )
+
+    def as_dict(self) -> dict:
+        return {
+            "completed": self.completed,
+            "total_ms": round(self.total() * 1000, 2),
+            "budget_ms": STARTUP_BUDGET_MS or None,
+            "imports_ms": {name: round(value * 1000, 2) for name, value in self.imports.items()},
+            "phases_ms": {name: round(value * 1000, 2) for name, value in self.phases.items()},
+        }
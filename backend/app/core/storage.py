@@ -0,0 +1,240 @@
+import hashlib
+import os
+import tempfile
+from typing import AsyncIterator, Iterator
+
+from anyio import to_thread
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    ATTACHMENT_STORAGE,
+    ATTACHMENT_DIR,
+    ATTACHMENT_S3_BUCKET,
+    ATTACHMENT_S3_PREFIX,
+    ATTACHMENT_S3_ENDPOINT,
+)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStorage:
+    """
+    Content-addressed blob store: bytes are stored once under the sha256
+    of their content. Implementations only move finished, verified files
+    into place; hashing and size limits are handled by save_stream().
+    """
+
+    def exists(self, digest: str) -> bool:
+        raise NotImplementedError
+
+    def store(self, digest: str, path: str):
+        # Store the bytes of the local file at ``path``, which stays there
+        raise NotImplementedError
+
+    def put_file(self, digest: str, path: str):
+        # Take ownership of the local file at ``path``
+        try:
+            self.store(digest, path)
+        finally:
+            os.remove(path)
+
+    def iter_chunks(self, digest: str) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def delete(self, digest: str):
+        raise NotImplementedError
+
+    def staging_dir(self) -> str | None:
+        # Where upload temp files go; None means the system temp dir
+        return None
+
+
+class LocalStorage(BlobStorage):
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest[2:4], digest)
+
+    def staging_dir(self) -> str:
+        # Same filesystem as the blobs, so put_file is an atomic rename
+        path = os.path.join(self.root, "tmp")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def store(self, digest: str, path: str):
+        # A hard link, swapped into place: no copy, and no reader ever sees
+        # a partial file
+        target = self.path(digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        link = f"{path}.link"
+        os.link(path, link)
+        os.replace(link, target)
+
+    def put_file(self, digest: str, path: str):
+        target = self.path(digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+
+    def iter_chunks(self, digest: str) -> Iterator[bytes]:
+        with open(self.path(digest), "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    def delete(self, digest: str):
+        try:
+            os.remove(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+
+class S3Storage(BlobStorage):
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: str | None = None):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError(
+                "FIXHUB_ATTACHMENT_STORAGE=s3 requires the boto3 package"
+            )
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def key(self, digest: str) -> str:
+        return f"{self.prefix}{digest}"
+
+    def exists(self, digest: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key(digest))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
+
+    def store(self, digest: str, path: str):
+        self.client.upload_file(path, self.bucket, self.key(digest))
+
+    def iter_chunks(self, digest: str) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=self.key(digest))["Body"]
+        yield from body.iter_chunks(CHUNK_SIZE)
+
+    def delete(self, digest: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(digest))
+
+
+_storage: BlobStorage | None = None
+
+
+def get_storage() -> BlobStorage:
+    global _storage
+    if _storage is None:
+        if ATTACHMENT_STORAGE == "s3":
+            _storage = S3Storage(
+                ATTACHMENT_S3_BUCKET, ATTACHMENT_S3_PREFIX, ATTACHMENT_S3_ENDPOINT
+            )
+        else:
+            _storage = LocalStorage(ATTACHMENT_DIR)
+    return _storage
+
+
+def too_large(max_bytes: int):
+    return HTTPException(
+        status_code=413,
+        detail=f"Attachment exceeds the {max_bytes} byte limit",
+    )
+
+
+async def save_stream(
+    storage: BlobStorage, chunks: AsyncIterator[bytes], max_bytes: int
+) -> tuple[str, int, str]:
+    """
+    Write an upload to a staging file chunk by chunk, hashing as it goes,
+    and abort with 413 as soon as it passes ``max_bytes``. Returns
+    (digest, size, staging path). The caller stores the bytes with
+    store_staged(), takes the blob's reference and then hands the file to
+    place_staged().
+    """
+    digest = hashlib.sha256()
+    size = 0
+    tmp = tempfile.NamedTemporaryFile(dir=storage.staging_dir(), delete=False)
+
+    try:
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large(max_bytes)
+                digest.update(chunk)
+                await to_thread.run_sync(tmp.write, chunk)
+        finally:
+            tmp.close()
+    except BaseException:
+        discard_staged(tmp.name)
+        raise
+
+    return digest.hexdigest(), size, tmp.name
+
+
+def store_staged(storage: BlobStorage, digest: str, path: str):
+    """
+    Store a staged upload's bytes, keeping the staged file. Call it before
+    the write transaction: for S3 this is the network upload, and every
+    write in the process would wait on it behind the write lock. Blobs are
+    content-addressed, so bytes that no row ends up referencing are
+    harmless, and bytes that are already stored are not sent again.
+    """
+    try:
+        if not storage.exists(digest):
+            storage.store(digest, path)
+    except BaseException:
+        discard_staged(path)
+        raise
+
+
+def place_staged(
+    db: Session, storage: BlobStorage, digest: str, path: str, new_blob: bool
+):
+    """
+    Finish a staged upload once its reference to the blob row is taken.
+    An existing row means its bytes are stored, so the staged file is
+    dropped. A new row's bytes were stored by store_staged(), but a delete
+    of the row before it may have removed them since; they are checked
+    after the commit, when no delete can decide they are unreferenced, and
+    stored again from the staged file if missing.
+    """
+    if new_blob:
+        db.info.setdefault("staged_blobs", []).append((storage, digest, path))
+    else:
+        discard_staged(path)
+
+
+@event.listens_for(Session, "after_commit")
+def _place_committed_blobs(session):
+    for storage, digest, path in session.info.pop("staged_blobs", ()):
+        try:
+            if not storage.exists(digest):
+                storage.put_file(digest, path)
+        finally:
+            discard_staged(path)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_staged_blobs(session):
+    for _, _, path in session.info.pop("staged_blobs", ()):
+        discard_staged(path)
+
+
+def discard_staged(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
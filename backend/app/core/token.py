@@ -1,13 +1,188 @@
+import hashlib
+import logging
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
+from typing import Callable
 from jose import jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import TOKEN_CACHE_SIZE, TOKEN_DENYLIST_SYNC
+from app.core.metrics import TOKEN_LOOKUPS, TOKENS_REJECTED
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
 
 SECRET_KEY = "fixhub-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# sha256(token) -> verified claims, each kept until its token's exp, so a
+# token is only decoded and its signature checked once per process
+token_cache = TTLCache(
+    "tokens", maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
 
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti: two logins in the same second must not share a token, or logging
+    # out of one session would revoke the other
+    to_encode.update({"exp": expire, "jti": secrets.token_urlsafe(12)})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def verify_access_token(token: str) -> tuple[str, dict]:
+    """
+    The token's digest and its claims. Raises JWTError when the token is
+    invalid or expired. The claims may be shared: never modify them.
+    """
+    digest = token_digest(token)
+    claims = token_cache.get(digest)
+    if claims is not None:
+        TOKEN_LOOKUPS.inc(("hit",))
+        return digest, claims
+
+    TOKEN_LOOKUPS.inc(("miss",))
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = claims.get("exp")
+    ttl = exp - time.time() if exp is not None else None
+    if ttl is None or ttl > 0:
+        token_cache.set(digest, claims, ttl)
+    return digest, claims
+
+
+# -----------------------------
+# Revocation
+# -----------------------------
+def password_changed(claims: dict, password_version: int) -> bool:
+    # Tokens carry the user's password_version as "pwv"; a password change
+    # bumps it, which revokes every token issued before. Rehashing the same
+    # password does not. Tokens without the claim stay valid until they
+    # expire.
+    version = claims.get("pwv")
+    if version is None or version == password_version:
+        return False
+    TOKENS_REJECTED.inc(("password",))
+    return True
+
+
+class TokenDenylist:
+    """
+    Digests of logged-out tokens that have not expired yet. A logout is
+    stored in revoked_tokens and applies in its own process as soon as it
+    is committed; a
+    background thread reads the rows added by others every
+    ``sync_interval`` seconds, so checking a token never touches the
+    database.
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._revoked: dict[str, int] = {}
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.syncs = 0
+        self.sync_errors = 0
+        self.rejected = 0
+
+    def is_revoked(self, digest: str) -> bool:
+        if digest in self._revoked:
+            self.rejected += 1
+            TOKENS_REJECTED.inc(("logout",))
+            return True
+        return False
+
+    def sync(self, session_factory: Callable[[], Session]):
+        now = int(time.time())
+        with session_factory() as db:
+            rows = db.query(
+                RevokedToken.id, RevokedToken.digest, RevokedToken.expires_at
+            ).filter(
+                RevokedToken.id > self._last_id,
+                RevokedToken.expires_at > now,
+            ).all()
+
+        with self._lock:
+            revoked = {
+                digest: expires_at
+                for digest, expires_at in self._revoked.items() if expires_at > now
+            }
+            for row_id, digest, expires_at in rows:
+                revoked[digest] = expires_at
+                self._last_id = max(self._last_id, row_id)
+            self._revoked = revoked
+            self.syncs += 1
+
+    def start(self, session_factory: Callable[[], Session]):
+        # Load what is revoked before serving, then keep up in the background
+        self.sync(session_factory)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(session_factory,),
+            name="token-denylist", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, session_factory: Callable[[], Session]):
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self.sync(session_factory)
+            except Exception:
+                self.sync_errors += 1
+                logger.exception("Token denylist sync failed")
+
+    def revoke(self, db: Session, digest: str, expires_at: int):
+        # Expired rows can no longer matter to anyone: clear them out here
+        db.query(RevokedToken).filter(
+            RevokedToken.expires_at <= int(time.time())
+        ).delete(synchronize_session=False)
+        db.add(RevokedToken(digest=digest, expires_at=expires_at))
+        # Applied here once the row is committed, see _apply_revocations
+        db.info.setdefault("token_revocations", []).append(
+            (self, digest, expires_at)
+        )
+
+    def add(self, digest: str, expires_at: int):
+        with self._lock:
+            self._revoked[digest] = expires_at
+        token_cache.invalidate(digest)
+
+    def stats(self) -> dict:
+        return {
+            "revoked": len(self._revoked),
+            "sync_interval": self.sync_interval,
+            "syncs": self.syncs,
+            "sync_errors": self.sync_errors,
+            "rejected": self.rejected,
+        }
+
+
+denylist = TokenDenylist(TOKEN_DENYLIST_SYNC)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_revocations(session):
+    for owner, digest, expires_at in session.info.pop("token_revocations", ()):
+        owner.add(digest, expires_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_revocations(session):
+    session.info.pop("token_revocations", None)
@@ -0,0 +1,96 @@
+import hashlib
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models.resource_version import ResourceVersion
+
+PROJECT = "project"
+TICKET = "ticket"
+
+# Clients must revalidate, and shared caches must not store per-user data
+CACHE_CONTROL = "private, no-cache"
+
+
+# Called with the set of (scope, key) bumped by each committed transaction
+bump_listeners: list = []
+
+
+def bump_version(db: Session, scope: str, key: int):
+    # Recorded now, written once per transaction just before it commits
+    db.info.setdefault("version_bumps", set()).add((scope, key))
+
+
+@event.listens_for(Session, "before_commit")
+def _write_bumps(session):
+    # Flush first: mapper events of pending objects may add bumps
+    session.flush()
+    bumps = session.info.pop("version_bumps", None)
+    if not bumps:
+        return
+
+    session.execute(
+        insert(ResourceVersion)
+        .values([
+            {"scope": scope, "key": key, "version": 1}
+            for scope, key in sorted(bumps)
+        ])
+        .on_conflict_do_update(
+            index_elements=[ResourceVersion.scope, ResourceVersion.key],
+            set_={"version": ResourceVersion.version + 1},
+        )
+    )
+    session.info["committed_bumps"] = bumps
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_bumps(session):
+    bumps = session.info.pop("committed_bumps", None)
+    if bumps:
+        for listener in bump_listeners:
+            listener(bumps)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_bumps(session):
+    session.info.pop("version_bumps", None)
+    session.info.pop("committed_bumps", None)
+
+
+def get_version(db: Session, scope: str, key: int) -> int:
+    version = (
+        db.query(ResourceVersion.version)
+        .filter(ResourceVersion.scope == scope, ResourceVersion.key == key)
+        .scalar()
+    )
+    return version or 0
+
+
+def check_not_modified(
+    request: Request, response: Response, db: Session, scope: str, key: int
+) -> int:
+    """
+    Conditional GET: tag the response with the resource's current version
+    and answer 304 if the client already holds it. Call this before the
+    query it guards, so a write racing with it can only make the tag older
+    than the body, never newer. Returns the version.
+    """
+    version = get_version(db, scope, key)
+    # The path and query string pick the representation of that version
+    url = hashlib.sha1(
+        f"{request.url.path}?{request.url.query}".encode()
+    ).hexdigest()[:16]
+    etag = f'W/"{scope}-{key}-{version}-{url}"'
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: W/ prefixes are ignored on both sides
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag.removeprefix("W/") in tags or "*" in tags:
+            raise HTTPException(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return version
@@ -4,6 +4,9 @@ ALLOWED_TRANSITIONS = {
     "done": ["in_progress"]
 }
 
+# Board columns, in display order
+WORKFLOW_STATES = list(ALLOWED_TRANSITIONS)
+
 
 def is_valid_transition(current_status: str, new_status: str) -> bool:
     return new_status in ALLOWED_TRANSITIONS.get(current_status, [])
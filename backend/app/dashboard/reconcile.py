@@ -0,0 +1,39 @@
+"""
+Rebuild the dashboard ticket counters from the tickets table and report
+any drift.
+
+    cd backend
+    python -m app.dashboard.reconcile [--project-id N] [--dry-run]
+
+Exits with status 1 when drift was found, so it can run as a check.
+"""
+import argparse
+import json
+import sys
+
+from app.core.counters import reconcile
+from app.database.db import SessionLocal
+import app.models  # noqa: F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--project-id", type=int)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report drift without fixing it"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = reconcile(db, project_id=args.project_id, fix=not args.dry_run)
+        db.commit()
+    finally:
+        db.close()
+
+    print(json.dumps({"drift": drift, "fixed": bool(drift) and not args.dry_run}, indent=2))
+    sys.exit(1 if drift else 0)
+
+
+if __name__ == "__main__":
+    main()
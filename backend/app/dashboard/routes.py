@@ -1,34 +1,49 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
-from app.core.deps import get_db, get_current_user
-from app.models.ticket import Ticket
-from app.schemas.dashboard import DashboardOut, KanbanColumn
+from app.core.deps import get_read_db, get_current_user
+from app.core.counters import UNASSIGNED, get_counts
+from app.core.versions import PROJECT, check_not_modified
+from app.core.response_cache import cached_response
+from app.core.metrics import TimedRoute, query_budget
+from app.schemas.dashboard import DashboardOut
 
-router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"], route_class=TimedRoute)
+
+
+def build_dashboard(db: Session, project_id: int) -> dict:
+    # Counters are maintained by every ticket write, so this is a single
+    # primary-key range read instead of a GROUP BY over the tickets
+    counts = get_counts(db, project_id)
+
+    return {
+        "project_id": project_id,
+        "summary": [
+            {"status": s, "tickets": c}
+            for s, c in counts["status"].items()
+        ],
+        "by_priority": [
+            {"priority": p, "tickets": c}
+            for p, c in counts["priority"].items()
+        ],
+        "by_assignee": [
+            {"assigned_to": None if a == UNASSIGNED else int(a), "tickets": c}
+            for a, c in counts["assignee"].items()
+        ],
+    }
 
 
 @router.get("/project/{project_id}", response_model=DashboardOut)
+@query_budget(4)
 def project_dashboard(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
-    rows = (
-        db.query(Ticket.status, func.count(Ticket.id))
-        .filter(
-            Ticket.project_id == project_id,
-            Ticket.is_deleted == False
-        )
-        .group_by(Ticket.status)
-        .all()
+    version = check_not_modified(request, response, db, PROJECT, project_id)
+    return cached_response(
+        request, response, PROJECT, project_id, version, DashboardOut,
+        lambda: build_dashboard(db, project_id),
     )
-
-    return {
-        "project_id": project_id,
-        "summary": [
-            KanbanColumn(status=s, tickets=c)
-            for s, c in rows
-        ]
-    }
@@ -0,0 +1,57 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
+
+from app.core.config import (
+    DATABASE_URL,
+    DB_POOL_TIMEOUT,
+    DB_READER_POOL_SIZE,
+    DB_WRITER_POOL_SIZE,
+)
+from app.database.db import IS_SQLITE, TimedPool, sqlite_hooks
+
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+
+class TimedAsyncQueuePool(TimedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def _backoff(seconds: float):
+    # Runs inside the session's greenlet: wait without blocking the loop
+    await_only(asyncio.sleep(seconds))
+
+
+def _sqlite_engine(pool_size: int, begin: str, query_only: bool):
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    sqlite_hooks(engine.sync_engine, begin, query_only, sleep=_backoff)
+    return engine
+
+
+if IS_SQLITE:
+    # Same rules as the sync engines (app/database/db.py): writers queue
+    # for a small BEGIN IMMEDIATE pool, readers get their own snapshots
+    async_engine = _sqlite_engine(
+        DB_WRITER_POOL_SIZE, "BEGIN IMMEDIATE", query_only=False
+    )
+    async_read_engine = _sqlite_engine(DB_READER_POOL_SIZE, "BEGIN", query_only=True)
+else:
+    async_engine = async_read_engine = create_async_engine(
+        ASYNC_DATABASE_URL, poolclass=TimedAsyncQueuePool
+    )
+
+# expire_on_commit=False: handlers return ORM objects after committing and
+# FastAPI serializes them outside the session's greenlet, where a refresh
+# could not run
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False)
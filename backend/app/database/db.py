@@ -1,12 +1,122 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
 
-DATABASE_URL = "sqlite:///./fixhub.db"
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+from app.core.config import (
+    DATABASE_URL,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    DB_READER_POOL_SIZE,
+    DB_WRITER_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_WRITE_RETRIES,
+    DB_WRITE_BACKOFF,
 )
+from app.core.metrics import track
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def apply_pragmas(dbapi_connection, query_only: bool = False):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+    if query_only:
+        cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+
+class TimedPool:
+    # Waiting for a free connection (or opening one) counts as pool time.
+    # ``waiting`` is how many callers are doing that right now, which
+    # admission control reads as the pool's queue.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self._waiting_lock = threading.Lock()
+
+    def _do_get(self):
+        with self._waiting_lock:
+            self.waiting += 1
+        try:
+            with track("pool"):
+                return super()._do_get()
+        finally:
+            with self._waiting_lock:
+                self.waiting -= 1
+
+
+class TimedQueuePool(TimedPool, QueuePool):
+    pass
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def sqlite_hooks(engine, begin: str, query_only: bool, sleep=time.sleep):
+    # Shared with the async engines, which pass a sleep that yields to the
+    # event loop
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy, not the driver, decide when transactions begin
+        dbapi_connection.isolation_level = None
+        apply_pragmas(dbapi_connection, query_only)
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        if begin == "BEGIN":
+            conn.exec_driver_sql(begin)
+            return
+
+        # Take the write lock up front: a transaction that started reading
+        # can then never fail to upgrade. Only BEGIN is retried, so no
+        # statement of the caller ever runs twice.
+        for attempt in range(DB_WRITE_RETRIES + 1):
+            try:
+                conn.exec_driver_sql(begin)
+                return
+            except OperationalError as e:
+                if "locked" not in str(e) or attempt == DB_WRITE_RETRIES:
+                    raise
+                sleep(DB_WRITE_BACKOFF * 2 ** attempt)
+
+
+def _sqlite_engine(pool_size: int, begin: str, query_only: bool):
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    sqlite_hooks(engine, begin, query_only)
+    return engine
+
+
+if IS_SQLITE:
+    # Writer: every transaction is BEGIN IMMEDIATE on a small pool, so
+    # in-process writers queue for a connection instead of racing for the
+    # SQLite lock
+    engine = _sqlite_engine(DB_WRITER_POOL_SIZE, "BEGIN IMMEDIATE", query_only=False)
+    # Readers: with WAL they run alongside the writer on their own snapshot
+    read_engine = _sqlite_engine(DB_READER_POOL_SIZE, "BEGIN", query_only=True)
+else:
+    engine = read_engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool)
+
+# expire_on_commit=False: flushed objects already hold every column (all
+# defaults are client-side), and reloading them after commit would open a
+# new write transaction that holds the writer until the session closes
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
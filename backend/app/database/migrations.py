@@ -0,0 +1,298 @@
+from sqlalchemy import text
+
+from app.database.db import Base
+
+# Versioned schema changes for databases created before the current models.
+# The applied version is kept in SQLite's PRAGMA user_version. Every step
+# must be idempotent: on a fresh database create_all has already built the
+# tables (and their declared indexes) before the migrations run.
+#
+# A step is either a SQL string or a callable taking the connection.
+
+
+def add_column(table: str, column: str, ddl: str):
+    def step(conn):
+        existing = {
+            row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))
+        }
+        if column not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+    return step
+
+
+def backfill_ticket_ranks(conn):
+    # Seed rank keys for every column in its current (position, id) order
+    spread_ticket_ranks(conn, "rank IS NULL", "position, id")
+
+
+def rekey_ticket_ranks(conn):
+    # Keys from before the integer head: rewrite every column, same order
+    spread_ticket_ranks(conn, "1 = 1", "rank, id")
+
+
+def spread_ticket_ranks(conn, where: str, order_by: str):
+    from app.core.ranking import spread_keys
+
+    rows = conn.execute(text(
+        f"SELECT id, project_id, status FROM tickets WHERE {where} "
+        f"ORDER BY project_id, status, {order_by}"
+    )).all()
+
+    columns: dict[tuple, list[int]] = {}
+    for ticket_id, project_id, status in rows:
+        columns.setdefault((project_id, status), []).append(ticket_id)
+
+    # Clear them first: the new keys may be ones other rows still hold,
+    # and ranks are unique per column
+    conn.execute(text(f"UPDATE tickets SET rank = NULL WHERE {where}"))
+
+    for ids in columns.values():
+        conn.execute(
+            text("UPDATE tickets SET rank = :rank WHERE id = :id"),
+            [
+                {"id": ticket_id, "rank": key}
+                for ticket_id, key in zip(ids, spread_keys(len(ids)))
+            ],
+        )
+
+
+def spread_duplicate_ranks(conn):
+    # Columns where live tickets share a rank start over with spread keys
+    spread_ticket_ranks(
+        conn,
+        where="""
+            is_deleted = 0 AND (project_id, status) IN (
+                SELECT project_id, status FROM tickets
+                WHERE is_deleted = 0 AND rank IS NOT NULL
+                GROUP BY project_id, status, rank
+                HAVING count(*) > 1
+            )
+        """,
+        order_by="rank, id",
+    )
+
+
+def autoincrement_revoked_tokens(conn):
+    # SQLite cannot add AUTOINCREMENT to a table: copy it into a new one
+    ddl = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'revoked_tokens'"
+    )).scalar()
+    if "AUTOINCREMENT" in ddl.upper():
+        return
+
+    from app.models.revoked_token import RevokedToken
+
+    table = RevokedToken.__table__
+    conn.execute(text("ALTER TABLE revoked_tokens RENAME TO revoked_tokens_old"))
+    for index in table.indexes:
+        conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    table.create(conn)
+    conn.execute(text(
+        "INSERT INTO revoked_tokens (id, digest, expires_at) "
+        "SELECT id, digest, expires_at FROM revoked_tokens_old"
+    ))
+    conn.execute(text("DROP TABLE revoked_tokens_old"))
+
+
+def rebuild_ticket_counters(conn):
+    from sqlalchemy.orm import Session
+
+    from app.core.counters import reconcile
+
+    reconcile(Session(bind=conn))
+
+
+MIGRATIONS = [
+    (
+        1,
+        "Composite indexes on hot query paths, unique project membership",
+        [
+            # Ticket lists, kanban columns and dashboard counts
+            """
+            CREATE INDEX IF NOT EXISTS ix_tickets_project_deleted_status_position
+            ON tickets (project_id, is_deleted, status, position)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_tickets_project_position_live
+            ON tickets (project_id, position, id) WHERE is_deleted = 0
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_tickets_assigned_to
+            ON tickets (assigned_to)
+            """,
+            # Comment threads
+            """
+            CREATE INDEX IF NOT EXISTS ix_comments_ticket_deleted_created
+            ON comments (ticket_id, is_deleted, created_at)
+            """,
+            # Attachments per ticket
+            """
+            CREATE INDEX IF NOT EXISTS ix_attachments_ticket
+            ON attachments (ticket_id)
+            """,
+            # Membership: drop duplicate rows (keep the oldest) before the
+            # unique index can be created
+            """
+            DELETE FROM project_members
+            WHERE id NOT IN (
+                SELECT min(id) FROM project_members
+                GROUP BY project_id, user_id
+            )
+            """,
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_project_members_project_user
+            ON project_members (project_id, user_id)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_project_members_user
+            ON project_members (user_id)
+            """,
+        ],
+    ),
+    (
+        2,
+        "Fractional rank keys for kanban ordering",
+        [
+            add_column("tickets", "rank", "VARCHAR"),
+            backfill_ticket_ranks,
+            """
+            CREATE INDEX IF NOT EXISTS ix_tickets_project_status_rank_live
+            ON tickets (project_id, status, rank, id) WHERE is_deleted = 0
+            """,
+        ],
+    ),
+    (
+        3,
+        "Content-addressed attachment blobs",
+        [
+            # The blobs table itself comes from create_all
+            add_column("attachments", "blob_digest", "VARCHAR REFERENCES blobs (digest)"),
+            add_column("attachments", "size", "INTEGER"),
+            add_column("attachments", "content_type", "VARCHAR"),
+        ],
+    ),
+    (
+        4,
+        "Dashboard ticket counters",
+        [
+            # The ticket_counters table itself comes from create_all
+            rebuild_ticket_counters,
+        ],
+    ),
+    (
+        5,
+        "Comment author snapshots",
+        [
+            add_column("comments", "author_email", "VARCHAR"),
+            add_column("comments", "author_role", "VARCHAR"),
+            """
+            UPDATE comments SET
+                author_email = (SELECT email FROM users WHERE users.id = comments.user_id),
+                author_role = (SELECT role FROM users WHERE users.id = comments.user_id)
+            WHERE author_email IS NULL
+            """,
+        ],
+    ),
+    (
+        6,
+        "Rank keys with a variable-length integer head",
+        [
+            rekey_ticket_ranks,
+        ],
+    ),
+    (
+        7,
+        "Password versions for token revocation",
+        [
+            add_column("users", "password_version", "INTEGER NOT NULL DEFAULT 0"),
+        ],
+    ),
+    (
+        8,
+        "Never reuse revoked token ids",
+        [
+            autoincrement_revoked_tokens,
+        ],
+    ),
+    (
+        9,
+        "Project ticket lists page by rank",
+        [
+            "DROP INDEX IF EXISTS ix_tickets_project_position_live",
+            """
+            CREATE INDEX IF NOT EXISTS ix_tickets_project_rank_live
+            ON tickets (project_id, rank, id) WHERE is_deleted = 0
+            """,
+        ],
+    ),
+    (
+        10,
+        "Unique ranks within a kanban column",
+        [
+            spread_duplicate_ranks,
+            "DROP INDEX IF EXISTS ix_tickets_project_status_rank_live",
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_tickets_project_status_rank_live
+            ON tickets (project_id, status, rank) WHERE is_deleted = 0
+            """,
+        ],
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def schema_is_current(conn) -> bool:
+    # One PRAGMA and one catalog read, instead of create_all's per-table
+    # checks and the migration loop, when every worker but the first boots
+    if get_schema_version(conn) != SCHEMA_VERSION:
+        return False
+    tables = {
+        row[0] for row in
+        conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))
+    }
+    return tables.issuperset(Base.metadata.tables)
+
+
+def run_migrations(engine) -> int:
+    # user_version is only bumped once every step of a version succeeded;
+    # since steps are idempotent an interrupted upgrade is simply re-run.
+    with engine.connect() as conn:
+        current = get_schema_version(conn)
+
+    for version, _name, steps in MIGRATIONS:
+        if version <= current:
+            continue
+
+        with engine.begin() as conn:
+            # Re-read under the write lock: a worker booting alongside may
+            # have applied this version since
+            current = get_schema_version(conn)
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+            conn.execute(text(f"PRAGMA user_version = {version}"))
+
+        current = version
+
+    return current
+
+
+def init_db(engine) -> int:
+    import app.models  # noqa: F401  (register every table on Base)
+
+    with engine.connect() as conn:
+        if schema_is_current(conn):
+            return SCHEMA_VERSION
+
+    Base.metadata.create_all(bind=engine)
+    return run_migrations(engine)
@@ -1,42 +1,178 @@
 from app.schemas.kanban_move import KanbanMove
 from fastapi import HTTPException
-from app.core.workflow import is_valid_transition
-from fastapi import APIRouter, Depends
+from app.core.workflow import is_valid_transition, WORKFLOW_STATES
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_read_db, get_current_user
+from app.core.counters import apply_ticket_change, ticket_state
+from app.core.events import publish_on_commit
+from app.core.versions import PROJECT, bump_version, check_not_modified
+from app.core.response_cache import cached_response
+from app.core.ranking import (
+    REBALANCE_LENGTH,
+    key_between,
+    last_rank,
+    rebalance_column_task,
+)
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    paginate,
+)
+from app.core.metrics import TimedRoute, query_budget
 from app.models.ticket import Ticket
 from app.schemas.kanban import KanbanBoard
+from app.schemas.ticket import TicketPage
 
-router = APIRouter(prefix="/kanban", tags=["Kanban"])
+router = APIRouter(prefix="/kanban", tags=["Kanban"], route_class=TimedRoute)
+
+
+# Only what TicketOut needs, plus rank for the column cursors
+BOARD_COLUMNS = (
+    Ticket.id,
+    Ticket.title,
+    Ticket.description,
+    Ticket.type,
+    Ticket.status,
+    Ticket.priority,
+    Ticket.project_id,
+    Ticket.assigned_to,
+    Ticket.rank,
+)
+
+
+def column_cursor(row) -> str:
+    # Same shape as paginate() over (rank, id)
+    return encode_cursor({"rank": row.rank, "id": row.id})
+
+
+def build_board(db: Session, project_id: int, limit: int) -> dict:
+    # One query: number the tickets of each column in board order, keep the
+    # first limit + 1 per column (the extra row only signals another page)
+    # and carry each column's total alongside
+    ranked = (
+        select(
+            *BOARD_COLUMNS,
+            func.row_number().over(
+                partition_by=Ticket.status,
+                order_by=(Ticket.rank, Ticket.id),
+            ).label("rn"),
+            func.count().over(partition_by=Ticket.status).label("total"),
+        )
+        .where(
+            Ticket.project_id == project_id,
+            Ticket.is_deleted == False,
+            Ticket.status.in_(WORKFLOW_STATES),
+        )
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked)
+        .where(ranked.c.rn <= limit + 1)
+        .order_by(ranked.c.status, ranked.c.rn)
+    ).all()
+
+    columns = {
+        status: {"status": status, "total": 0, "items": [], "next_cursor": None}
+        for status in WORKFLOW_STATES
+    }
+    for row in rows:
+        column = columns[row.status]
+        column["total"] = row.total
+        if row.rn <= limit:
+            column["items"].append(row)
+        else:
+            column["next_cursor"] = column_cursor(column["items"][-1])
+
+    return {"project_id": project_id, "columns": list(columns.values())}
 
 
 @router.get("/project/{project_id}", response_model=KanbanBoard)
+@query_budget(4)
 def get_kanban_board(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
-    tickets = (
-        db.query(Ticket)
-        .filter(
-            Ticket.project_id == project_id,
-            Ticket.is_deleted == False
+    version = check_not_modified(request, response, db, PROJECT, project_id)
+    return cached_response(
+        request, response, PROJECT, project_id, version, KanbanBoard,
+        lambda: build_board(db, project_id, limit), trusted=True,
+    )
+
+
+# Next page of a single column, using that column's next_cursor
+@router.get("/project/{project_id}/column/{status}", response_model=TicketPage)
+@query_budget(4)
+def get_kanban_column(
+    project_id: int,
+    status: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user)
+):
+    if status not in WORKFLOW_STATES:
+        raise HTTPException(status_code=404, detail="Unknown column")
+
+    check_not_modified(request, response, db, PROJECT, project_id)
+
+    query = db.query(*BOARD_COLUMNS).filter(
+        Ticket.project_id == project_id,
+        Ticket.status == status,
+        Ticket.is_deleted == False
+    )
+
+    items, next_cursor = paginate(
+        query, [Ticket.rank, Ticket.id], limit, after
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def neighbour_rank(db: Session, column: list, rank: str, below: bool):
+    # Rank of the ticket directly below (or above) ``rank`` in a column
+    query = db.query(Ticket.rank).filter(*column)
+    if below:
+        query = query.filter(Ticket.rank > rank).order_by(Ticket.rank, Ticket.id)
+    else:
+        query = query.filter(Ticket.rank < rank).order_by(
+            Ticket.rank.desc(), Ticket.id.desc()
         )
-        .all()
+    row = query.first()
+    return row.rank if row else None
+
+
+def board_changed():
+    return HTTPException(
+        status_code=409,
+        detail="The board changed while moving the ticket, please reload",
     )
 
-    return {
-        "todo": [t for t in tickets if t.status == "todo"],
-        "in_progress": [t for t in tickets if t.status == "in_progress"],
-        "done": [t for t in tickets if t.status == "done"],
-    }
+
+def respace_column(background_tasks: BackgroundTasks, project_id: int, status: str):
+    # Answered like board_changed(), but returned rather than raised so the
+    # column is rebalanced after the response and the client's retry finds
+    # a free gap
+    background_tasks.add_task(rebalance_column_task, project_id, status)
+    return JSONResponse(status_code=409, content={"detail": board_changed().detail})
 
 
 @router.post("/move")
+@query_budget(8)
 def move_ticket(
     move: KanbanMove,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db, scope="function"),
     current_user=Depends(get_current_user)
 ):
     ticket = db.query(Ticket).filter(Ticket.id == move.ticket_id).first()
@@ -50,9 +186,106 @@ def move_ticket(
                 status_code=400,
                 detail=f"Invalid status transition: {ticket.status} → {move.new_status}"
             )
-        ticket.status = move.new_status
 
-    ticket.position = move.new_position
+    # Target column, without the ticket being moved
+    column = [
+        Ticket.project_id == ticket.project_id,
+        Ticket.status == move.new_status,
+        Ticket.is_deleted == False,
+        Ticket.id != ticket.id,
+    ]
+
+    after_rank = before_rank = None
+
+    if move.after_id is None and move.before_id is None:
+        if move.new_position is None:
+            after_rank = last_rank(db, ticket.project_id, move.new_status)
+        else:
+            # Legacy index-based move: look up the neighbours at that index
+            offset = max(move.new_position - 1, 0)
+            ranks = [
+                row.rank
+                for row in db.query(Ticket.rank)
+                .filter(*column)
+                .order_by(Ticket.rank, Ticket.id)
+                .offset(offset)
+                .limit(2)
+            ]
+            if move.new_position <= 0:
+                before_rank = ranks[0] if ranks else None
+            elif ranks:
+                after_rank = ranks[0]
+                before_rank = ranks[1] if len(ranks) > 1 else None
+            else:
+                after_rank = last_rank(db, ticket.project_id, move.new_status)
+    else:
+        neighbour_ids = {move.after_id, move.before_id} - {None}
+        if ticket.id in neighbour_ids:
+            raise HTTPException(
+                status_code=400, detail="A ticket cannot be its own neighbour"
+            )
+
+        neighbours = {
+            row.id: row.rank
+            for row in db.query(Ticket.id, Ticket.rank)
+            .filter(Ticket.id.in_(neighbour_ids), *column)
+        }
+        # A neighbour that left the column since the client loaded it
+        if len(neighbours) != len(neighbour_ids):
+            raise board_changed()
+
+        if move.after_id is not None:
+            after_rank = neighbours[move.after_id]
+        if move.before_id is not None:
+            before_rank = neighbours[move.before_id]
+
+        if move.before_id is None:
+            before_rank = neighbour_rank(db, column, after_rank, below=True)
+        elif move.after_id is None:
+            after_rank = neighbour_rank(db, column, before_rank, below=False)
+        elif neighbour_rank(db, column, after_rank, below=True) != before_rank:
+            # Both given but no longer adjacent
+            raise board_changed()
+
+    try:
+        new_rank = key_between(after_rank, before_rank)
+    except ValueError:
+        # The neighbours share a rank, left over from before ranks were
+        # unique per column
+        return respace_column(background_tasks, ticket.project_id, move.new_status)
+
+    # Compare-and-set: only move the ticket if nobody else did meanwhile
+    try:
+        moved = (
+            db.query(Ticket)
+            .filter(
+                Ticket.id == ticket.id,
+                Ticket.status == ticket.status,
+                Ticket.rank.is_not_distinct_from(ticket.rank),
+            )
+            .update(
+                {Ticket.status: move.new_status, Ticket.rank: new_rank},
+                synchronize_session=False,
+            )
+        )
+    except IntegrityError:
+        # Another ticket of the column already holds the new rank
+        return respace_column(background_tasks, ticket.project_id, move.new_status)
+    if not moved:
+        raise board_changed()
+
+    if move.new_status != ticket.status:
+        before = ticket_state(ticket)
+        apply_ticket_change(db, before, {**before, "status": move.new_status})
+
+    bump_version(db, PROJECT, ticket.project_id)
+    publish_on_commit(
+        db, ticket.project_id, "ticket.moved",
+        {"id": ticket.id, "status": move.new_status, "rank": new_rank},
+    )
+    if len(new_rank) > REBALANCE_LENGTH:
+        background_tasks.add_task(
+            rebalance_column_task, ticket.project_id, move.new_status
+        )
 
-    db.commit()
-    return {"message": "Ticket moved successfully"}
+    return {"message": "Ticket moved successfully", "rank": new_rank}
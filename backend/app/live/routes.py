@@ -0,0 +1,113 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.requests import HTTPConnection
+
+from app.core.config import EVENT_KEEPALIVE
+from app.core.deps import get_current_user
+from app.core.events import hub
+from app.core.permissions import get_project_role, require_project
+from app.core.metrics import TimedRoute
+from app.database.db import ReadSessionLocal
+
+router = APIRouter(prefix="/live", tags=["Live"], route_class=TimedRoute)
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def connection_token(conn: HTTPConnection, token: str | None) -> str | None:
+    # Browser EventSource / WebSocket clients cannot set headers: ?token=
+    scheme, credentials = get_authorization_scheme_param(
+        conn.headers.get("authorization")
+    )
+    if scheme.lower() == "bearer" and credentials:
+        return credentials
+    return token
+
+
+def authorize(token: str | None, project_id: int):
+    # Own short session: a stream must not hold a DB connection while open
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    db = ReadSessionLocal()
+    try:
+        user = get_current_user(token, db)
+        if get_project_role(db, project_id, user.id) is None:
+            require_project(db, project_id)
+            raise HTTPException(status_code=403, detail="Not a project member")
+    finally:
+        db.close()
+
+
+# -----------------------------
+# Server-Sent Events
+# -----------------------------
+@router.get("/project/{project_id}/events")
+async def project_events(
+    project_id: int,
+    request: Request,
+    token: str | None = None,
+):
+    await run_in_threadpool(
+        authorize, connection_token(request, token), project_id
+    )
+
+    async def stream():
+        async with hub.subscribe(project_id) as subscriber:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscriber.queue.get(), EVENT_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# -----------------------------
+# WebSocket
+# -----------------------------
+@router.websocket("/project/{project_id}/ws")
+async def project_socket(
+    websocket: WebSocket,
+    project_id: int,
+    token: str | None = None,
+):
+    try:
+        await run_in_threadpool(
+            authorize, connection_token(websocket, token), project_id
+        )
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+
+    await websocket.accept()
+
+    async with hub.subscribe(project_id) as subscriber:
+        async def send_events():
+            while True:
+                await websocket.send_text(await subscriber.queue.get())
+
+        sender = asyncio.create_task(send_events())
+        try:
+            # The channel is one-way; reading only notices the disconnect
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
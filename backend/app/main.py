@@ -1,44 +1,128 @@
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database.db import engine, Base
-from app.models import user, project, ticket, comment, attachment
-from app.auth.routes import router as auth_router
-from app.projects.routes import router as project_router
-from app.tickets.routes import router as ticket_router
-from app.dashboard.routes import router as dashboard_router
-from app.kanban.routes import router as kanban_router
-from app.comments.routes import router as comment_router
-from app.attachments.routes import router as attachment_router
-from app.project_members.routes import router as project_member_router
-
-app = FastAPI(title="FixHub API", version="1.0")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173",  # vite frontend
-                   ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from app.core.admission import AdmissionMiddleware
+from app.core.config import ADMISSION, ASYNC_DB, METRICS, THREADPOOL_SIZE
+from app.core.metrics import MetricsMiddleware
+from app.core.startup import StartupReport
+
+# Imported (and timed) by create_app(), included in this order
+ROUTER_MODULES = (
+    "app.auth.routes",
+    "app.projects.routes",
+    "app.tickets.routes",
+    "app.dashboard.routes",
+    "app.kanban.routes",
+    "app.comments.routes",
+    "app.attachments.routes",
+    "app.project_members.routes",
+    "app.monitoring.routes",
+    "app.live.routes",
 )
+# Served from async handlers when FIXHUB_ASYNC_DB is on
+ASYNC_ROUTER_MODULES = {
+    "app.tickets.routes",
+    "app.dashboard.routes",
+    "app.kanban.routes",
+    "app.comments.routes",
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema work happens here, once per process, instead of at import time
+    from app.core.events import broker, hub
+    from app.core.search import init_search
+    from app.core.security import password_hasher
+    from app.core.token import denylist
+    from app.database.db import ReadSessionLocal, engine, read_engine
+    from app.database.migrations import init_db
+
+    # Admission limits (app/core/config.py) are sized to this pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
 
-Base.metadata.create_all(bind=engine)
+    report = app.state.startup
+    with report.phase("database"):
+        init_db(engine)
+    with report.phase("search"):
+        init_search(engine)
+    with report.phase("token_denylist"):
+        denylist.start(ReadSessionLocal)
+    with report.phase("broker"):
+        # Cache invalidations from other workers arrive even while no live
+        # connection is open
+        await broker.start(hub)
+    report.finish()
 
-app.include_router(auth_router)
-app.include_router(project_router)
-app.include_router(ticket_router)
-app.include_router(dashboard_router)
-app.include_router(kanban_router)
-app.include_router(comment_router)
-app.include_router(attachment_router)
-app.include_router(project_member_router)
+    yield
+
+    denylist.stop()
+    password_hasher.shutdown()
+    engine.dispose()
+    read_engine.dispose()
+    if ASYNC_DB:
+        from app.database.async_db import async_engine, async_read_engine
+
+        await async_engine.dispose()
+        await async_read_engine.dispose()
 
 
-@app.get("/")
 def root():
     return {
         "app": "FixHub",
         "status": "Production-ready",
         "version": "1.0"
     }
+
+
+def create_app() -> FastAPI:
+    report = StartupReport()
+    modules = {name: report.import_module(name) for name in ROUTER_MODULES}
+
+    with report.phase("routes"):
+        app = FastAPI(title="FixHub API", version="1.0", lifespan=lifespan)
+        app.state.startup = report
+
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["http://localhost:5173",  # vite frontend
+                           ],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+        if ADMISSION:
+            app.add_middleware(AdmissionMiddleware)
+
+        # Added last so it is the outermost middleware and times the whole
+        # request, refused ones included
+        if METRICS:
+            app.add_middleware(MetricsMiddleware)
+
+        for name, module in modules.items():
+            router = module.router
+            if ASYNC_DB and name in ASYNC_ROUTER_MODULES:
+                from app.core.async_deps import async_router
+
+                router = async_router(router)
+            app.include_router(router)
+
+        if METRICS:
+            app.include_router(modules["app.monitoring.routes"].metrics_router)
+
+        app.get("/")(root)
+
+    return app
+
+
+def __getattr__(name: str):
+    # ``uvicorn app.main:app`` builds the application on first access, so
+    # importing this module (or create_app) has no side effects
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
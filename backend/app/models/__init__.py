@@ -4,3 +4,7 @@ from app.models.ticket import Ticket
 from app.models.comment import Comment
 from app.models.attachment import Attachment
 from app.models.project_member import ProjectMember
+from app.models.blob import Blob
+from app.models.ticket_counter import TicketCounter
+from app.models.resource_version import ResourceVersion
+from app.models.revoked_token import RevokedToken
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -7,11 +7,17 @@ from app.database.db import Base
 
 class Attachment(Base):
     __tablename__ = "attachments"
+    __table_args__ = (
+        Index("ix_attachments_ticket", "ticket_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
+    blob_digest = Column(String, ForeignKey("blobs.digest"), nullable=True)
+    size = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
 
     ticket_id = Column(Integer, ForeignKey("tickets.id"))
     uploaded_by = Column(Integer, ForeignKey("users.id"))
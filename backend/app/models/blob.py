@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.database.db import Base
+
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    # sha256 of the content; the storage key of the stored bytes
+    digest = Column(String, primary_key=True)
+    size = Column(Integer, nullable=False)
+    refcount = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
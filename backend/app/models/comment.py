@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.db import Base
@@ -6,6 +6,12 @@ from app.database.db import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index(
+            "ix_comments_ticket_deleted_created",
+            "ticket_id", "is_deleted", "created_at",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(String, nullable=False)
@@ -13,6 +19,9 @@ class Comment(Base):
 
     ticket_id = Column(Integer, ForeignKey("tickets.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
+    # The author as of writing, so threads are read without joining users
+    author_email = Column(String)
+    author_role = Column(String)
 
     is_deleted = Column(Boolean, default=False)
 
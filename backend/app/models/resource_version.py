@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from app.database.db import Base
+
+
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+
+    # Bumped by every write that changes what GETs of the resource return:
+    # ("project", id) for boards, ticket lists and the dashboard,
+    # ("ticket", id) for its comments
+    scope = Column(String, primary_key=True)
+    key = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from app.database.db import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    # Ids are never reused, even after the rows with the highest ids were
+    # deleted, so "id > last seen" never skips a new row
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    # Logged-out access tokens by sha256 digest, kept until they would have
+    # expired anyway; ids let every process fetch only what is new
+    id = Column(Integer, primary_key=True)
+    digest = Column(String, nullable=False)
+    expires_at = Column(Integer, nullable=False, index=True)
@@ -1,10 +1,30 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.database.db import Base
 
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        Index(
+            "ix_tickets_project_deleted_status_position",
+            "project_id", "is_deleted", "status", "position",
+        ),
+        Index(
+            "ix_tickets_project_rank_live",
+            "project_id", "rank", "id",
+            sqlite_where=text("is_deleted = 0"),
+        ),
+        Index("ix_tickets_assigned_to", "assigned_to"),
+        # Two live tickets of a column never share a rank, or the gap
+        # between them could never be split
+        Index(
+            "ux_tickets_project_status_rank_live",
+            "project_id", "status", "rank",
+            unique=True,
+            sqlite_where=text("is_deleted = 0"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -13,6 +33,7 @@ class Ticket(Base):
     status = Column(String, default="todo")    # todo / in_progress / done
     priority = Column(String, default="medium")
     position = Column(Integer, default=0)
+    rank = Column(String)                      # fractional kanban order key
 
     project_id = Column(Integer, ForeignKey("projects.id"))
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
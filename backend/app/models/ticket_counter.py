@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.database.db import Base
+
+
+class TicketCounter(Base):
+    __tablename__ = "ticket_counters"
+
+    # Live (non-deleted) tickets per project for one value of a dimension:
+    # ("status", "todo"), ("priority", "high"), ("assignee", "12")
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    dimension = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -8,4 +8,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
+    # Bumped only when the password itself changes (not when its hash is
+    # upgraded): revokes the tokens issued before, see core/token.py
+    password_version = Column(Integer, nullable=False, default=0, server_default="0")
     role = Column(String, default="developer")
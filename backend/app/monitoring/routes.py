@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics, response_cache
+from app.core.admission import admission
+from app.core.cache import CACHES
+from app.core.events import hub
+from app.core.security import password_hasher
+from app.core.token import denylist
+
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"], route_class=metrics.TimedRoute)
+# Prometheus scrapes /metrics by default
+metrics_router = APIRouter(tags=["Monitoring"], route_class=metrics.TimedRoute)
+
+
+@router.get("/caches")
+def cache_stats():
+    return {name: cache.stats() for name, cache in CACHES.items()}
+
+
+# async: the threadpool statistics are read on the event loop
+@router.get("/admission")
+async def admission_stats(request: Request):
+    return admission.stats(request.app)
+
+
+@router.get("/token-denylist")
+def token_denylist_stats():
+    return denylist.stats()
+
+
+@router.get("/password-hashing")
+def password_hashing_stats():
+    return password_hasher.stats()
+
+
+@router.get("/response-cache")
+def response_cache_stats():
+    return response_cache.stats()
+
+
+@router.get("/live-events")
+def live_event_stats():
+    return hub.stats()
+
+
+@router.get("/startup")
+def startup_report(request: Request):
+    return request.app.state.startup.as_dict()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, get_current_user
-from app.models.project import Project
+from app.core.deps import get_db, get_read_db, get_current_user
+from app.core.permissions import require_project_owner
+from app.core.metrics import TimedRoute
 from app.models.project_member import ProjectMember
 from app.models.user import User
 from app.schemas.project_member import (
@@ -11,24 +12,24 @@ from app.schemas.project_member import (
 )
 
 router = APIRouter(
-    prefix="/projects/{project_id}/members", tags=["Project Members"])
+    prefix="/projects/{project_id}/members",
+    tags=["Project Members"],
+    route_class=TimedRoute,
+)
 
 
 @router.post("/", response_model=ProjectMemberOut)
 def add_project_member(
     project_id: int,
     member: ProjectMemberCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user=Depends(get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
     # Only project owner can manage team (Admin logic)
-    if current_user.id != project.owner_id:
-        raise HTTPException(
-            status_code=403, detail="Only project owner can manage members")
+    require_project_owner(
+        db, project_id, current_user.id,
+        detail="Only project owner can manage members",
+    )
 
     existing = (
         db.query(ProjectMember)
@@ -48,15 +49,14 @@ def add_project_member(
     )
 
     db.add(project_member)
-    db.commit()
-    db.refresh(project_member)
+    db.flush()
     return project_member
 
 
 @router.get("/", response_model=list[ProjectMemberOut])
 def list_project_members(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
     return (
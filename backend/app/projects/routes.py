@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.schemas.project import ProjectCreate, ProjectOut
@@ -6,18 +6,23 @@ from app.schemas.project_member import ProjectMemberCreate
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.user import User
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_read_db, get_current_user
+from app.core.permissions import get_project_role, require_project
+from app.core.response_cache import cached_response
+from app.core.versions import PROJECT, check_not_modified
+from app.core.metrics import TimedRoute, query_budget
 
-router = APIRouter(prefix="/projects", tags=["Projects"])
+router = APIRouter(prefix="/projects", tags=["Projects"], route_class=TimedRoute)
 
 
 # -------------------------------
 # CREATE PROJECT (AUTO ADMIN)
 # -------------------------------
 @router.post("/", response_model=ProjectOut)
+@query_budget(6)
 def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     new_project = Project(
@@ -26,8 +31,7 @@ def create_project(
         owner_id=current_user.id,
     )
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    db.flush()
 
     # auto assign creator as admin
     admin_member = ProjectMember(
@@ -36,7 +40,7 @@ def create_project(
         role="admin",
     )
     db.add(admin_member)
-    db.commit()
+    db.flush()
 
     return new_project
 
@@ -45,8 +49,9 @@ def create_project(
 # LIST PROJECTS
 # -------------------------------
 @router.get("/", response_model=list[ProjectOut])
+@query_budget(3)
 def list_projects(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return (
@@ -61,27 +66,18 @@ def list_projects(
 # ADD PROJECT MEMBER (ADMIN ONLY)
 # -------------------------------
 @router.post("/{project_id}/members")
+@query_budget(6)
 def add_project_member(
     project_id: int,
     data: ProjectMemberCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
     # only admin can add members
-    admin = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-            ProjectMember.role == "admin",
-        )
-        .first()
-    )
-    if not admin:
+    role = get_project_role(db, project_id, current_user.id)
+    if role is None:
+        require_project(db, project_id)
+    if role != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
 
     user = db.query(User).filter(User.email == data.email).first()
@@ -105,8 +101,7 @@ def add_project_member(
         role=data.role,
     )
     db.add(member)
-    db.commit()
-    db.refresh(member)
+    db.flush()
 
     return {
         "id": member.id,
@@ -119,52 +114,56 @@ def add_project_member(
 # ✅ GET PROJECT MEMBERS (FIX)
 # -------------------------------
 @router.get("/{project_id}/members")
+@query_budget(4)
 def get_project_members(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    members = (
-        db.query(ProjectMember, User)
-        .join(User, User.id == ProjectMember.user_id)
-        .filter(ProjectMember.project_id == project_id)
-        .all()
-    )
+    version = check_not_modified(request, response, db, PROJECT, project_id)
+
+    def build():
+        members = (
+            db.query(ProjectMember, User)
+            .join(User, User.id == ProjectMember.user_id)
+            .filter(ProjectMember.project_id == project_id)
+            .all()
+        )
 
-    return [
-        {
-            "id": pm.id,
-            "email": user.email,
-            "role": pm.role,
-        }
-        for pm, user in members
-    ]
+        return [
+            {
+                "id": pm.id,
+                "email": user.email,
+                "role": pm.role,
+            }
+            for pm, user in members
+        ]
+
+    return cached_response(
+        request, response, PROJECT, project_id, version, None, build
+    )
 # -------------------------------
 # GET CURRENT USER ROLE IN PROJECT
 # -------------------------------
 
 
 @router.get("/{project_id}/my-role")
+@query_budget(3)
 def get_my_project_role(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
+    role = get_project_role(db, project_id, current_user.id)
 
-    if not member:
+    if role is None:
         raise HTTPException(
             status_code=404,
             detail="User is not a member of this project",
         )
 
     return {
-        "role": member.role,
+        "role": role,
     }
@@ -8,6 +8,9 @@ class AttachmentOut(BaseModel):
     uploaded_at: datetime
     ticket_id: int
     uploaded_by: int
+    size: int | None = None
+    content_type: str | None = None
+    blob_digest: str | None = None
 
     class Config:
         from_attributes = True
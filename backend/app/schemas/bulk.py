@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+
+from app.core.config import BULK_MAX_ITEMS
+from app.schemas.ticket import TicketCreate, TicketUpdate
+
+
+class TicketBulkCreate(BaseModel):
+    items: list[TicketCreate] = Field(max_length=BULK_MAX_ITEMS)
+    # Write nothing if any item fails
+    all_or_nothing: bool = False
+
+
+class TicketBulkUpdateItem(TicketUpdate):
+    id: int
+
+
+class TicketBulkUpdate(BaseModel):
+    items: list[TicketBulkUpdateItem] = Field(max_length=BULK_MAX_ITEMS)
+    all_or_nothing: bool = False
+
+
+class TicketTransition(BaseModel):
+    id: int
+    status: str
+
+
+class TicketBulkTransition(BaseModel):
+    items: list[TicketTransition] = Field(max_length=BULK_MAX_ITEMS)
+    all_or_nothing: bool = False
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: int | None = None
+    ok: bool
+    error: str | None = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkItemResult]
@@ -18,3 +18,11 @@ class CommentOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CommentPage(BaseModel):
+    # Live (not deleted) comments of the ticket, over all pages
+    total: int
+    items: list[CommentOut]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
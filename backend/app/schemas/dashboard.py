@@ -6,6 +6,18 @@ class KanbanColumn(BaseModel):
     tickets: int
 
 
+class PriorityCount(BaseModel):
+    priority: str
+    tickets: int
+
+
+class AssigneeCount(BaseModel):
+    assigned_to: int | None
+    tickets: int
+
+
 class DashboardOut(BaseModel):
     project_id: int
     summary: list[KanbanColumn]
+    by_priority: list[PriorityCount] = []
+    by_assignee: list[AssigneeCount] = []
@@ -2,7 +2,13 @@ from pydantic import BaseModel
 from app.schemas.ticket import TicketOut
 
 
+class KanbanColumnPage(BaseModel):
+    status: str
+    total: int
+    items: list[TicketOut]
+    next_cursor: str | None = None
+
+
 class KanbanBoard(BaseModel):
-    todo: list[TicketOut]
-    in_progress: list[TicketOut]
-    done: list[TicketOut]
+    project_id: int
+    columns: list[KanbanColumnPage]
@@ -4,4 +4,9 @@ from pydantic import BaseModel
 class KanbanMove(BaseModel):
     ticket_id: int
     new_status: str
-    new_position: int
+    # Neighbours at the drop target: the moved ticket lands below after_id
+    # and above before_id. Leave both empty to drop at the bottom.
+    after_id: int | None = None
+    before_id: int | None = None
+    # Deprecated: zero-based index in the target column
+    new_position: int | None = None
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from app.schemas.ticket import TicketOut
 
 
 class TicketSearchParams(BaseModel):
@@ -7,3 +8,13 @@ class TicketSearchParams(BaseModel):
     assignee: int | None = None
     project_id: int | None = None
     q: str | None = None
+
+
+class TicketSearchHit(TicketOut):
+    rank: float | None = None
+    snippet: str | None = None
+
+
+class TicketSearchPage(BaseModel):
+    items: list[TicketSearchHit]
+    next_cursor: str | None = None
@@ -30,3 +30,8 @@ class TicketOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TicketPage(BaseModel):
+    items: list[TicketOut]
+    next_cursor: str | None = None
@@ -1,46 +1,94 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, insert, literal_column, table, column, update
 from sqlalchemy.orm import Session
 
-from app.schemas.ticket import TicketCreate, TicketUpdate, TicketOut
+from app.schemas.ticket import TicketCreate, TicketUpdate, TicketOut, TicketPage
+from app.schemas.search import TicketSearchPage
+from app.schemas.bulk import (
+    BulkResult,
+    TicketBulkCreate,
+    TicketBulkTransition,
+    TicketBulkUpdate,
+    TicketBulkUpdateItem,
+)
 from app.models.ticket import Ticket
-from app.models.project import Project
-from app.models.project_member import ProjectMember
 from app.models.user import User
-from app.core.deps import get_db, get_current_user
-from app.core.workflow import is_valid_transition
-
-router = APIRouter(prefix="/tickets", tags=["Tickets"])
+from app.core.deps import get_db, get_read_db, get_current_user
+from app.core.permissions import (
+    get_project_role,
+    get_user_memberships,
+    require_project,
+)
+from app.core.events import publish_on_commit, ticket_data
+from app.core.versions import PROJECT, bump_version, check_not_modified
+from app.core.response_cache import cached_response, json_response
+from app.core.ranking import append_rank, keys_after, last_rank
+from app.core.counters import (
+    apply_ticket_change,
+    apply_ticket_changes,
+    ticket_state,
+)
+from app.core.workflow import is_valid_transition, WORKFLOW_STATES
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from app.core.metrics import TimedRoute, query_budget
+from app.core.admission import rate_limit
+from app.core import search as search_index
+
+router = APIRouter(prefix="/tickets", tags=["Tickets"], route_class=TimedRoute)
+
+
+# Only what TicketOut needs: the list and search routes read plain rows
+TICKET_COLUMNS = (
+    Ticket.id,
+    Ticket.title,
+    Ticket.description,
+    Ticket.type,
+    Ticket.status,
+    Ticket.priority,
+    Ticket.project_id,
+    Ticket.assigned_to,
+)
 
 
 # -----------------------------
-# Helper: resolve project role
+# Helper: edit permission (single and bulk updates)
 # -----------------------------
-def get_project_role(db: Session, project_id: int, user_id: int) -> str | None:
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == user_id,
-        )
-        .first()
-    )
-    return member.role if member else None
+def update_denied_reason(
+    role: str | None, assigned_to: int | None, user_id: int, reassign: bool
+) -> str | None:
+    if role is None:
+        return "Not a project member"
+
+    # 🔒 Viewer cannot edit anything
+    if role == "viewer":
+        return "Viewers cannot edit tickets"
+
+    # 🔒 Developer can edit ONLY assigned tickets
+    if role == "developer" and assigned_to != user_id:
+        return "Developers can only edit tickets assigned to them"
+
+    # 🔒 Admin-only reassignment
+    if reassign and role != "admin":
+        return "Only admins can reassign tickets"
+
+    return None
 
 
 # -----------------------------
 # Create ticket
 # -----------------------------
 @router.post("/", response_model=TicketOut)
+@query_budget(6)
 def create_ticket(
     ticket: TicketCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
-    project = db.query(Project).filter(Project.id == ticket.project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
     role = get_project_role(db, ticket.project_id, current_user.id)
+    if role is None:
+        require_project(db, ticket.project_id)
 
     if role is None or role == "viewer":
         raise HTTPException(
@@ -55,47 +103,340 @@ def create_ticket(
         priority=ticket.priority,
         project_id=ticket.project_id,
         assigned_to=ticket.assigned_to,
+        status=WORKFLOW_STATES[0],
+        rank=append_rank(db, ticket.project_id, WORKFLOW_STATES[0]),
     )
 
     db.add(new_ticket)
-    db.commit()
-    db.refresh(new_ticket)
+    apply_ticket_change(db, None, ticket_state(new_ticket))
+    db.flush()
+    bump_version(db, PROJECT, new_ticket.project_id)
+    publish_on_commit(db, new_ticket.project_id, "ticket.created", ticket_data(new_ticket))
     return new_ticket
 
 
+# -----------------------------
+# Bulk create / update / transition
+# -----------------------------
+def bulk_response(results: dict[int, dict], pending: list[int]) -> dict:
+    # ``pending`` items passed validation but were not written
+    for index in pending:
+        results[index] = {
+            "index": index, "ok": False,
+            "error": "Not written: another item in the batch failed",
+        }
+
+    succeeded = sum(1 for result in results.values() if result["ok"])
+    return {
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": [results[i] for i in sorted(results)],
+    }
+
+
+class ColumnTails:
+    """
+    Ranks for the tickets a batch appends to the bottom of columns. Items
+    are counted per column first; allocate() then reads each column's
+    bottom once and hands out that many consecutive keys after it.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.counts: dict[tuple, int] = {}
+
+    def reserve(self, project_id: int, status: str):
+        key = (project_id, status)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def allocate(self) -> dict[tuple, Iterator[str]]:
+        return {
+            key: iter(keys_after(last_rank(self.db, *key), count))
+            for key, count in self.counts.items()
+        }
+
+
+# Statements grow with the number of target columns, not of items
+@router.post("/bulk/create", response_model=BulkResult)
+@query_budget(max_repeats=None)
+def bulk_create_tickets(
+    batch: TicketBulkCreate,
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    memberships = get_user_memberships(db, current_user.id)
+    status = WORKFLOW_STATES[0]
+    tails = ColumnTails(db)
+
+    results: dict[int, dict] = {}
+    pending: list[int] = []
+    rows: list[dict] = []
+
+    for index, item in enumerate(batch.items):
+        role = memberships.get(item.project_id)
+        if role is None or role == "viewer":
+            results[index] = {
+                "index": index, "ok": False,
+                "error": "You do not have permission to create tickets in this project",
+            }
+            continue
+
+        pending.append(index)
+        tails.reserve(item.project_id, status)
+        rows.append({**item.model_dump(), "status": status})
+
+    if not pending or (batch.all_or_nothing and results):
+        return bulk_response(results, pending)
+
+    ranks = tails.allocate()
+    for row in rows:
+        row["rank"] = next(ranks[row["project_id"], status])
+
+    # One multi-row INSERT ... RETURNING per batch of rows. SQLite returns
+    # them in no guaranteed order, and asking SQLAlchemy to sort them falls
+    # back to an INSERT per row; every row enters the same column, so
+    # (project, rank) tells the new tickets apart instead
+    inserted = db.execute(
+        insert(Ticket).returning(Ticket.id, Ticket.project_id, Ticket.rank),
+        rows,
+    ).all()
+    new_ids = {
+        (project_id, rank): ticket_id for ticket_id, project_id, rank in inserted
+    }
+    ids = [new_ids[row["project_id"], row["rank"]] for row in rows]
+
+    apply_ticket_changes(
+        db, [(None, {**row, "is_deleted": False}) for row in rows]
+    )
+    for row, ticket_id in zip(rows, ids):
+        bump_version(db, PROJECT, row["project_id"])
+        publish_on_commit(
+            db, row["project_id"], "ticket.created",
+            ticket_data({**row, "id": ticket_id}),
+        )
+
+    for index, ticket_id in zip(pending, ids):
+        results[index] = {"index": index, "id": ticket_id, "ok": True}
+    return bulk_response(results, [])
+
+
+def apply_bulk_updates(
+    db: Session,
+    current_user: User,
+    items: list[TicketBulkUpdateItem],
+    all_or_nothing: bool,
+):
+    memberships = get_user_memberships(db, current_user.id)
+    tails = ColumnTails(db)
+
+    columns = (
+        Ticket.id, Ticket.project_id, Ticket.title, Ticket.description,
+        Ticket.type, Ticket.status, Ticket.priority, Ticket.assigned_to,
+        Ticket.rank,
+    )
+    original = {
+        row.id: {**row._asdict(), "is_deleted": False}
+        for row in db.query(*columns).filter(
+            Ticket.id.in_({item.id for item in items}),
+            Ticket.is_deleted == False,
+        )
+    }
+    # Items are applied in order; later items see earlier ones' changes
+    current = {ticket_id: dict(t) for ticket_id, t in original.items()}
+
+    results: dict[int, dict] = {}
+    pending: list[int] = []
+    # ticket id -> the column it ends up at the bottom of, in move order
+    moved: dict[int, tuple] = {}
+
+    for index, item in enumerate(items):
+        ticket = current.get(item.id)
+        if ticket is None:
+            results[index] = {
+                "index": index, "id": item.id, "ok": False,
+                "error": "Ticket not found",
+            }
+            continue
+
+        reassign = (
+            "assigned_to" in item.model_fields_set
+            and item.assigned_to != ticket["assigned_to"]
+        )
+        denied = update_denied_reason(
+            memberships.get(ticket["project_id"]),
+            ticket["assigned_to"],
+            current_user.id,
+            reassign,
+        )
+        status_change = item.status is not None and item.status != ticket["status"]
+        if not denied and status_change:
+            if not is_valid_transition(ticket["status"], item.status):
+                denied = f"Invalid status transition: {ticket['status']} → {item.status}"
+        if denied:
+            results[index] = {
+                "index": index, "id": item.id, "ok": False, "error": denied,
+            }
+            continue
+
+        updated = dict(ticket)
+        for field in ("title", "description", "priority"):
+            value = getattr(item, field)
+            if value is not None:
+                updated[field] = value
+        if reassign:
+            updated["assigned_to"] = item.assigned_to
+        if status_change:
+            updated["status"] = item.status
+            moved.pop(item.id, None)
+            moved[item.id] = (ticket["project_id"], item.status)
+
+        current[item.id] = updated
+        pending.append(index)
+
+    if not pending or (all_or_nothing and results):
+        return bulk_response(results, pending)
+
+    for column in moved.values():
+        tails.reserve(*column)
+    ranks = tails.allocate()
+    for ticket_id, column in moved.items():
+        current[ticket_id]["rank"] = next(ranks[column])
+
+    changed = [
+        ticket_id for ticket_id in current
+        if current[ticket_id] != original[ticket_id]
+    ]
+    if changed:
+        # ORM bulk UPDATE by primary key: a single executemany
+        db.execute(
+            update(Ticket),
+            [
+                {
+                    key: value for key, value in current[ticket_id].items()
+                    if key not in ("project_id", "type", "is_deleted")
+                }
+                for ticket_id in changed
+            ],
+        )
+        apply_ticket_changes(
+            db, [(original[i], current[i]) for i in changed]
+        )
+        for ticket_id in changed:
+            bump_version(db, PROJECT, current[ticket_id]["project_id"])
+            publish_on_commit(
+                db, current[ticket_id]["project_id"], "ticket.updated",
+                ticket_data(current[ticket_id]),
+            )
+
+    for index in pending:
+        results[index] = {"index": index, "id": items[index].id, "ok": True}
+    return bulk_response(results, [])
+
+
+# Statements grow with the number of target columns, not of items
+@router.post("/bulk/update", response_model=BulkResult)
+@query_budget(max_repeats=None)
+def bulk_update_tickets(
+    batch: TicketBulkUpdate,
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    return apply_bulk_updates(db, current_user, batch.items, batch.all_or_nothing)
+
+
+# Statements grow with the number of target columns, not of items
+@router.post("/bulk/transition", response_model=BulkResult)
+@query_budget(max_repeats=None)
+def bulk_transition_tickets(
+    batch: TicketBulkTransition,
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    items = [
+        TicketBulkUpdateItem(id=item.id, status=item.status)
+        for item in batch.items
+    ]
+    return apply_bulk_updates(db, current_user, items, batch.all_or_nothing)
+
+
 # -----------------------------
 # List tickets by project
 # -----------------------------
-@router.get("/project/{project_id}", response_model=list[TicketOut])
+@router.get("/project/{project_id}", response_model=TicketPage)
+@query_budget(4)
 def list_tickets_by_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    return (
-        db.query(Ticket)
-        .filter(
+    version = check_not_modified(request, response, db, PROJECT, project_id)
+
+    def build():
+        # Board order within each column, the way moves leave it; rank
+        # rides along for the page cursor
+        query = db.query(*TICKET_COLUMNS, Ticket.rank).filter(
             Ticket.project_id == project_id,
             Ticket.is_deleted == False
         )
-        .all()
+
+        items, next_cursor = paginate(
+            query, [Ticket.rank, Ticket.id], limit, after
+        )
+        return {"items": items, "next_cursor": next_cursor}
+
+    return cached_response(
+        request, response, PROJECT, project_id, version, TicketPage, build,
+        trusted=True,
     )
 
 
 # -----------------------------
 # Search tickets
 # -----------------------------
-@router.get("/search", response_model=list[TicketOut])
+# Unfiltered searches scan every ticket: keep one client from hogging them
+@router.get("/search", response_model=TicketSearchPage)
+@query_budget(3)
+@rate_limit(5, 20)
 def search_tickets(
     status: str | None = None,
     priority: str | None = None,
     assignee: int | None = None,
     project_id: int | None = None,
     q: str | None = None,
-    db: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    query = db.query(Ticket)
+    match = None
+    if q is not None and search_index.FTS_ENABLED:
+        match = search_index.build_match_query(q)
+
+    if match is not None:
+        # Ranked full-text search: best bm25 score first
+        fts = table(search_index.FTS_TABLE, column("rowid"))
+        fts_ref = literal_column(search_index.FTS_TABLE)
+        rank = func.bm25(fts_ref).label("rank")
+        snippet = func.snippet(
+            fts_ref, -1, "<mark>", "</mark>", "…", 12
+        ).label("snippet")
+
+        query = (
+            db.query(*TICKET_COLUMNS, rank, snippet)
+            .join(fts, fts.c.rowid == Ticket.id)
+            .filter(fts_ref.op("MATCH")(match))
+        )
+        keys = [rank, Ticket.id]
+    else:
+        query = db.query(*TICKET_COLUMNS)
+        keys = [Ticket.id]
+
+    # The index keeps soft-deleted tickets; they must not come back in results
+    query = query.filter(Ticket.is_deleted == False)
 
     if project_id is not None:
         query = query.filter(Ticket.project_id == project_id)
@@ -109,23 +450,28 @@ def search_tickets(
     if assignee is not None:
         query = query.filter(Ticket.assigned_to == assignee)
 
-    if q is not None:
+    if q is not None and match is None:
         search = f"%{q}%"
         query = query.filter(
             (Ticket.title.ilike(search)) |
             (Ticket.description.ilike(search))
         )
 
-    return query.all()
+    items, next_cursor = paginate(query, keys, limit, after)
+    return json_response(
+        TicketSearchPage, {"items": items, "next_cursor": next_cursor},
+        trusted=True,
+    )
 
 
 # -----------------------------
 # Delete ticket (ADMIN ONLY)
 # -----------------------------
 @router.delete("/{ticket_id}")
+@query_budget(4)
 def soft_delete_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
@@ -136,8 +482,11 @@ def soft_delete_ticket(
     if role != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
 
+    before = ticket_state(ticket)
     ticket.is_deleted = True
-    db.commit()
+    apply_ticket_change(db, before, ticket_state(ticket))
+    bump_version(db, PROJECT, ticket.project_id)
+    publish_on_commit(db, ticket.project_id, "ticket.deleted", {"id": ticket.id})
 
     return {"message": "Ticket archived"}
 
@@ -146,10 +495,11 @@ def soft_delete_ticket(
 # Update ticket (RBAC enforced)
 # -----------------------------
 @router.put("/{ticket_id}", response_model=TicketOut)
+@query_budget(5)
 def update_ticket(
     ticket_id: int,
     data: TicketUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user),
 ):
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
@@ -158,46 +508,30 @@ def update_ticket(
 
     role = get_project_role(db, ticket.project_id, current_user.id)
 
-    if role is None:
-        raise HTTPException(
-            status_code=403,
-            detail="Not a project member",
-        )
-
-    # 🔒 Viewer cannot edit anything
-    if role == "viewer":
-        raise HTTPException(
-            status_code=403,
-            detail="Viewers cannot edit tickets",
-        )
-
-    # 🔒 Developer can edit ONLY assigned tickets
-    if role == "developer":
-        if ticket.assigned_to != current_user.id:
-            raise HTTPException(
-                status_code=403,
-                detail="Developers can only edit tickets assigned to them",
-            )
-
-    # 🔒 Admin-only reassignment
-    if (
-        data.assigned_to is not None
-        and data.assigned_to != ticket.assigned_to
-    ):
-        if role != "admin":
-            raise HTTPException(
-                status_code=403,
-                detail="Only admins can reassign tickets",
-            )
+    denied = update_denied_reason(
+        role,
+        ticket.assigned_to,
+        current_user.id,
+        reassign=(
+            data.assigned_to is not None
+            and data.assigned_to != ticket.assigned_to
+        ),
+    )
+    if denied:
+        raise HTTPException(status_code=403, detail=denied)
 
     # --- perform update ---
+    before = ticket_state(ticket)
+
     if data.title is not None:
         ticket.title = data.title
 
     if data.description is not None:
         ticket.description = data.description
 
-    if data.status is not None:
+    if data.status is not None and data.status != ticket.status:
+        # Enter the new column at the bottom
+        ticket.rank = append_rank(db, ticket.project_id, data.status)
         ticket.status = data.status
 
     if data.priority is not None:
@@ -206,7 +540,8 @@ def update_ticket(
     if data.assigned_to != ticket.assigned_to:
         ticket.assigned_to = data.assigned_to
 
-    db.commit()
-    db.refresh(ticket)
+    apply_ticket_change(db, before, ticket_state(ticket))
+    bump_version(db, PROJECT, ticket.project_id)
+    publish_on_commit(db, ticket.project_id, "ticket.updated", ticket_data(ticket))
 
     return ticket
@@ -0,0 +1,297 @@
+"""
+Generate a synthetic FixHub dataset for load tests.
+
+Builds a fresh SQLite database with ``--users`` users, ``--projects``
+projects (each with a few members), ``--tickets`` tickets spread over them
+and their workflow columns, ``--comments`` comments and ``--attachments``
+attachment rows referencing a handful of small blobs. The same ``--seed``
+always produces the same rows, so runs against it are comparable.
+
+Rows go in through chunked executemany inserts with the search index
+created afterwards, which is much faster than replaying the API. Kanban
+ranks and ticket counters are filled in the way the migrations would.
+
+    cd backend
+    python -m benchmarks.datagen --db /tmp/bench.db --projects 1000 --tickets 500000
+
+Every user can log in as ``user<N>@bench.fixhub.dev`` with the password
+``bench``. A manifest describing the dataset is written next to the
+database (``<db>.json``) for benchmarks.workload to pick up.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+PASSWORD = "bench"
+EMAIL = "user{}@bench.fixhub.dev"
+CHUNK_ROWS = 10_000
+
+TYPES = ["bug", "task", "feature"]
+PRIORITIES = ["low", "medium", "high"]
+MEMBER_ROLES = ["developer", "developer", "developer", "viewer"]
+STATUS_WEIGHTS = {"todo": 5, "in_progress": 2, "done": 3}
+WORDS = (
+    "login crash timeout export report search filter upload dashboard "
+    "kanban sync invoice mobile layout email notification cache api "
+    "permission token database query render button modal chart webhook"
+).split()
+
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def insert_chunks(conn, table, rows):
+    # ``rows`` may be a generator; only CHUNK_ROWS dicts are held at a time
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_ROWS:
+            conn.execute(table.insert(), chunk)
+            chunk = []
+    if chunk:
+        conn.execute(table.insert(), chunk)
+
+
+def generate(args) -> dict:
+    from sqlalchemy import text
+
+    from app.core.config import BCRYPT_ROUNDS
+    from app.core.ranking import spread_keys
+    from app.core.search import init_search
+    from app.core.security import pwd_context
+    from app.core.storage import LocalStorage
+    from app.core.workflow import WORKFLOW_STATES
+    from app.database.db import engine
+    from app.database.migrations import init_db, rebuild_ticket_counters
+    from app.models import (
+        Attachment, Blob, Comment, Project, ProjectMember, Ticket, User,
+    )
+
+    rng = random.Random(args.seed)
+    epoch = datetime(2024, 1, 1)
+    timings = {}
+
+    started = time.perf_counter()
+    init_db(engine)
+
+    with engine.begin() as conn:
+        # One hash for everybody: bcrypt would otherwise dominate the load
+        hashed = pwd_context.hash(PASSWORD)
+        insert_chunks(conn, User.__table__, (
+            {
+                "id": i,
+                "email": EMAIL.format(i),
+                "hashed_password": hashed,
+                "role": "developer",
+            }
+            for i in range(1, args.users + 1)
+        ))
+
+        owners = [rng.randint(1, args.users) for _ in range(args.projects)]
+        insert_chunks(conn, Project.__table__, (
+            {
+                "id": p,
+                "name": f"Project {p}",
+                "description": sentence(rng, 4, 12),
+                "owner_id": owners[p - 1],
+            }
+            for p in range(1, args.projects + 1)
+        ))
+
+        # The owner is admin; the others are drawn without repeats
+        members: dict[int, list[int]] = {}
+        rows = []
+        for p in range(1, args.projects + 1):
+            owner = owners[p - 1]
+            others = rng.sample(
+                range(1, args.users + 1), min(args.members, args.users)
+            )
+            members[p] = [owner] + [u for u in others if u != owner]
+            rows.append({"project_id": p, "user_id": owner, "role": "admin"})
+            rows.extend(
+                {"project_id": p, "user_id": u, "role": rng.choice(MEMBER_ROLES)}
+                for u in members[p][1:]
+            )
+        insert_chunks(conn, ProjectMember.__table__, rows)
+    timings["users_projects"] = time.perf_counter() - started
+
+    # Tickets: project sizes are skewed (a few big boards, many small ones)
+    started = time.perf_counter()
+    weights = [1 / (p ** 0.8) for p in range(1, args.projects + 1)]
+    project_of = sorted(
+        rng.choices(range(1, args.projects + 1), weights, k=args.tickets)
+    )
+    statuses = rng.choices(
+        WORKFLOW_STATES, [STATUS_WEIGHTS.get(s, 1) for s in WORKFLOW_STATES],
+        k=args.tickets,
+    )
+
+    columns: dict[tuple[int, str], list[int]] = {}
+    for ticket_id, (p, status) in enumerate(zip(project_of, statuses), start=1):
+        columns.setdefault((p, status), []).append(ticket_id)
+    ranks: dict[int, str] = {}
+    for ids in columns.values():
+        ranks.update(zip(ids, spread_keys(len(ids))))
+
+    def ticket_rows():
+        for ticket_id, (p, status) in enumerate(zip(project_of, statuses), start=1):
+            assignee = rng.choice(members[p]) if rng.random() < 0.7 else None
+            yield {
+                "id": ticket_id,
+                "title": sentence(rng, 3, 8).capitalize(),
+                "description": sentence(rng, 10, 40),
+                "type": rng.choice(TYPES),
+                "status": status,
+                "priority": rng.choice(PRIORITIES),
+                "position": 0,
+                "rank": ranks[ticket_id],
+                "project_id": p,
+                "assigned_to": assignee,
+                "is_deleted": rng.random() < 0.02,
+            }
+
+    with engine.begin() as conn:
+        insert_chunks(conn, Ticket.__table__, ticket_rows())
+    timings["tickets"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+
+    def comment_rows():
+        for i in range(1, args.comments + 1):
+            ticket_id = rng.randint(1, args.tickets)
+            author = rng.choice(members[project_of[ticket_id - 1]])
+            yield {
+                "id": i,
+                "content": sentence(rng, 5, 30),
+                "created_at": epoch + timedelta(minutes=i),
+                "ticket_id": ticket_id,
+                "user_id": author,
+                "author_email": EMAIL.format(author),
+                "author_role": "developer",
+                "is_deleted": rng.random() < 0.01,
+            }
+
+    with engine.begin() as conn:
+        insert_chunks(conn, Comment.__table__, comment_rows())
+    timings["comments"] = time.perf_counter() - started
+
+    # Attachments share a few small blobs, with refcounts to match
+    started = time.perf_counter()
+    storage = LocalStorage(args.attachment_dir)
+    blobs = []
+    for i in range(args.blobs if args.attachments else 0):
+        body = rng.randbytes(args.blob_size)
+        digest = hashlib.sha256(body).hexdigest()
+        with tempfile.NamedTemporaryFile(
+            dir=storage.staging_dir(), delete=False
+        ) as f:
+            f.write(body)
+        storage.put_file(digest, f.name)
+        blobs.append(digest)
+
+    refcounts = dict.fromkeys(blobs, 0)
+
+    def attachment_rows():
+        for i in range(1, args.attachments + 1):
+            ticket_id = rng.randint(1, args.tickets)
+            digest = rng.choice(blobs)
+            refcounts[digest] += 1
+            yield {
+                "id": i,
+                "filename": f"file{i}.bin",
+                "file_path": digest,
+                "uploaded_at": epoch + timedelta(minutes=i),
+                "blob_digest": digest,
+                "size": args.blob_size,
+                "content_type": "application/octet-stream",
+                "ticket_id": ticket_id,
+                "uploaded_by": rng.choice(members[project_of[ticket_id - 1]]),
+            }
+
+    with engine.begin() as conn:
+        insert_chunks(conn, Attachment.__table__, attachment_rows())
+        insert_chunks(conn, Blob.__table__, (
+            {"digest": d, "size": args.blob_size, "refcount": n}
+            for d, n in refcounts.items() if n
+        ))
+    timings["attachments"] = time.perf_counter() - started
+
+    # Derived data, built once over the whole dataset
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rebuild_ticket_counters(conn)
+    init_search(engine)
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+    timings["derived"] = time.perf_counter() - started
+
+    return {
+        "seed": args.seed,
+        "database": os.path.abspath(args.db),
+        "attachment_dir": os.path.abspath(args.attachment_dir),
+        "password": PASSWORD,
+        "email": EMAIL,
+        "bcrypt_rounds": BCRYPT_ROUNDS,
+        "counts": {
+            "users": args.users,
+            "projects": args.projects,
+            "memberships": sum(len(m) for m in members.values()),
+            "tickets": args.tickets,
+            "comments": args.comments,
+            "attachments": args.attachments,
+            "blobs": sum(1 for n in refcounts.values() if n),
+        },
+        "seconds": {name: round(value, 2) for name, value in timings.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--attachment-dir", default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--members", type=int, default=8,
+                        help="members per project besides the owner")
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--attachments", type=int, default=5_000)
+    parser.add_argument("--blobs", type=int, default=20)
+    parser.add_argument("--blob-size", type=int, default=16 * 1024)
+    parser.add_argument("--force", action="store_true",
+                        help="replace an existing database")
+    args = parser.parse_args()
+
+    if args.users < 1 or args.projects < 1 or args.tickets < 1:
+        parser.error("--users, --projects and --tickets must be positive")
+    if args.attachments and args.blobs < 1:
+        parser.error("--attachments needs at least one blob")
+
+    if os.path.exists(args.db):
+        if not args.force:
+            parser.error(f"{args.db} exists (use --force to replace it)")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+
+    args.attachment_dir = args.attachment_dir or args.db + ".uploads"
+
+    # Must be set before the app modules read their configuration
+    os.environ["FIXHUB_DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ["FIXHUB_ATTACHMENT_DIR"] = os.path.abspath(args.attachment_dir)
+
+    manifest = generate(args)
+    with open(args.db + ".json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
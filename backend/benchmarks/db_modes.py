@@ -0,0 +1,149 @@
+"""
+Compare the sync (threadpool) and async (aiosqlite) database modes.
+
+Each mode runs in its own subprocess against a fresh SQLite database in a
+temporary directory, seeded with one project and ``--tickets`` tickets.
+``--concurrency`` clients then issue ``--requests`` GETs in total across
+the kanban board, ticket list and dashboard, in-process through
+httpx.ASGITransport.
+
+    cd backend
+    python -m benchmarks.db_modes --concurrency 200 --requests 4000
+
+Requires httpx (not an application dependency).
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.report import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def run_worker(args) -> dict:
+    import httpx
+
+    from app.main import create_app
+
+    app = create_app()
+    # Unhandled app errors (e.g. pool timeouts) count as failed requests.
+    # ASGITransport sends no lifespan events, so run the lifespan here.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        credentials = {"email": "bench@fixhub.dev", "password": "bench"}
+        await client.post("/auth/register", json=credentials)
+        login = await client.post("/auth/login", json=credentials)
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        project = await client.post(
+            "/projects/", json={"name": "bench"}, headers=headers
+        )
+        project_id = project.json()["id"]
+
+        for i in range(args.tickets):
+            await client.post(
+                "/tickets/",
+                json={
+                    "title": f"Ticket {i}",
+                    "description": "benchmark ticket",
+                    "type": "bug",
+                    "project_id": project_id,
+                },
+                headers=headers,
+            )
+
+        paths = [
+            f"/kanban/project/{project_id}",
+            f"/tickets/project/{project_id}",
+            f"/dashboard/project/{project_id}",
+        ]
+        latencies: list[float] = []
+        errors = 0
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(paths[i % len(paths)])
+
+        async def client_loop():
+            nonlocal errors
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(client_loop() for _ in range(args.concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "mode": "async" if os.environ.get("FIXHUB_ASYNC_DB") == "1" else "sync",
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+def run_mode(mode: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ)
+        env["FIXHUB_ASYNC_DB"] = "1" if mode == "async" else "0"
+        env["PYTHONPATH"] = BACKEND_DIR
+        # One user drives every request: measure the database, not the rate limits
+        env.setdefault("FIXHUB_ADMISSION", "0")
+        result = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.db_modes", "--worker",
+                "--tickets", str(args.tickets),
+                "--requests", str(args.requests),
+                "--concurrency", str(args.concurrency),
+            ],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker(args))))
+        return
+
+    results = [run_mode(mode, args) for mode in args.modes.split(",")]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
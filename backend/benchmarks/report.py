@@ -0,0 +1,186 @@
+"""
+Summarize and compare benchmark results.
+
+benchmarks.workload writes one JSON report per run: latency percentiles
+and throughput for every endpoint, plus what the run was measured on (git
+commit, Python and SQLite versions, dataset manifest, FIXHUB_* settings).
+``compare`` lines two reports up endpoint by endpoint and exits non-zero
+when a metric got worse by more than ``--threshold``, so it can gate CI.
+
+    cd backend
+    python -m benchmarks.report show new.json
+    python -m benchmarks.report compare base.json new.json --threshold 0.10
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics where a lower value is better; throughput is the exception
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict:
+    # ``latencies`` in seconds; every request counts, failed or not
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {
+            name: value for name, value in sorted(os.environ.items())
+            if name.startswith("FIXHUB_")
+        },
+    }
+
+
+# -----------------------------
+# Comparing two runs
+# -----------------------------
+def change(base: float, new: float) -> float:
+    return (new - base) / base if base else 0.0
+
+
+def compare(base: dict, new: dict, threshold: float) -> list[dict]:
+    """
+    One row per endpoint and metric present in both reports. A row is a
+    regression when latency grew, or throughput shrank, by more than
+    ``threshold`` (a fraction), or when the endpoint started failing.
+    """
+    rows = []
+    for endpoint, new_stats in new["endpoints"].items():
+        base_stats = base["endpoints"].get(endpoint)
+        if base_stats is None or not base_stats.get("requests"):
+            continue
+
+        for metric in LATENCY_METRICS + ("throughput_rps",):
+            if metric not in base_stats or metric not in new_stats:
+                continue
+            delta = change(base_stats[metric], new_stats[metric])
+            worse = -delta if metric == "throughput_rps" else delta
+            rows.append({
+                "endpoint": endpoint,
+                "metric": metric,
+                "base": base_stats[metric],
+                "new": new_stats[metric],
+                "change": round(delta, 4),
+                "regression": worse > threshold,
+            })
+
+        if new_stats.get("errors", 0) > base_stats.get("errors", 0):
+            rows.append({
+                "endpoint": endpoint,
+                "metric": "errors",
+                "base": base_stats.get("errors", 0),
+                "new": new_stats["errors"],
+                "change": None,
+                "regression": True,
+            })
+    return rows
+
+
+def print_table(rows: list[list], out=sys.stdout):
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print(
+            "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)),
+            file=out,
+        )
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    show = commands.add_parser("show", help="print a report as a table")
+    show.add_argument("report")
+
+    diff = commands.add_parser("compare", help="compare two reports")
+    diff.add_argument("base")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=0.10,
+                      help="allowed relative slowdown (default 0.10)")
+    diff.add_argument("--json", action="store_true",
+                      help="print the comparison as JSON")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        report = load(args.report)
+        rows = [["endpoint", "requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms"]]
+        for endpoint, stats in {**report["endpoints"], "total": report["total"]}.items():
+            rows.append([
+                endpoint, stats["requests"], stats["errors"],
+                stats.get("throughput_rps", "-"), stats.get("p50_ms", "-"),
+                stats.get("p95_ms", "-"), stats.get("p99_ms", "-"),
+            ])
+        print_table(rows)
+        return
+
+    base, new = load(args.base), load(args.new)
+    if base.get("run") != new.get("run"):
+        print("warning: the runs used different workload settings", file=sys.stderr)
+    if base.get("dataset", {}).get("counts") != new.get("dataset", {}).get("counts"):
+        print("warning: the runs used different datasets", file=sys.stderr)
+
+    rows = compare(base, new, args.threshold)
+    regressions = [row for row in rows if row["regression"]]
+
+    if args.json:
+        print(json.dumps({"threshold": args.threshold, "rows": rows}, indent=2))
+    else:
+        table = [["endpoint", "metric", "base", "new", "change", ""]]
+        for row in rows:
+            table.append([
+                row["endpoint"], row["metric"], row["base"], row["new"],
+                "-" if row["change"] is None else f"{row['change']:+.1%}",
+                "REGRESSION" if row["regression"] else "",
+            ])
+        print_table(table)
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Compare the ways a large list response can be turned into JSON bytes.
+
+Builds an in-memory SQLite database with ``--rows`` tickets and comments,
+reads them the way the routes do (the ticket list, a kanban board and a
+comment page) and times each serialization path on the same rows:
+
+    fastapi    validate, dump to Python, json.dumps (plain response_model)
+    validated  TypeAdapter validate + dump_json (response_cache.serialize)
+    trusted    pick the model's fields and encode (dump_trusted)
+
+Every path must produce the same JSON; the run stops if one differs.
+
+    cd backend
+    python -m benchmarks.serialization --rows 5000 --repeat 50
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.report import environment
+
+
+def load(engine, rows: int):
+    from app.core.workflow import WORKFLOW_STATES
+    from app.models import Comment, Project, Ticket, User
+
+    epoch = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": 1, "email": "bench@fixhub.dev", "hashed_password": "-", "role": "developer"}
+        ])
+        conn.execute(Project.__table__.insert(), [
+            {"id": 1, "name": "bench", "description": "benchmark", "owner_id": 1}
+        ])
+        conn.execute(Ticket.__table__.insert(), [
+            {
+                "id": i,
+                "title": f"Ticket {i} – résumé export",
+                "description": None if i % 3 == 0 else "benchmark ticket " * 4,
+                "type": "bug",
+                "status": WORKFLOW_STATES[i % len(WORKFLOW_STATES)],
+                "priority": "medium",
+                "position": i,
+                "rank": f"a{i:08d}",
+                "project_id": 1,
+                "assigned_to": 1 if i % 2 else None,
+                "is_deleted": False,
+            }
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(Comment.__table__.insert(), [
+            {
+                "id": i,
+                "content": "comment text " * 8,
+                "created_at": epoch + timedelta(seconds=i, microseconds=i),
+                "ticket_id": 1,
+                "user_id": 1,
+                "author_email": "bench@fixhub.dev",
+                "author_role": "developer",
+                "is_deleted": False,
+            }
+            for i in range(1, rows + 1)
+        ])
+
+
+def payloads(session, rows: int) -> dict:
+    from app.comments.routes import COMMENT_COLUMNS
+    from app.kanban.routes import build_board
+    from app.models import Ticket
+    from app.schemas.comment import CommentPage
+    from app.schemas.kanban import KanbanBoard
+    from app.schemas.ticket import TicketPage
+    from app.tickets.routes import TICKET_COLUMNS
+
+    tickets = session.query(*TICKET_COLUMNS, Ticket.rank).all()
+    comments = session.query(*COMMENT_COLUMNS).all()
+    return {
+        "tickets": (TicketPage, {"items": tickets, "next_cursor": None}),
+        "board": (KanbanBoard, build_board(session, 1, rows)),
+        "comments": (CommentPage, {
+            "total": len(comments), "items": comments,
+            "next_cursor": None, "prev_cursor": None,
+        }),
+    }
+
+
+def paths() -> dict:
+    from fastapi.encoders import jsonable_encoder
+
+    from app.core.response_cache import _adapter, dump_trusted
+
+    def fastapi_path(model, content):
+        adapter = _adapter(model)
+        value = adapter.validate_python(content, from_attributes=True)
+        return json.dumps(
+            jsonable_encoder(adapter.dump_python(value, mode="json")),
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode()
+
+    def validated(model, content):
+        adapter = _adapter(model)
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+    return {"fastapi": fastapi_path, "validated": validated, "trusted": dump_trusted}
+
+
+def measure(func, model, content, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(model, content)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+
+    from app.core import response_cache
+    from app.database.migrations import init_db
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    init_db(engine)
+    load(engine, args.rows)
+
+    results = {}
+    with Session(engine) as session:
+        for name, (model, content) in payloads(session, args.rows).items():
+            bodies = {path: func(model, content) for path, func in paths().items()}
+            expected = json.loads(bodies["fastapi"])
+            for path, body in bodies.items():
+                if json.loads(body) != expected:
+                    raise SystemExit(f"{name}: the {path} path produced different JSON")
+
+            base = None
+            results[name] = {"bytes": len(bodies["fastapi"])}
+            for path, func in paths().items():
+                median = statistics.median(measure(func, model, content, args.repeat))
+                base = base or median
+                results[name][path] = {
+                    "median_ms": round(median * 1000, 3),
+                    "speedup": round(base / median, 2),
+                }
+
+    print(json.dumps({
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "encoder": "orjson" if response_cache.orjson is not None else "pydantic-core",
+        "environment": environment(),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
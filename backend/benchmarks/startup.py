@@ -0,0 +1,116 @@
+"""
+Measure application cold start.
+
+Each of ``--runs`` fresh interpreters imports app.main, builds the app
+with create_app() and runs its lifespan against one temporary SQLite
+database, under ``python -X importtime``. The first run creates the
+schema; the others find it current, as every worker but the first does.
+Reported per run: wall time of the whole process, the app's own startup
+report (router imports and lifespan phases) and the modules that took
+longest to import.
+
+    cd backend
+    python -m benchmarks.startup --runs 5 --budget-ms 1500
+
+Exits non-zero when the median warm start exceeds ``--budget-ms``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def run_worker() -> dict:
+    from app.main import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        pass
+    return app.state.startup.as_dict()
+
+
+def parse_importtime(stderr: str, top: int) -> dict:
+    # "import time: self [us] | cumulative | imported package", indented by depth
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    # Depth-0 entries are what the process imported directly; their
+    # cumulative times add up to the whole import cost
+    direct = [m for m in modules if not m[0].startswith("  ")]
+    return {
+        "total_ms": round(sum(m[2] for m in direct) / 1000, 1),
+        "slowest_cumulative_ms": {
+            name.strip(): round(cumulative / 1000, 1)
+            for name, _, cumulative in sorted(direct, key=lambda m: m[2], reverse=True)[:top]
+        },
+        "slowest_self_ms": {
+            name.strip(): round(self_us / 1000, 1)
+            for name, self_us, _ in sorted(modules, key=lambda m: m[1], reverse=True)[:top]
+        },
+    }
+
+
+def run_once(database: str, top: int) -> dict:
+    env = {
+        **os.environ,
+        "FIXHUB_DATABASE_URL": f"sqlite:///{database}",
+        "PYTHONPATH": BACKEND_DIR,
+    }
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--worker"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr[-2000:])
+
+    return {
+        "wall_ms": round(wall * 1000, 1),
+        "app": json.loads(proc.stdout.strip().splitlines()[-1]),
+        "imports": parse_importtime(proc.stderr, top),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10,
+                        help="slowest modules to list per run")
+    parser.add_argument("--budget-ms", type=float, default=0,
+                        help="fail when the median warm wall time exceeds this")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker())))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "startup.db")
+        runs = [run_once(database, args.top) for _ in range(max(2, args.runs))]
+
+    warm = statistics.median(run["wall_ms"] for run in runs[1:])
+    print(json.dumps({
+        "cold_schema_wall_ms": runs[0]["wall_ms"],
+        "warm_median_wall_ms": warm,
+        "budget_ms": args.budget_ms or None,
+        "runs": runs,
+    }, indent=2))
+
+    sys.exit(1 if args.budget_ms and warm > args.budget_ms else 0)
+
+
+if __name__ == "__main__":
+    main()
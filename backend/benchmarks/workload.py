@@ -0,0 +1,403 @@
+"""
+Replay a mixed FixHub workload against a dataset from benchmarks.datagen.
+
+``--clients`` virtual users each log in, list their projects, open one and
+then pick operations from a weighted mix: board loads, ticket lists,
+dashboards, searches, comment threads, kanban moves, comment posts and
+fresh logins, now and then switching to another of their projects. Every
+choice comes from ``--seed``, so two runs against the same dataset issue
+the same kind of traffic. The first ``--warmup`` requests are not
+measured; the next ``--requests`` are, and the run stops there.
+
+With ``--transport asgi`` (the default) the app runs in this process
+through httpx.ASGITransport, on a copy of the dataset so writes never
+leak into the next run. With ``--transport http`` requests go to a
+running server at ``--url``, which must already serve the dataset.
+Logins rehash the shared password unless FIXHUB_BCRYPT_ROUNDS matches
+the ``bcrypt_rounds`` recorded in the dataset manifest.
+
+    cd backend
+    python -m benchmarks.datagen --db /tmp/bench.db
+    python -m benchmarks.workload --db /tmp/bench.db --clients 50 --out new.json
+    python -m benchmarks.report compare base.json new.json
+
+Requires httpx (not an application dependency).
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.report import environment, summarize
+
+DEFAULT_MIX = (
+    "board=25,tickets=10,dashboard=10,search=15,comments=15,"
+    "move=10,comment=8,login=2,switch=5"
+)
+SEARCH_TERMS = ["login", "crash timeout", "export", "kanban", "cache api", "email"]
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = int(weight)
+    unknown = [name for name in mix if not hasattr(VirtualUser, f"op_{name}")]
+    if unknown:
+        raise ValueError(f"unknown operations: {', '.join(unknown)}")
+    return mix
+
+
+class Recorder:
+    """
+    Hands out request slots and collects latencies per endpoint. Slots
+    below ``warmup`` run but are not measured; the run ends once
+    ``warmup + requests`` slots were handed out.
+    """
+
+    def __init__(self, warmup: int, requests: int):
+        self.warmup = warmup
+        self.limit = warmup + requests
+        self.issued = 0
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[str, dict[str, int]] = {}
+
+    def take(self) -> int | None:
+        if self.issued >= self.limit:
+            return None
+        slot = self.issued
+        self.issued += 1
+        if slot == self.warmup:
+            self.started = time.perf_counter()
+        return slot
+
+    def record(self, slot: int, endpoint: str, status: str, latency: float):
+        if slot < self.warmup:
+            return
+        self.finished = time.perf_counter()
+        self.latencies.setdefault(endpoint, []).append(latency)
+        counts = self.statuses.setdefault(endpoint, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    def report(self) -> tuple[float, dict, dict]:
+        seconds = (self.finished or 0) - (self.started or 0)
+        endpoints = {}
+        every, failed = [], 0
+        for endpoint in sorted(self.latencies):
+            statuses = self.statuses[endpoint]
+            errors = sum(n for status, n in statuses.items() if not ok(status))
+            endpoints[endpoint] = {
+                **summarize(self.latencies[endpoint], errors, seconds),
+                "statuses": statuses,
+            }
+            every += self.latencies[endpoint]
+            failed += errors
+        return seconds, summarize(every, failed, seconds), endpoints
+
+
+def ok(status: str) -> bool:
+    return status in ("200", "304")
+
+
+class StopRun(Exception):
+    pass
+
+
+class VirtualUser:
+    def __init__(self, client, recorder: Recorder, rng: random.Random, args, manifest):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.args = args
+        self.manifest = manifest
+        self.headers: dict[str, str] = {}
+        self.etags: dict[str, str] = {}
+        self.email = ""
+        self.projects: list[int] = []
+        self.project_id: int | None = None
+        self.role: str | None = None
+        # Ticket ids per column of each board seen, kept across 304s
+        self.boards: dict[int, dict[str, list[int]]] = {}
+
+    @property
+    def board(self) -> dict[str, list[int]]:
+        return self.boards.get(self.project_id, {})
+
+    async def request(self, method: str, endpoint: str, url: str, **kwargs):
+        slot = self.recorder.take()
+        if slot is None:
+            raise StopRun
+
+        headers = dict(self.headers)
+        if method == "GET" and self.args.conditional and url in self.etags:
+            headers["If-None-Match"] = self.etags[url]
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except Exception as e:
+            self.recorder.record(
+                slot, endpoint, type(e).__name__, time.perf_counter() - started
+            )
+            return None
+        self.recorder.record(
+            slot, endpoint, str(response.status_code), time.perf_counter() - started
+        )
+
+        if method == "GET" and "etag" in response.headers:
+            self.etags[url] = response.headers["etag"]
+        return response
+
+    # -----------------------------
+    # Session setup
+    # -----------------------------
+    async def login(self):
+        response = await self.request(
+            "POST", "POST /auth/login", "/auth/login",
+            json={"email": self.email, "password": self.manifest["password"]},
+        )
+        if response is not None and response.status_code == 200:
+            self.headers = {
+                "Authorization": f"Bearer {response.json()['access_token']}"
+            }
+
+    async def start(self):
+        # Users without any project have nothing to do; try someone else
+        for _ in range(10):
+            user = self.rng.randint(1, self.manifest["counts"]["users"])
+            self.email = self.manifest["email"].format(user)
+            await self.login()
+            response = await self.request("GET", "GET /projects/", "/projects/")
+            if response is not None and response.status_code == 200:
+                self.projects = [project["id"] for project in response.json()]
+            if self.projects:
+                await self.switch()
+                return
+        raise StopRun
+
+    async def switch(self):
+        self.project_id = self.rng.choice(self.projects)
+        response = await self.request(
+            "GET", "GET /projects/{project_id}/my-role",
+            f"/projects/{self.project_id}/my-role",
+        )
+        self.role = None
+        if response is not None and response.status_code == 200:
+            self.role = response.json().get("role")
+        await self.load_board()
+
+    # -----------------------------
+    # Operations
+    # -----------------------------
+    async def load_board(self):
+        url = f"/kanban/project/{self.project_id}"
+        response = await self.request("GET", "GET /kanban/project/{project_id}", url)
+        if response is not None and response.status_code == 200:
+            self.boards[self.project_id] = {
+                column["status"]: [ticket["id"] for ticket in column["items"]]
+                for column in response.json()["columns"]
+            }
+
+    def any_ticket(self) -> int | None:
+        tickets = [t for column in self.board.values() for t in column]
+        return self.rng.choice(tickets) if tickets else None
+
+    async def op_board(self):
+        await self.load_board()
+
+    async def op_tickets(self):
+        await self.request(
+            "GET", "GET /tickets/project/{project_id}",
+            f"/tickets/project/{self.project_id}",
+        )
+
+    async def op_dashboard(self):
+        await self.request(
+            "GET", "GET /dashboard/project/{project_id}",
+            f"/dashboard/project/{self.project_id}",
+        )
+
+    async def op_search(self):
+        await self.request(
+            "GET", "GET /tickets/search", "/tickets/search",
+            params={"project_id": self.project_id, "q": self.rng.choice(SEARCH_TERMS)},
+        )
+
+    async def op_comments(self):
+        ticket_id = self.any_ticket()
+        if ticket_id is not None:
+            await self.request(
+                "GET", "GET /comments/ticket/{ticket_id}",
+                f"/comments/ticket/{ticket_id}",
+            )
+
+    async def op_comment(self):
+        ticket_id = self.any_ticket()
+        if ticket_id is not None:
+            await self.request(
+                "POST", "POST /comments/", "/comments/",
+                json={"ticket_id": ticket_id, "content": "benchmark comment"},
+            )
+
+    async def op_move(self):
+        from app.core.workflow import ALLOWED_TRANSITIONS
+
+        # Viewers cannot move tickets; they look at the board instead
+        candidates = [status for status, ids in self.board.items() if ids]
+        if self.role in (None, "viewer") or not candidates:
+            return await self.op_board()
+
+        status = self.rng.choice(candidates)
+        ticket_id = self.rng.choice(self.board[status])
+        new_status = self.rng.choice(ALLOWED_TRANSITIONS[status])
+        response = await self.request(
+            "POST", "POST /kanban/move", "/kanban/move",
+            json={"ticket_id": ticket_id, "new_status": new_status},
+        )
+        if response is not None and response.status_code == 200:
+            self.board[status].remove(ticket_id)
+            self.board.setdefault(new_status, []).append(ticket_id)
+
+    async def op_login(self):
+        await self.login()
+
+    async def op_switch(self):
+        await self.switch()
+
+    async def run(self, mix: dict[str, int]):
+        names, weights = list(mix), list(mix.values())
+        try:
+            await self.start()
+            while True:
+                name = self.rng.choices(names, weights)[0]
+                await getattr(self, f"op_{name}")()
+        except StopRun:
+            pass
+
+
+# -----------------------------
+# Running
+# -----------------------------
+def copy_database(source: str, target: str):
+    # The backup API gives a consistent copy even of a WAL database
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+async def run(args, manifest: dict) -> dict:
+    import httpx
+
+    lifespan = contextlib.nullcontext()
+    if args.transport == "asgi":
+        from app.main import create_app
+
+        app = create_app()
+        # Unhandled app errors (e.g. pool timeouts) count as failed requests.
+        # ASGITransport sends no lifespan events, so run the lifespan here.
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+        lifespan = app.router.lifespan_context(app)
+    else:
+        client = httpx.AsyncClient(
+            base_url=args.url,
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=args.clients),
+        )
+
+    recorder = Recorder(args.warmup, args.requests)
+    mix = parse_mix(args.mix)
+    async with lifespan, client:
+        users = [
+            VirtualUser(client, recorder, random.Random(f"{args.seed}:{i}"), args, manifest)
+            for i in range(args.clients)
+        ]
+        await asyncio.gather(*(user.run(mix) for user in users))
+
+    seconds, total, endpoints = recorder.report()
+    return {
+        "run": {
+            "transport": args.transport,
+            "url": args.url if args.transport == "http" else None,
+            "clients": args.clients,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "mix": mix,
+            "conditional": args.conditional,
+        },
+        "environment": environment(),
+        "dataset": manifest,
+        "seconds": round(seconds, 3),
+        "total": total,
+        "endpoints": endpoints,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default="bench.db",
+                        help="dataset from benchmarks.datagen")
+    parser.add_argument("--manifest", default=None,
+                        help="dataset manifest (default: <db>.json)")
+    parser.add_argument("--transport", choices=["asgi", "http"], default="asgi")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--conditional", action="store_true",
+                        help="revalidate GETs with If-None-Match, like a browser")
+    parser.add_argument("--in-place", action="store_true",
+                        help="with asgi, write to the dataset instead of a copy")
+    parser.add_argument("--out", default=None, help="write the report here")
+    args = parser.parse_args()
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(f"--mix: {e}")
+
+    with open(args.manifest or args.db + ".json") as f:
+        manifest = json.load(f)
+
+    workdir = None
+    if args.transport == "asgi":
+        database = os.path.abspath(args.db)
+        if not args.in_place:
+            workdir = tempfile.mkdtemp(prefix="fixhub-bench-")
+            database = os.path.join(workdir, "bench.db")
+            copy_database(args.db, database)
+
+        # Must be set before the app modules read their configuration
+        os.environ["FIXHUB_DATABASE_URL"] = f"sqlite:///{database}"
+        os.environ.setdefault("FIXHUB_ATTACHMENT_DIR", manifest["attachment_dir"])
+        # Every virtual user shares one client address, which the login
+        # rate limit is keyed by; set FIXHUB_ADMISSION=1 to measure it anyway
+        os.environ.setdefault("FIXHUB_ADMISSION", "0")
+
+    try:
+        report = asyncio.run(run(args, manifest))
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Runs the app in process against a throwaway SQLite database, with query
+budgets in raise mode: any route that runs more statements than its
+@query_budget allows fails the test that called it.
+
+    cd backend
+    python -m pytest -q
+
+Settings come from FIXHUB_* variables read at import, so they are set
+here before the app is imported. Set FIXHUB_ASYNC_DB=1 to run the same
+tests against the async handlers.
+"""
+import itertools
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="fixhub-tests-")
+os.environ.setdefault("FIXHUB_DATABASE_URL", f"sqlite:///{_tmp}/fixhub.db")
+os.environ.setdefault("FIXHUB_ATTACHMENT_DIR", f"{_tmp}/uploads")
+os.environ.setdefault("FIXHUB_QUERY_BUDGET", "raise")
+os.environ.setdefault("FIXHUB_PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("FIXHUB_BCRYPT_ROUNDS", "4")
+os.environ.setdefault("FIXHUB_RESPONSE_CACHE", "memory")
+# Admission is tested on its own; the suite itself would trip the limits
+os.environ.setdefault("FIXHUB_ADMISSION", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.main import create_app
+
+    return create_app()
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    with TestClient(app) as client:
+        yield client
+
+
+def login(client, email: str, password: str = "secret-pw") -> dict:
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def make_user(client):
+    # New user each call: returns (email, auth headers)
+    def make(password: str = "secret-pw"):
+        email = f"user{next(_ids)}@fixhub.dev"
+        response = client.post(
+            "/auth/register", json={"email": email, "password": password}
+        )
+        assert response.status_code == 200, response.text
+        return email, login(client, email, password)
+
+    return make
+
+
+@pytest.fixture
+def make_project(client):
+    def make(headers: dict, name: str = "Project") -> int:
+        response = client.post("/projects/", json={"name": name}, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    return make
+
+
+@pytest.fixture
+def make_ticket(client):
+    def make(headers: dict, project_id: int, title: str = "Ticket") -> dict:
+        response = client.post(
+            "/tickets/",
+            json={"title": title, "type": "bug", "project_id": project_id},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return make
+
+
+@pytest.fixture
+def outdated_hashes(monkeypatch):
+    # Every stored hash counts as made with outdated bcrypt settings, so a
+    # successful login upgrades it
+    import app.auth.routes as auth_routes
+    from app.core.security import hash_password, verify_and_update_password
+
+    async def verify(password: str, hashed: str):
+        ok, _ = await verify_and_update_password(password, hashed)
+        return ok, await hash_password(password)
+
+    monkeypatch.setattr(auth_routes, "verify_and_update_password", verify)
@@ -0,0 +1,66 @@
+import importlib
+
+import anyio.to_thread
+import pytest
+
+from app.auth import routes as auth_routes
+from app.core import config
+from app.core.admission import KeyedLimit
+from conftest import login
+
+
+@pytest.fixture
+def load_config(monkeypatch):
+    # Settings are read at import: reload the module under other variables,
+    # and once more afterwards to put the suite's own values back
+    def load(**env):
+        for name in ("FIXHUB_MAX_IN_FLIGHT", "FIXHUB_MAX_IN_FLIGHT_ASYNC"):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(config)
+
+    yield load
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+def test_login_attempts_are_limited_per_account(client, make_user, monkeypatch):
+    (alice, _), (bob, _) = make_user(), make_user()
+    monkeypatch.setattr(auth_routes, "login_attempts", KeyedLimit("login", 0.001, 2))
+
+    # Every request comes from the same test client address
+    for _ in range(2):
+        response = client.post(
+            "/auth/login", json={"email": alice, "password": "wrong"}
+        )
+        assert response.status_code == 401
+
+    response = client.post(
+        "/auth/login", json={"email": alice.upper(), "password": "wrong"}
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Another account behind the same address is unaffected
+    assert login(client, bob)
+
+
+def test_in_flight_limit_follows_the_db_mode(load_config):
+    # Sync requests hold a session while they wait for a thread
+    settings = load_config(FIXHUB_ASYNC_DB="0", FIXHUB_THREADPOOL_SIZE="64")
+    assert settings.MAX_IN_FLIGHT == 64
+    assert settings.PASSWORD_HASH_MAX_PENDING < 64
+    assert load_config(FIXHUB_ASYNC_DB="0", FIXHUB_MAX_IN_FLIGHT="10").MAX_IN_FLIGHT == 10
+
+    # Async handlers do not: no limit unless one is asked for
+    assert load_config(FIXHUB_ASYNC_DB="1", FIXHUB_MAX_IN_FLIGHT="10").MAX_IN_FLIGHT == 0
+    settings = load_config(FIXHUB_ASYNC_DB="1", FIXHUB_MAX_IN_FLIGHT_ASYNC="500")
+    assert settings.MAX_IN_FLIGHT == 500
+
+
+def test_threadpool_is_sized_at_startup(client):
+    async def total_tokens():
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    assert client.portal.call(total_tokens) == config.THREADPOOL_SIZE
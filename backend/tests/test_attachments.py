@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+
+from app.attachments.routes import record_attachment, remove_blob_if_unreferenced
+from app.core.storage import get_storage, save_stream, store_staged
+from app.database.db import SessionLocal
+from app.models.user import User
+
+
+def upload(client, headers, ticket_id: int, content: bytes, name: str = "log.txt") -> dict:
+    response = client.post(
+        f"/attachments/ticket/{ticket_id}",
+        files={"file": (name, content, "text/plain")}, headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_download_is_limited_to_project_members(
+    client, make_user, make_project, make_ticket
+):
+    _, owner = make_user()
+    _, outsider = make_user()
+    ticket_id = make_ticket(owner, make_project(owner))["id"]
+    attachment = upload(client, owner, ticket_id, b"private bytes")
+
+    url = f"/attachments/{attachment['id']}/download"
+    response = client.get(url, headers=owner)
+    assert response.status_code == 200 and response.content == b"private bytes"
+
+    response = client.get(url, headers=outsider)
+    assert response.status_code == 404
+    assert b"private bytes" not in response.content
+
+
+def test_upload_racing_the_last_delete_keeps_its_bytes(
+    client, make_user, make_project, make_ticket
+):
+    email, headers = make_user()
+    ticket_id = make_ticket(headers, make_project(headers))["id"]
+    first = upload(client, headers, ticket_id, b"shared bytes")
+
+    # A second upload of the same content has been staged and stored...
+    async def chunks():
+        yield b"shared bytes"
+
+    storage = get_storage()
+    digest, size, staged = asyncio.run(save_stream(storage, chunks(), 1024))
+    store_staged(storage, digest, staged)
+    assert storage.exists(digest)
+
+    # ...when the only other reference is deleted, bytes and all, before
+    # the upload takes its own
+    assert client.delete(f"/attachments/{first['id']}", headers=headers).status_code == 200
+    assert not storage.exists(digest)
+
+    with SessionLocal() as db:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+        second = record_attachment(
+            db, ticket_id, user_id, "again.txt", "text/plain", digest, size, staged
+        )
+        db.commit()
+
+    download = client.get(f"/attachments/{second.id}/download", headers=headers)
+    assert download.status_code == 200 and download.content == b"shared bytes"
+
+
+def test_bytes_stay_while_a_blob_is_referenced(
+    client, make_user, make_project, make_ticket
+):
+    _, headers = make_user()
+    ticket_id = make_ticket(headers, make_project(headers))["id"]
+    first = upload(client, headers, ticket_id, b"deduplicated")
+    second = upload(client, headers, ticket_id, b"deduplicated", "copy.txt")
+    storage = get_storage()
+    digest = hashlib.sha256(b"deduplicated").hexdigest()
+
+    # A removal scheduled by an earlier delete finds the blob re-referenced
+    remove_blob_if_unreferenced(digest)
+    assert storage.exists(digest)
+
+    client.delete(f"/attachments/{first['id']}", headers=headers)
+    assert storage.exists(digest)
+    client.delete(f"/attachments/{second['id']}", headers=headers)
+    assert not storage.exists(digest)
+
+
+def test_bytes_are_stored_outside_the_write_lock(
+    client, make_user, make_project, make_ticket, monkeypatch
+):
+    _, headers = make_user()
+    ticket_id = make_ticket(headers, make_project(headers))["id"]
+    storage = get_storage()
+    database = os.environ["FIXHUB_DATABASE_URL"].removeprefix("sqlite:///")
+    lock_free = []
+
+    def store(digest, path):
+        # A slow S3 upload here would otherwise stall every writer
+        probe = sqlite3.connect(database, timeout=0)
+        try:
+            probe.execute("BEGIN IMMEDIATE")
+            lock_free.append(True)
+        except sqlite3.OperationalError:
+            lock_free.append(False)
+        finally:
+            probe.close()
+        type(storage).store(storage, digest, path)
+
+    monkeypatch.setattr(storage, "store", store)
+    attachment = upload(client, headers, ticket_id, b"stored before the lock")
+
+    assert lock_free == [True]
+    download = client.get(f"/attachments/{attachment['id']}/download", headers=headers)
+    assert download.content == b"stored before the lock"
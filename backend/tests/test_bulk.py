@@ -0,0 +1,66 @@
+from app.core.config import BULK_MAX_ITEMS
+
+
+def column_ids(client, headers, project_id: int, status: str) -> list[int]:
+    ids, after = [], None
+    while True:
+        params = {"limit": 100, **({"after": after} if after else {})}
+        page = client.get(
+            f"/kanban/project/{project_id}/column/{status}",
+            params=params, headers=headers,
+        ).json()
+        ids += [ticket["id"] for ticket in page["items"]]
+        after = page["next_cursor"]
+        if not after:
+            return ids
+
+
+def test_bulk_create_at_the_batch_limit(client, make_user, make_project, make_ticket):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    first = make_ticket(headers, project_id, "already there")["id"]
+
+    response = client.post("/tickets/bulk/create", json={"items": [
+        {"title": f"bulk {i}", "type": "task", "project_id": project_id}
+        for i in range(BULK_MAX_ITEMS)
+    ]}, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["succeeded"] == BULK_MAX_ITEMS and body["failed"] == 0
+
+    created = [result["id"] for result in body["results"]]
+    assert column_ids(client, headers, project_id, "todo") == [first] + created
+
+    from app.database.db import SessionLocal
+    from app.models.ticket import Ticket
+
+    with SessionLocal() as db:
+        longest = db.query(Ticket.rank).filter(
+            Ticket.project_id == project_id
+        ).order_by(Ticket.rank.desc()).first().rank
+    assert len(longest) <= 4
+
+
+def test_bulk_create_over_the_limit_is_rejected(client, make_user, make_project):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    response = client.post("/tickets/bulk/create", json={"items": [
+        {"title": "t", "type": "task", "project_id": project_id}
+    ] * (BULK_MAX_ITEMS + 1)}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_bulk_transition_appends_in_item_order(
+    client, make_user, make_project, make_ticket
+):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    ids = [make_ticket(headers, project_id, f"t{i}")["id"] for i in range(4)]
+
+    response = client.post("/tickets/bulk/transition", json={"items": [
+        {"id": ticket_id, "status": "in_progress"} for ticket_id in reversed(ids)
+    ]}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["succeeded"] == 4
+    assert column_ids(client, headers, project_id, "in_progress") == ids[::-1]
+    assert column_ids(client, headers, project_id, "todo") == []
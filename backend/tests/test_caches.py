@@ -0,0 +1,50 @@
+import json
+
+from app.core import events
+from app.core.permissions import membership_cache
+
+
+class RecordingBroker(events.Broker):
+    def __init__(self):
+        self.invalidations = []
+
+    def publish(self, project_id: int, message: str):
+        pass
+
+    def invalidate(self, cache: str, key):
+        self.invalidations.append((cache, key))
+
+
+def test_membership_changes_are_broadcast_to_other_workers(
+    client, make_user, make_project, monkeypatch
+):
+    from app.database.db import SessionLocal
+    from app.models.user import User
+
+    _, owner = make_user()
+    member_email, member = make_user()
+    project_id = make_project(owner)
+    with SessionLocal() as db:
+        member_id = db.query(User.id).filter(User.email == member_email).scalar()
+
+    # The member's empty membership set is cached before they are added
+    assert client.get(f"/projects/{project_id}/my-role", headers=member).status_code == 404
+    broker = RecordingBroker()
+    monkeypatch.setattr(events, "broker", broker)
+
+    response = client.post(
+        f"/projects/{project_id}/members",
+        json={"email": member_email, "role": "developer"}, headers=owner,
+    )
+    assert response.status_code == 200, response.text
+    assert ("memberships", member_id) in broker.invalidations
+    assert client.get(f"/projects/{project_id}/my-role", headers=member).json() == {
+        "role": "developer"
+    }
+
+
+def test_invalidations_from_other_workers_evict_the_entry():
+    membership_cache.set(4242, {})
+    events.apply_invalidation(json.dumps(["memberships", 4242]))
+    assert membership_cache.get(4242) is None
+    events.apply_invalidation(json.dumps(["no-such-cache", 1]))  # ignored
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.database.db import SessionLocal
+from app.models.ticket import Ticket
+
+# Concurrent requests from threads: the test client runs them side by side
+# on its event loop, and sync handlers side by side on the threadpool
+WRITERS = 30
+
+
+def ranks(project_id: int) -> list[str]:
+    with SessionLocal() as db:
+        return [
+            rank for (rank,) in
+            db.query(Ticket.rank).filter(Ticket.project_id == project_id).all()
+        ]
+
+
+def test_concurrent_creates_get_distinct_ranks(client, make_user, make_project):
+    _, headers = make_user()
+    project_id = make_project(headers)
+
+    def create(i):
+        return client.post(
+            "/tickets/",
+            json={"title": f"t{i}", "type": "bug", "project_id": project_id},
+            headers=headers,
+        )
+
+    with ThreadPoolExecutor(WRITERS) as pool:
+        responses = list(pool.map(create, range(WRITERS)))
+
+    assert [r.status_code for r in responses] == [200] * WRITERS
+    assert len(set(ranks(project_id))) == WRITERS
+
+
+def test_concurrent_moves_all_succeed(client, make_user, make_project, make_ticket):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    ids = [make_ticket(headers, project_id, f"t{i}")["id"] for i in range(WRITERS)]
+
+    def move(ticket_id):
+        return client.post(
+            "/kanban/move",
+            json={"ticket_id": ticket_id, "new_status": "todo", "before_id": ids[0]}
+            if ticket_id != ids[0] else {"ticket_id": ticket_id, "new_status": "todo"},
+            headers=headers,
+        )
+
+    with ThreadPoolExecutor(WRITERS) as pool:
+        responses = list(pool.map(move, ids))
+
+    assert [r.status_code for r in responses] == [200] * WRITERS, [
+        r.text for r in responses if r.status_code != 200
+    ]
+    assert len(set(ranks(project_id))) == WRITERS
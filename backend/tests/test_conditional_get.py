@@ -0,0 +1,47 @@
+def test_unchanged_board_is_not_sent_again(client, make_user, make_project, make_ticket):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    ticket = make_ticket(headers, project_id)
+    board = f"/kanban/project/{project_id}"
+
+    first = client.get(board, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    again = client.get(board, headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+
+    # Another representation of the same project has its own tag
+    other = client.get(board, params={"limit": 5}, headers=headers)
+    assert other.headers["ETag"] != etag
+
+    # A write to the project bumps its version: the old tag no longer matches
+    response = client.put(
+        f"/tickets/{ticket['id']}", json={"title": "renamed"}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+
+    changed = client.get(board, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    [todo] = [c for c in changed.json()["columns"] if c["status"] == "todo"]
+    assert [t["title"] for t in todo["items"]] == ["renamed"]
+
+
+def test_comment_threads_are_tagged_per_ticket(client, make_user, make_project, make_ticket):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    ticket_id = make_ticket(headers, project_id)["id"]
+    thread = f"/comments/ticket/{ticket_id}"
+
+    etag = client.get(thread, headers=headers).headers["ETag"]
+    assert client.get(thread, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    response = client.post(
+        "/comments/", json={"content": "on it", "ticket_id": ticket_id}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert client.get(thread, headers={**headers, "If-None-Match": etag}).status_code == 200
@@ -0,0 +1,74 @@
+from app.core.counters import reconcile
+from app.database.db import SessionLocal
+from app.models.ticket_counter import TicketCounter
+
+
+def dashboard(client, headers, project_id: int) -> dict:
+    response = client.get(f"/dashboard/project/{project_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return {
+        "status": {row["status"]: row["tickets"] for row in body["summary"]},
+        "priority": {row["priority"]: row["tickets"] for row in body["by_priority"]},
+        "assignee": {row["assigned_to"]: row["tickets"] for row in body["by_assignee"]},
+    }
+
+
+def test_counters_follow_ticket_writes(client, make_user, make_project, make_ticket):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    a, b, c = (make_ticket(headers, project_id, t)["id"] for t in "abc")
+
+    assert dashboard(client, headers, project_id) == {
+        "status": {"todo": 3}, "priority": {"medium": 3}, "assignee": {None: 3},
+    }
+
+    response = client.post(
+        "/kanban/move", json={"ticket_id": a, "new_status": "in_progress"}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    response = client.put(f"/tickets/{b}", json={"priority": "high"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert client.delete(f"/tickets/{c}", headers=headers).status_code == 200
+
+    assert dashboard(client, headers, project_id) == {
+        "status": {"todo": 1, "in_progress": 1},
+        "priority": {"medium": 1, "high": 1},
+        "assignee": {None: 2},
+    }
+
+
+def test_reconcile_repairs_drifted_counters(client, make_user, make_project, make_ticket):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    make_ticket(headers, project_id)
+    make_ticket(headers, project_id)
+
+    with SessionLocal() as db:
+        db.query(TicketCounter).filter(
+            TicketCounter.project_id == project_id,
+            TicketCounter.dimension == "status",
+            TicketCounter.value == "todo",
+        ).update({TicketCounter.count: 7})
+        db.add(TicketCounter(
+            project_id=project_id, dimension="priority", value="low", count=1
+        ))
+        db.commit()
+    # Served (and cached) from the drifted counters
+    assert dashboard(client, headers, project_id) == {
+        "status": {"todo": 7}, "priority": {"medium": 2, "low": 1}, "assignee": {None: 2},
+    }
+
+    with SessionLocal() as db:
+        drift = reconcile(db, project_id=project_id)
+        db.commit()
+    assert sorted((d["dimension"], d["value"], d["stored"], d["actual"]) for d in drift) == [
+        ("priority", "low", 1, 0), ("status", "todo", 7, 2),
+    ]
+
+    # Fixed, and the cached dashboard built from the bad counters is gone
+    assert dashboard(client, headers, project_id) == {
+        "status": {"todo": 2}, "priority": {"medium": 2}, "assignee": {None: 2},
+    }
+    with SessionLocal() as db:
+        assert reconcile(db, project_id=project_id, fix=False) == []
@@ -0,0 +1,160 @@
+from sqlalchemy import create_engine, event, inspect, text
+
+from app.core.ranking import spread_keys
+from app.database.db import Base
+from app.database.migrations import SCHEMA_VERSION, get_schema_version, init_db
+
+# The schema as the first release created it (user_version 0), before any
+# migration existed
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER NOT NULL, email VARCHAR NOT NULL, hashed_password VARCHAR NOT NULL,
+        role VARCHAR, PRIMARY KEY (id))""",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE INDEX ix_users_id ON users (id)",
+    """CREATE TABLE projects (
+        id INTEGER NOT NULL, name VARCHAR NOT NULL, description VARCHAR,
+        owner_id INTEGER, PRIMARY KEY (id),
+        FOREIGN KEY(owner_id) REFERENCES users (id))""",
+    "CREATE INDEX ix_projects_id ON projects (id)",
+    """CREATE TABLE tickets (
+        id INTEGER NOT NULL, title VARCHAR NOT NULL, description VARCHAR,
+        type VARCHAR NOT NULL, status VARCHAR, priority VARCHAR, position INTEGER,
+        project_id INTEGER, assigned_to INTEGER, is_deleted BOOLEAN, PRIMARY KEY (id),
+        FOREIGN KEY(project_id) REFERENCES projects (id),
+        FOREIGN KEY(assigned_to) REFERENCES users (id))""",
+    "CREATE INDEX ix_tickets_id ON tickets (id)",
+    """CREATE TABLE project_members (
+        id INTEGER NOT NULL, project_id INTEGER, user_id INTEGER, role VARCHAR,
+        PRIMARY KEY (id),
+        FOREIGN KEY(project_id) REFERENCES projects (id),
+        FOREIGN KEY(user_id) REFERENCES users (id))""",
+    "CREATE INDEX ix_project_members_id ON project_members (id)",
+    """CREATE TABLE comments (
+        id INTEGER NOT NULL, content VARCHAR NOT NULL, created_at DATETIME,
+        ticket_id INTEGER, user_id INTEGER, is_deleted BOOLEAN, PRIMARY KEY (id),
+        FOREIGN KEY(ticket_id) REFERENCES tickets (id),
+        FOREIGN KEY(user_id) REFERENCES users (id))""",
+    "CREATE INDEX ix_comments_id ON comments (id)",
+    """CREATE TABLE attachments (
+        id INTEGER NOT NULL, filename VARCHAR NOT NULL, file_path VARCHAR NOT NULL,
+        uploaded_at DATETIME, ticket_id INTEGER, uploaded_by INTEGER, PRIMARY KEY (id),
+        FOREIGN KEY(ticket_id) REFERENCES tickets (id),
+        FOREIGN KEY(uploaded_by) REFERENCES users (id))""",
+    "CREATE INDEX ix_attachments_id ON attachments (id)",
+]
+
+BASELINE_DATA = [
+    """INSERT INTO users (id, email, hashed_password, role) VALUES
+        (1, 'owner@fixhub.dev', 'hash-1', 'admin'),
+        (2, 'dev@fixhub.dev', 'hash-2', 'developer')""",
+    "INSERT INTO projects (id, name, owner_id) VALUES (1, 'Legacy', 1)",
+    # The same membership twice, from before it was unique
+    """INSERT INTO project_members (id, project_id, user_id, role) VALUES
+        (1, 1, 1, 'admin'), (2, 1, 2, 'developer'), (3, 1, 2, 'viewer')""",
+    # Board order was the position column; ids deliberately disagree
+    """INSERT INTO tickets
+        (id, title, type, status, priority, position, project_id, assigned_to, is_deleted)
+        VALUES
+        (1, 'third', 'bug', 'todo', 'high', 2, 1, 2, 0),
+        (2, 'first', 'bug', 'todo', 'low', 0, 1, NULL, 0),
+        (3, 'second', 'task', 'todo', 'high', 1, 1, 2, 0),
+        (4, 'shipped', 'feature', 'done', 'medium', 0, 1, 1, 0),
+        (5, 'gone', 'bug', 'todo', 'low', 3, 1, NULL, 1)""",
+    """INSERT INTO comments (id, content, created_at, ticket_id, user_id, is_deleted)
+        VALUES (1, 'on it', '2024-01-01 10:00:00', 2, 2, 0)""",
+    """INSERT INTO attachments (id, filename, file_path, uploaded_at, ticket_id, uploaded_by)
+        VALUES (1, 'log.txt', 'app/uploads/log.txt', '2024-01-01 10:00:00', 2, 2)""",
+]
+
+
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/baseline.db")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA + BASELINE_DATA:
+            conn.execute(text(statement))
+    return engine
+
+
+def test_baseline_database_upgrades_without_losing_data(tmp_path):
+    engine = baseline_engine(tmp_path)
+    assert init_db(engine) == SCHEMA_VERSION
+
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == SCHEMA_VERSION
+
+        def rows(sql: str) -> list[tuple]:
+            return [tuple(row) for row in conn.execute(text(sql))]
+
+        # Everything that was there is still there
+        assert rows("SELECT id, email, hashed_password, password_version FROM users") == [
+            (1, "owner@fixhub.dev", "hash-1", 0), (2, "dev@fixhub.dev", "hash-2", 0),
+        ]
+        assert rows("SELECT count(*) FROM tickets") == [(5,)]
+        assert rows("SELECT id, content, author_email, author_role FROM comments") == [
+            (1, "on it", "dev@fixhub.dev", "developer"),
+        ]
+        assert rows("SELECT id, filename, file_path FROM attachments") == [
+            (1, "log.txt", "app/uploads/log.txt"),
+        ]
+        # The older duplicate membership is the one kept
+        assert rows("SELECT id, user_id, role FROM project_members ORDER BY id") == [
+            (1, 1, "admin"), (2, 2, "developer"),
+        ]
+
+        # Columns keep their position order as rank keys
+        assert rows(
+            "SELECT id, rank FROM tickets WHERE status = 'todo' AND is_deleted = 0 "
+            "ORDER BY rank"
+        ) == list(zip([2, 3, 1], spread_keys(3)))
+
+        # Dashboard counters start out matching the live tickets
+        counters = dict(
+            ((dimension, value), count) for dimension, value, count in conn.execute(text(
+                "SELECT dimension, value, count FROM ticket_counters WHERE project_id = 1"
+            ))
+        )
+        assert counters == {
+            ("status", "todo"): 3, ("status", "done"): 1,
+            ("priority", "high"): 2, ("priority", "low"): 1, ("priority", "medium"): 1,
+            ("assignee", "2"): 2, ("assignee", ""): 1, ("assignee", "1"): 1,
+        }
+
+    # Every table and index of the current models exists
+    schema = inspect(engine)
+    for table in Base.metadata.tables.values():
+        assert schema.has_table(table.name)
+        columns = {column["name"] for column in schema.get_columns(table.name)}
+        assert columns >= set(table.columns.keys()), table.name
+        indexes = {index["name"] for index in schema.get_indexes(table.name)}
+        assert indexes >= {index.name for index in table.indexes}, table.name
+
+
+def test_current_database_boots_without_migrating(tmp_path):
+    engine = baseline_engine(tmp_path)
+    init_db(engine)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    assert init_db(engine) == SCHEMA_VERSION
+    # Only the version and catalog reads of schema_is_current
+    assert statements
+    assert all(s.lstrip().upper().startswith(("PRAGMA", "SELECT")) for s in statements)
+
+
+def test_interrupted_upgrade_is_rerun_safely(tmp_path):
+    engine = baseline_engine(tmp_path)
+    init_db(engine)
+    with engine.begin() as conn:
+        before = conn.execute(text("SELECT id, rank FROM tickets ORDER BY id")).all()
+        # As if the process died after version 5 was stamped
+        conn.execute(text("PRAGMA user_version = 5"))
+
+    assert init_db(engine) == SCHEMA_VERSION
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT id, rank FROM tickets ORDER BY id")).all() == before
+        assert conn.execute(text("SELECT count(*) FROM project_members")).scalar() == 2
@@ -0,0 +1,58 @@
+from app.database.db import SessionLocal
+from app.models.project_member import ProjectMember
+from app.models.user import User
+
+
+def add_admin(project_id: int, email: str) -> None:
+    with SessionLocal() as db:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+        db.add(ProjectMember(project_id=project_id, user_id=user_id, role="admin"))
+        db.commit()
+
+
+def comment(client, headers: dict, ticket_id: int) -> int:
+    response = client.post(
+        "/comments/", json={"content": "hi", "ticket_id": ticket_id}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_only_the_owner_manages_members(client, make_user, make_project):
+    _, owner = make_user()
+    admin_email, admin = make_user()
+    project_id = make_project(owner)
+    add_admin(project_id, admin_email)
+
+    response = client.post(
+        f"/projects/{project_id}/members/",
+        json={"email": admin_email, "role": "viewer"},
+        headers=admin,
+    )
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Only project owner can manage members"
+
+    response = client.post(
+        "/projects/999999/members/",
+        json={"email": admin_email, "role": "viewer"},
+        headers=owner,
+    )
+    assert response.status_code == 404
+
+
+def test_only_the_author_or_owner_deletes_comments(
+    client, make_user, make_project, make_ticket
+):
+    _, owner = make_user()
+    admin_email, admin = make_user()
+    project_id = make_project(owner)
+    add_admin(project_id, admin_email)
+    ticket_id = make_ticket(owner, project_id)["id"]
+
+    owners_comment = comment(client, owner, ticket_id)
+    admins_comment = comment(client, admin, ticket_id)
+    another = comment(client, admin, ticket_id)
+
+    assert client.delete(f"/comments/{owners_comment}", headers=admin).status_code == 403
+    assert client.delete(f"/comments/{admins_comment}", headers=owner).status_code == 200
+    assert client.delete(f"/comments/{another}", headers=admin).status_code == 200
@@ -0,0 +1,84 @@
+import pytest
+from fastapi.routing import APIRoute
+
+from app.core.metrics import QueryBudget, QueryBudgetExceeded
+
+
+def route(app, method: str, path: str) -> APIRoute:
+    return next(
+        r for r in app.routes
+        if isinstance(r, APIRoute) and r.path == path and method in r.methods
+    )
+
+
+def test_routes_stay_within_their_budgets(client, make_user, make_project, make_ticket):
+    # Every call below fails with QueryBudgetExceeded in raise mode
+    owner_email, owner = make_user()
+    dev_email, _ = make_user()
+    project_id = make_project(owner)
+    response = client.post(
+        f"/projects/{project_id}/members",
+        json={"email": dev_email, "role": "developer"}, headers=owner,
+    )
+    assert response.status_code == 200, response.text
+
+    tickets = [make_ticket(owner, project_id, f"crash {i}") for i in range(3)]
+    ticket_id = tickets[0]["id"]
+
+    for method, path, kwargs in [
+        ("GET", "/projects/", {}),
+        ("GET", f"/projects/{project_id}/members", {}),
+        ("GET", f"/projects/{project_id}/my-role", {}),
+        ("GET", f"/tickets/project/{project_id}", {}),
+        ("GET", "/tickets/search", {"params": {"q": "crash"}}),
+        ("GET", f"/kanban/project/{project_id}", {}),
+        ("GET", f"/kanban/project/{project_id}/column/todo", {}),
+        ("GET", f"/dashboard/project/{project_id}", {}),
+        ("PUT", f"/tickets/{tickets[1]['id']}", {"json": {"priority": "high"}}),
+        ("POST", "/kanban/move", {"json": {
+            "ticket_id": ticket_id, "new_status": "in_progress", "new_position": 1,
+        }}),
+        ("POST", "/comments/", {"json": {"content": "on it", "ticket_id": ticket_id}}),
+        ("GET", f"/comments/ticket/{ticket_id}", {}),
+        ("POST", f"/attachments/ticket/{ticket_id}",
+         {"files": {"file": ("log.txt", b"stack trace", "text/plain")}}),
+        ("GET", f"/attachments/ticket/{ticket_id}", {}),
+        ("DELETE", f"/tickets/{tickets[2]['id']}", {}),
+    ]:
+        response = client.request(method, path, headers=owner, **kwargs)
+        assert response.status_code == 200, f"{method} {path}: {response.text}"
+
+
+def test_over_budget_write_is_rolled_back(app, client, make_user, monkeypatch):
+    _, headers = make_user()
+    monkeypatch.setattr(
+        route(app, "POST", "/projects/"), "query_budget", QueryBudget(1, None)
+    )
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.post("/projects/", json={"name": "over budget"}, headers=headers)
+
+    monkeypatch.undo()
+    names = [p["name"] for p in client.get("/projects/", headers=headers).json()]
+    assert "over budget" not in names
+
+
+def test_route_that_commits_itself_is_checked_first(
+    app, client, make_user, monkeypatch, outdated_hashes
+):
+    # Login commits the upgraded password hash on a session of its own
+    from app.database.db import SessionLocal
+    from app.models.user import User
+
+    email, _ = make_user()
+    with SessionLocal() as db:
+        stored = db.query(User.hashed_password).filter(User.email == email).scalar()
+
+    monkeypatch.setattr(
+        route(app, "POST", "/auth/login"), "query_budget", QueryBudget(2, None)
+    )
+    with pytest.raises(QueryBudgetExceeded):
+        client.post("/auth/login", json={"email": email, "password": "secret-pw"})
+
+    with SessionLocal() as db:
+        assert db.query(User.hashed_password).filter(User.email == email).scalar() == stored
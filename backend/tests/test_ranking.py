@@ -0,0 +1,212 @@
+import random
+
+import pytest
+
+from app.core.ranking import key_between, keys_after, spread_keys
+
+
+def test_appends_grow_logarithmically():
+    key = None
+    for _ in range(100_000):
+        following = key_between(key, None)
+        assert key is None or following > key
+        key = following
+    assert len(key) <= 4
+
+
+def test_prepends_grow_logarithmically():
+    key = None
+    for _ in range(10_000):
+        previous = key_between(None, key)
+        assert key is None or previous < key
+        key = previous
+    assert len(key) <= 4
+
+
+def test_random_inserts_keep_order():
+    rng = random.Random(7)
+    keys = spread_keys(3)
+    for _ in range(5_000):
+        i = rng.randint(0, len(keys))
+        before = keys[i - 1] if i else None
+        after = keys[i] if i < len(keys) else None
+        key = key_between(before, after)
+        assert (before is None or before < key) and (after is None or key < after)
+        keys.insert(i, key)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+def test_long_keys_do_not_recurse():
+    # Always inserting right below the same neighbour is the worst case
+    before, after = key_between(None, None), None
+    after = key_between(before, after)
+    for _ in range(20_000):
+        after = key_between(before, after)
+    assert before < after
+    assert len(after) > 1_000
+
+
+def test_spread_and_keys_after_are_short_and_ascending():
+    keys = spread_keys(5_000)
+    assert keys == sorted(keys) and len(set(keys)) == 5_000
+    assert max(map(len, keys)) <= 4
+    tail = keys_after(keys[-1], 10)
+    assert tail == sorted(tail) and tail[0] > keys[-1]
+
+
+@pytest.mark.parametrize("before, after", [("a1", "a1"), ("a2", "a1"), ("0V", None), ("a10", None)])
+def test_invalid_or_unordered_keys_raise(before, after):
+    with pytest.raises(ValueError):
+        key_between(before, after)
+
+
+def test_created_tickets_get_short_ranks_in_board_order(
+    client, make_user, make_project, make_ticket
+):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    ids = [make_ticket(headers, project_id, f"t{i}")["id"] for i in range(70)]
+
+    from app.database.db import SessionLocal
+    from app.models.ticket import Ticket
+
+    with SessionLocal() as db:
+        ranks = [
+            rank for rank, in db.query(Ticket.rank)
+            .filter(Ticket.project_id == project_id)
+            .order_by(Ticket.id)
+        ]
+    assert ranks == sorted(ranks)
+    assert max(map(len, ranks)) <= 3
+
+    board = client.get(
+        f"/kanban/project/{project_id}/column/todo", params={"limit": 100},
+        headers=headers,
+    ).json()
+    assert [t["id"] for t in board["items"]] == ids
+
+
+def test_migration_rekeys_old_ranks_in_order():
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+
+    from app.database.migrations import init_db, rekey_ticket_ranks
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    init_db(engine)
+    old_keys = ["V", "k", "kV", "0G", "z"]  # headless keys from before
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO tickets (id, title, type, status, project_id, rank, is_deleted) "
+            "VALUES (:id, 't', 'bug', 'todo', 1, :rank, 0)"
+        ), [{"id": i, "rank": key} for i, key in enumerate(old_keys, 1)])
+        rekey_ticket_ranks(conn)
+        rows = conn.execute(text("SELECT id, rank FROM tickets ORDER BY rank")).all()
+
+    assert [row.id for row in rows] == [4, 1, 2, 3, 5]
+    assert [row.rank for row in rows] == spread_keys(5)
+
+
+def test_migration_spreads_columns_with_duplicate_ranks():
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+
+    from app.database.migrations import init_db, spread_duplicate_ranks
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    init_db(engine)
+    rows = [
+        (1, "todo", "a1"), (2, "todo", "a1"), (3, "todo", "a0"),  # duplicated
+        (4, "done", "a5"), (5, "done", "a7"),                     # left alone
+    ]
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_tickets_project_status_rank_live"))
+        conn.execute(text(
+            "INSERT INTO tickets (id, title, type, status, project_id, rank, is_deleted) "
+            "VALUES (:id, 't', 'bug', :status, 1, :rank, 0)"
+        ), [{"id": i, "status": status, "rank": rank} for i, status, rank in rows])
+        spread_duplicate_ranks(conn)
+        ranks = dict(conn.execute(text("SELECT id, rank FROM tickets")).all())
+
+    assert ranks == {3: "a0", 1: "a1", 2: "a2", 4: "a5", 5: "a7"}
+
+def column_ranks(project_id: int) -> list[tuple[int, str]]:
+    from app.database.db import SessionLocal
+    from app.models.ticket import Ticket
+
+    with SessionLocal() as db:
+        return [
+            (row.id, row.rank) for row in db.query(Ticket.id, Ticket.rank)
+            .filter(Ticket.project_id == project_id, Ticket.is_deleted == False)
+            .order_by(Ticket.rank)
+        ]
+
+
+def test_ranks_are_unique_per_column(client, make_user, make_project, make_ticket):
+    from sqlalchemy.exc import IntegrityError
+
+    from app.database.db import SessionLocal
+    from app.models.ticket import Ticket
+
+    _, headers = make_user()
+    project_id = make_project(headers)
+    make_ticket(headers, project_id)
+    [(_, rank)] = column_ranks(project_id)
+
+    with SessionLocal() as db:
+        db.add(Ticket(
+            title="copy", type="bug", status="todo", project_id=project_id,
+            rank=rank, is_deleted=False,
+        ))
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+
+def test_rebalance_reuses_keys_the_column_holds(
+    client, make_user, make_project, make_ticket
+):
+    from app.core.ranking import rebalance_column
+    from app.database.db import SessionLocal
+
+    _, headers = make_user()
+    project_id = make_project(headers)
+    a, b, c = (make_ticket(headers, project_id)["id"] for _ in range(3))
+    # c goes first, below "a0": spreading the column hands out a0..a2 again
+    response = client.post(
+        "/kanban/move",
+        json={"ticket_id": c, "new_status": "todo", "before_id": a},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+
+    with SessionLocal() as db:
+        rebalance_column(db, project_id, "todo")
+        db.commit()
+    assert column_ranks(project_id) == list(zip([c, a, b], spread_keys(3)))
+
+
+def test_move_onto_a_taken_rank_respaces_the_column(
+    client, make_user, make_project, make_ticket, monkeypatch
+):
+    import app.kanban.routes as kanban_routes
+
+    _, headers = make_user()
+    project_id = make_project(headers)
+    a, b, c = (make_ticket(headers, project_id)["id"] for _ in range(3))
+    # a to the bottom: the column is b, c, a at a1, a2, a3
+    response = client.post(
+        "/kanban/move", json={"ticket_id": a, "new_status": "todo"}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+
+    # As if a stale gap computation handed out c's rank
+    monkeypatch.setattr(kanban_routes, "key_between", lambda after, before: after)
+    response = client.post(
+        "/kanban/move",
+        json={"ticket_id": b, "new_status": "todo", "after_id": c},
+        headers=headers,
+    )
+    assert response.status_code == 409
+    # Nothing moved, and the column was spread again after the response
+    assert column_ranks(project_id) == list(zip([b, c, a], spread_keys(3)))
@@ -0,0 +1,27 @@
+from app.core import response_cache
+
+
+def ticket_ids(client, headers, project_id: int) -> list[int]:
+    response = client.get(f"/tickets/project/{project_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return [ticket["id"] for ticket in response.json()["items"]]
+
+
+def test_write_evicts_the_cached_list(client, make_user, make_project, make_ticket):
+    backend = response_cache.backend
+    _, headers = make_user()
+    project_id, other_project = make_project(headers), make_project(headers)
+    first = make_ticket(headers, project_id)["id"]
+
+    assert ticket_ids(client, headers, project_id) == [first]
+    hits = backend.hits
+    assert ticket_ids(client, headers, project_id) == [first]
+    assert backend.hits == hits + 1
+
+    # A write elsewhere leaves this project's entries alone
+    make_ticket(headers, other_project)
+    assert f"project:{project_id}" in backend._tags
+
+    second = make_ticket(headers, project_id)["id"]
+    assert f"project:{project_id}" not in backend._tags
+    assert ticket_ids(client, headers, project_id) == [first, second]
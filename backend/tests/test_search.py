@@ -0,0 +1,77 @@
+import pytest
+
+from app.core import search as search_index
+
+
+@pytest.fixture
+def client(client):
+    # The index is created at startup; without FTS5 search is a substring scan
+    if not search_index.FTS_ENABLED:
+        pytest.skip("SQLite build without FTS5")
+    return client
+
+
+def search(client, headers, project_id: int, q: str) -> list[dict]:
+    response = client.get(
+        "/tickets/search", params={"q": q, "project_id": project_id}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+def create(client, headers, project_id: int, title: str, description: str) -> int:
+    response = client.post(
+        "/tickets/",
+        json={
+            "title": title, "description": description,
+            "type": "bug", "project_id": project_id,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_search_ranks_and_highlights_matches(client, make_user, make_project):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    weak = create(client, headers, project_id, "Slow export", "rare crash on large files")
+    strong = create(client, headers, project_id, "Login crash", "crash after crash")
+    create(client, headers, project_id, "Typo", "footer says 2019")
+
+    hits = search(client, headers, project_id, "crash")
+    # bm25: lower is better, and the denser match comes first
+    assert [hit["id"] for hit in hits] == [strong, weak]
+    assert hits[0]["rank"] < hits[1]["rank"]
+    assert "<mark>crash</mark>" in hits[1]["snippet"]
+
+    # Words are prefix terms: "cra" still finds "crash"
+    assert [hit["id"] for hit in search(client, headers, project_id, "cra")] == [strong, weak]
+
+
+def test_index_follows_edits_comments_and_deletes(client, make_user, make_project):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    ticket_id = create(client, headers, project_id, "Login crash", "on submit")
+
+    response = client.put(
+        f"/tickets/{ticket_id}",
+        json={"title": "Export timeout", "description": "after a minute"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert search(client, headers, project_id, "crash") == []
+    assert [hit["id"] for hit in search(client, headers, project_id, "timeout")] == [ticket_id]
+
+    response = client.post(
+        "/comments/",
+        json={"ticket_id": ticket_id, "content": "seen with gzip enabled"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert [hit["id"] for hit in search(client, headers, project_id, "gzip")] == [ticket_id]
+
+    response = client.delete(f"/tickets/{ticket_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    assert search(client, headers, project_id, "timeout") == []
+    assert search(client, headers, project_id, "gzip") == []
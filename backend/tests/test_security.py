@@ -0,0 +1,40 @@
+import asyncio
+from concurrent.futures import Future
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.security import PasswordHasher
+
+
+class HeldExecutor:
+    # Hands out futures the test completes itself
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+def test_waiting_hashes_hold_no_thread_and_are_capped():
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    executor = hasher._executor = HeldExecutor()
+
+    async def scenario():
+        first = asyncio.create_task(hasher.run(None))
+        await asyncio.sleep(0)
+        # The first call is parked on the event loop, not on a thread
+        assert hasher.pending == 1 and len(executor.futures) == 1
+
+        with pytest.raises(HTTPException) as refused:
+            await hasher.run(None)
+        assert refused.value.status_code == 503
+
+        executor.futures[0].set_result(("hash", 0.0, 0.01))
+        return await asyncio.wait_for(first, timeout=5)
+
+    assert asyncio.run(scenario()) == "hash"
+    assert hasher.pending == 0
+    assert hasher.stats()["rejected"] == 1
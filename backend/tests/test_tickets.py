@@ -0,0 +1,69 @@
+def list_ids(client, headers, project_id: int, limit: int = 2) -> list[int]:
+    ids, after = [], None
+    while True:
+        params = {"limit": limit, **({"after": after} if after else {})}
+        response = client.get(
+            f"/tickets/project/{project_id}", params=params, headers=headers
+        )
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids += [ticket["id"] for ticket in page["items"]]
+        after = page["next_cursor"]
+        if not after:
+            return ids
+
+
+def test_project_list_follows_kanban_moves(client, make_user, make_project, make_ticket):
+    _, headers = make_user()
+    project_id = make_project(headers)
+    a, b, c, d = (make_ticket(headers, project_id, t)["id"] for t in "abcd")
+    assert list_ids(client, headers, project_id) == [a, b, c, d]
+
+    response = client.post(
+        "/kanban/move",
+        json={"ticket_id": d, "new_status": "todo", "before_id": a},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    assert list_ids(client, headers, project_id) == [d, a, b, c]
+
+
+def test_tampered_cursors_are_rejected(client, make_user, make_project, make_ticket):
+    from app.core.pagination import encode_cursor
+
+    _, headers = make_user()
+    project_id = make_project(headers)
+    ticket_id = make_ticket(headers, project_id)["id"]
+
+    for values in (
+        {"rank": ["a0"], "id": 1},
+        {"rank": "a0", "id": [1]},
+        {"rank": "a0", "id": "1"},
+        {"rank": "a0", "id": True},
+        {"rank": {"x": 1}, "id": 1},
+        {"position": 1, "id": 1},
+    ):
+        for path in (
+            f"/tickets/project/{project_id}",
+            f"/kanban/project/{project_id}/column/todo",
+        ):
+            response = client.get(
+                path, params={"after": encode_cursor(values)}, headers=headers
+            )
+            assert response.status_code == 400, (path, values, response.text)
+
+    # Full-text search pages on (bm25 score, id); other searches on id
+    for params, status in (
+        ({"q": "ticket", "after": encode_cursor({"rank": -1.5, "id": 1})}, 200),
+        ({"q": "ticket", "after": encode_cursor({"rank": [1], "id": 1})}, 400),
+        ({"after": encode_cursor({"id": {"$gt": 0}})}, 400),
+    ):
+        response = client.get("/tickets/search", params=params, headers=headers)
+        assert response.status_code == status, (params, response.text)
+
+    for values in ({"created_at": 5, "id": 1}, {"created_at": "2024-01-01", "id": [1]}):
+        response = client.get(
+            f"/comments/ticket/{ticket_id}",
+            params={"after": encode_cursor(values)}, headers=headers,
+        )
+        assert response.status_code == 400, (values, response.text)
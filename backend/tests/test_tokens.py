@@ -0,0 +1,132 @@
+from app.database.db import SessionLocal
+from app.models.user import User
+
+from conftest import login
+
+
+def test_rehash_on_login_keeps_other_sessions(client, make_user, outdated_hashes):
+    # Outdated bcrypt settings: every login upgrades the stored hash
+    email, first = make_user()
+    second = login(client, email)
+
+    with SessionLocal() as db:
+        assert db.query(User).filter(User.email == email).one().password_version == 0
+    assert client.get("/projects/", headers=first).status_code == 200
+    assert client.get("/projects/", headers=second).status_code == 200
+
+
+def test_password_change_revokes_earlier_tokens(client, make_user):
+    email, headers = make_user()
+    other_session = login(client, email)
+
+    response = client.post(
+        "/auth/change-password",
+        json={"current_password": "wrong", "new_password": "new-secret"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert client.get("/projects/", headers=headers).status_code == 200
+
+    response = client.post(
+        "/auth/change-password",
+        json={"current_password": "secret-pw", "new_password": "new-secret"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    fresh = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for stale in (headers, other_session):
+        response = client.get("/projects/", headers=stale)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token revoked"
+    assert client.get("/projects/", headers=fresh).status_code == 200
+
+    response = client.post("/auth/login", json={"email": email, "password": "secret-pw"})
+    assert response.status_code == 401
+    assert client.get("/projects/", headers=login(client, email, "new-secret")).status_code == 200
+
+
+def test_logout_revokes_only_that_token(client, make_user):
+    email, first = make_user()
+    second = login(client, email)
+
+    assert client.post("/auth/logout", headers=first).status_code == 200
+    assert client.get("/projects/", headers=first).status_code == 401
+    assert client.get("/projects/", headers=second).status_code == 200
+
+
+def test_other_workers_see_revocations_after_the_newest_row_expired():
+    import time
+
+    from app.core.token import TokenDenylist
+    from app.database.db import ReadSessionLocal
+    from app.models.revoked_token import RevokedToken
+
+    revoking, other = TokenDenylist(60), TokenDenylist(60)
+    with SessionLocal() as db:
+        revoking.revoke(db, "digest-a", int(time.time()) + 600)
+        db.commit()
+    other.sync(ReadSessionLocal)
+    assert other.is_revoked("digest-a")
+
+    # The newest row expires and is cleared out by the next logout, which
+    # must still get a higher id than any the other worker has seen
+    with SessionLocal() as db:
+        db.query(RevokedToken).filter(RevokedToken.digest == "digest-a").update(
+            {RevokedToken.expires_at: int(time.time()) - 1}
+        )
+        db.commit()
+    with SessionLocal() as db:
+        revoking.revoke(db, "digest-b", int(time.time()) + 600)
+        db.commit()
+
+    other.sync(ReadSessionLocal)
+    assert other.is_revoked("digest-b")
+
+
+def test_revocation_applies_only_once_committed():
+    import time
+
+    from app.core.token import TokenDenylist
+
+    denylist = TokenDenylist(60)
+    with SessionLocal() as db:
+        denylist.revoke(db, "digest-rolled-back", int(time.time()) + 600)
+        assert not denylist.is_revoked("digest-rolled-back")
+        db.rollback()
+    assert not denylist.is_revoked("digest-rolled-back")
+
+    with SessionLocal() as db:
+        denylist.revoke(db, "digest-committed", int(time.time()) + 600)
+        db.commit()
+    assert denylist.is_revoked("digest-committed")
+
+
+def test_migration_rebuilds_revoked_tokens_with_autoincrement():
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+
+    from app.database.migrations import autoincrement_revoked_tokens
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE revoked_tokens (id INTEGER NOT NULL, digest VARCHAR NOT NULL, "
+            "expires_at INTEGER NOT NULL, PRIMARY KEY (id))"
+        ))
+        conn.execute(text(
+            "CREATE INDEX ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)"
+        ))
+        conn.execute(text("INSERT INTO revoked_tokens VALUES (7, 'kept', 99)"))
+
+        autoincrement_revoked_tokens(conn)
+        autoincrement_revoked_tokens(conn)  # idempotent
+
+        ddl = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE name = 'revoked_tokens'"
+        )).scalar()
+        assert "AUTOINCREMENT" in ddl
+        assert conn.execute(text("SELECT id, digest FROM revoked_tokens")).all() == [(7, "kept")]
+        conn.execute(text("DELETE FROM revoked_tokens"))
+        conn.execute(text("INSERT INTO revoked_tokens (digest, expires_at) VALUES ('new', 99)"))
+        assert conn.execute(text("SELECT id FROM revoked_tokens")).scalar() == 8
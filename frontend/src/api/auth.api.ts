@@ -8,3 +8,7 @@ export const login = async (email: string, password: string) => {
 export const register = async (email: string, password: string) => {
   return api.post("/auth/register", { email, password });
 };
+
+export const logout = async () => {
+  return api.post("/auth/logout");
+};
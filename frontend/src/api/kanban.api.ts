@@ -1,12 +1,45 @@
 import api from "./axios";
+import type { Ticket, TicketPage } from "./tickets.api";
+
+/* ========================
+   TYPES
+======================== */
+
+// First page of one column; follow next_cursor with getKanbanColumn
+export type KanbanColumnPage = {
+  status: string;
+  total: number;
+  items: Ticket[];
+  next_cursor: string | null;
+};
 
 export type KanbanBoard = {
-  todo: any[];
-  in_progress: any[];
-  done: any[];
+  project_id: number;
+  columns: KanbanColumnPage[];
+};
+
+/* ========================
+   QUERIES
+======================== */
+
+export const getKanbanBoard = async (
+  projectId: number,
+  limit?: number
+): Promise<KanbanBoard> => {
+  const res = await api.get(`/kanban/project/${projectId}`, {
+    params: { limit },
+  });
+  return res.data;
 };
 
-export const getKanbanBoard = async (projectId: number): Promise<KanbanBoard> => {
-  const res = await api.get(`/kanban/project/${projectId}`);
+export const getKanbanColumn = async (
+  projectId: number,
+  status: string,
+  after?: string | null,
+  limit?: number
+): Promise<TicketPage> => {
+  const res = await api.get(`/kanban/project/${projectId}/column/${status}`, {
+    params: { limit, after: after ?? undefined },
+  });
   return res.data;
 };
@@ -0,0 +1,26 @@
+import api from "./axios";
+
+export type LiveEvent = {
+  type: string;
+  project_id?: number;
+  data?: any;
+};
+
+/**
+ * Subscribe to a project's live change feed (Server-Sent Events).
+ * A "resync" event means deltas were missed: re-fetch instead.
+ * Returns a function that closes the stream.
+ */
+export const subscribeToProject = (
+  projectId: number,
+  onEvent: (event: LiveEvent) => void
+): (() => void) => {
+  const token = localStorage.getItem("access_token") ?? "";
+  const source = new EventSource(
+    `${api.defaults.baseURL}/live/project/${projectId}/events?token=${encodeURIComponent(token)}`
+  );
+
+  source.onmessage = (message) => onEvent(JSON.parse(message.data));
+
+  return () => source.close();
+};
@@ -20,11 +20,38 @@ export type Ticket = {
    QUERIES
 ======================== */
 
-export const getTicketsByProject = async (projectId: number) => {
-  const res = await api.get(`/tickets/project/${projectId}`);
+export type TicketPage = {
+  items: Ticket[];
+  next_cursor: string | null;
+};
+
+export const getTicketPage = async (
+  projectId: number,
+  after?: string | null,
+  limit = 200
+): Promise<TicketPage> => {
+  const res = await api.get(`/tickets/project/${projectId}`, {
+    params: { limit, after: after ?? undefined },
+  });
   return res.data;
 };
 
+/**
+ * Follows next_cursor until the project is exhausted
+ */
+export const getTicketsByProject = async (projectId: number) => {
+  const tickets: Ticket[] = [];
+  let after: string | null = null;
+
+  do {
+    const page: TicketPage = await getTicketPage(projectId, after);
+    tickets.push(...page.items);
+    after = page.next_cursor;
+  } while (after);
+
+  return tickets;
+};
+
 /* ========================
    MUTATIONS
 ======================== */
@@ -54,8 +81,8 @@ export const getTicketById = async (
   projectId: number,
   ticketId: number
 ): Promise<Ticket> => {
-  const res = await api.get(`/tickets/project/${projectId}`);
-  const ticket = res.data.find((t: Ticket) => t.id === ticketId);
+  const tickets = await getTicketsByProject(projectId);
+  const ticket = tickets.find((t: Ticket) => t.id === ticketId);
 
   if (!ticket) {
     throw new Error("Ticket not found");
@@ -9,15 +9,48 @@ type Comment = {
   user_role: "admin" | "developer" | "viewer";
 };
 
+type CommentPage = {
+  total: number;
+  items: Comment[];
+  next_cursor: string | null;
+  prev_cursor: string | null;
+};
+
+const PAGE_SIZE = 20;
+
 const Comments = ({ ticketId }: { ticketId: number }) => {
+  // Newest first; older pages are appended below on demand
   const [comments, setComments] = useState<Comment[]>([]);
+  const [total, setTotal] = useState(0);
+  const [olderCursor, setOlderCursor] = useState<string | null>(null);
   const [content, setContent] = useState("");
   const [error, setError] = useState("");
 
+  const fetchPage = async (after?: string): Promise<CommentPage> => {
+    const res = await api.get(`/comments/ticket/${ticketId}`, {
+      params: { limit: PAGE_SIZE, order: "desc", after },
+    });
+    return res.data;
+  };
+
   const load = async () => {
     try {
-      const res = await api.get(`/comments/ticket/${ticketId}`);
-      setComments(res.data);
+      const page = await fetchPage();
+      setComments(page.items);
+      setTotal(page.total);
+      setOlderCursor(page.next_cursor);
+    } catch {
+      setError("Failed to load comments");
+    }
+  };
+
+  const loadOlder = async () => {
+    if (!olderCursor) return;
+    try {
+      const page = await fetchPage(olderCursor);
+      setComments((prev) => [...prev, ...page.items]);
+      setTotal(page.total);
+      setOlderCursor(page.next_cursor);
     } catch {
       setError("Failed to load comments");
     }
@@ -43,7 +76,9 @@ const Comments = ({ ticketId }: { ticketId: number }) => {
 
   return (
     <div className="mt-6">
-      <h3 className="font-semibold mb-2 text-lg">Comments</h3>
+      <h3 className="font-semibold mb-2 text-lg">
+        Comments{total > 0 && ` (${total})`}
+      </h3>
 
       {error && <p className="text-red-600 mb-2">{error}</p>}
 
@@ -67,6 +102,15 @@ const Comments = ({ ticketId }: { ticketId: number }) => {
         )}
       </div>
 
+      {olderCursor && (
+        <button
+          onClick={loadOlder}
+          className="mt-3 text-sm text-blue-600 hover:underline"
+        >
+          Show older comments ({total - comments.length})
+        </button>
+      )}
+
       <div className="mt-4">
         <textarea
           className="border p-2 w-full rounded focus:ring-2 focus:ring-blue-500 outline-none"
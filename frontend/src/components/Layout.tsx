@@ -1,11 +1,18 @@
 import { ReactNode } from "react";
+import { logout as revokeToken } from "../api/auth.api";
 
 type Props = {
   children: ReactNode;
 };
 
 const Layout = ({ children }: Props) => {
-  const logout = () => {
+  const logout = async () => {
+    // Revoke the token server-side too; leave even if that fails
+    try {
+      await revokeToken();
+    } catch {
+      // already expired or revoked
+    }
     localStorage.removeItem("access_token");
     window.location.href = "/login";
   };
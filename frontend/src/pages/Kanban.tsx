@@ -2,6 +2,7 @@ import { useEffect, useState } from "react";
 import Layout from "../components/Layout";
 import { useProject } from "../context/ProjectContext";
 import { getTicketsByProject } from "../api/tickets.api";
+import { subscribeToProject } from "../api/live.api";
 import api from "../api/axios";
 import type { Ticket } from "../api/tickets.api";
 
@@ -44,6 +45,31 @@ const Kanban = () => {
     load();
   }, [projectId]);
 
+  // Apply other users' changes as they happen instead of polling
+  useEffect(() => {
+    return subscribeToProject(projectId, (event) => {
+      switch (event.type) {
+        case "ticket.created":
+          setTickets((prev) =>
+            prev.some((t) => t.id === event.data.id) ? prev : [...prev, event.data]
+          );
+          break;
+        case "ticket.updated":
+        case "ticket.moved":
+          setTickets((prev) =>
+            prev.map((t) => (t.id === event.data.id ? { ...t, ...event.data } : t))
+          );
+          break;
+        case "ticket.deleted":
+          setTickets((prev) => prev.filter((t) => t.id !== event.data.id));
+          break;
+        case "resync":
+          loadTickets();
+          break;
+      }
+    });
+  }, [projectId]);
+
   const onDragEnd = async (result: DropResult) => {
     if (!result.destination) return;
     if (!canDrag) return;